@@ -3,12 +3,20 @@
 import argparse
 import sys
 
-from analyse_spotify_playlist.analyse_spotify_playlist import main
-from analyse_spotify_playlist.file_output import FileOutput
+# Only the configuration is imported up front, so --help and usage errors
+# return without loading the analysis. Everything else is imported once the
+# arguments are valid.
+from analyse_spotify_playlist.config import (
+    BATCH_WORKERS,
+    EXPORT_FORMATS,
+    METRICS_FORMATS,
+    OUTPUT_FORMATS,
+    SERVER_HOST,
+    SERVER_WORKERS,
+)
 from analyse_spotify_playlist.logger import Log
 
 logger = Log()
-file_handler = FileOutput()
 
 
 if "__main__" in __name__:
@@ -16,6 +24,7 @@ if "__main__" in __name__:
     parser.add_argument(
         "input",
         type=str,
+        nargs="?",
         help="Playlist Id/s to analyse. If more than one, split by comma",
     )
     parser.add_argument(
@@ -30,14 +39,181 @@ if "__main__" in __name__:
         help="Analytical depth.\n0 - Basic Summary (default),\n1 - shows in depth section,\n2 - shows raw audio feature information with highest, lowest, and average value.",
     )
     parser.add_argument("-o", "--output", help="Path to the output")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="Output format. text (default) is the readable report, json is a file per playlist, and ndjson is one line per playlist in a single file",
+    )
+    parser.add_argument(
+        "-e",
+        "--export",
+        choices=EXPORT_FORMATS,
+        help="Also export every track and its audio features to the output path, as csv, or as arrow or parquet if pyarrow is installed",
+    )
+    parser.add_argument(
+        "--warehouse",
+        metavar="DATABASE",
+        help="Store every analysed playlist, track and audio feature in the SQLite DATABASE",
+    )
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument(
+        "--record",
+        metavar="ARCHIVE",
+        help="Record every response from Spotify to the ARCHIVE file",
+    )
+    archive_group.add_argument(
+        "--replay",
+        metavar="ARCHIVE",
+        help="Serve every response from an ARCHIVE recorded with --record, without connecting to Spotify",
+    )
+    parser.add_argument(
+        "-a",
+        "--async",
+        dest="use_async",
+        help="Fetch all playlists concurrently using asyncio",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        help="Update the analysis as each page of tracks and batch of audio features arrives",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--pipelined",
+        help="Request the audio features while the pages of tracks are still arriving",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--batch",
+        metavar="FILE",
+        help="Analyse the playlist ids listed in FILE, one per line, on a pool of workers. Use - to read from stdin",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help=f"Number of playlists analysed at once in batch mode (default {BATCH_WORKERS}) or server mode (default {SERVER_WORKERS})",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        help="Use worker processes instead of threads in batch mode",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--serve",
+        metavar="PORT",
+        type=int,
+        help="Serve the analysis over a local HTTP API on PORT, instead of analysing playlist ids",
+    )
+    parser.add_argument(
+        "--host",
+        default=SERVER_HOST,
+        help=f"Address the server listens on (default {SERVER_HOST})",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        choices=METRICS_FORMATS,
+        help="Time every stage of the run and output the metrics once it ends, as a summary with the p50/p95/p99 of each stage, as json, or in the Prometheus text format. In server mode they are also served at /metrics",
+    )
+    parser.add_argument(
+        "--metrics-output",
+        metavar="FILE",
+        help="Write the --metrics to FILE instead of stderr",
+    )
 
     args = parser.parse_args()
+    if args.use_async and args.incremental:
+        parser.error("--incremental cannot be combined with --async")
+    if args.use_async and args.pipelined:
+        parser.error("--pipelined cannot be combined with --async")
+    if args.batch is not None and args.use_async:
+        parser.error("--batch cannot be combined with --async")
+    if args.serve is not None:
+        if args.input is not None or args.batch is not None:
+            parser.error("--serve cannot be combined with playlist ids or --batch")
+        if args.use_async:
+            parser.error("--serve cannot be combined with --async")
+        if args.record or args.replay or args.processes:
+            parser.error(
+                "--serve cannot be combined with --record, --replay or --processes"
+            )
+        if args.output or args.export or args.format:
+            parser.error(
+                "--serve cannot be combined with --output, --export or --format, "
+                "as each request chooses its format"
+            )
+    elif (args.input is None) == (args.batch is None):
+        parser.error("provide either playlist ids or --batch")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.processes and (args.record or args.replay):
+        parser.error("--record and --replay cannot be combined with --processes")
+    if args.export is not None and args.output is None:
+        parser.error("--export needs an --output path")
+    if args.metrics_output is not None and args.metrics is None:
+        parser.error("--metrics-output needs --metrics")
+
+    import tempfile
+
+    from analyse_spotify_playlist.analyse_spotify_playlist import (
+        main,
+        main_async,
+        main_batch,
+    )
+    from analyse_spotify_playlist.batch import read_playlist_ids
+    from analyse_spotify_playlist.feature_cache import FeatureCache, set_feature_cache
+    from analyse_spotify_playlist.file_output import FileOutput, start_ndjson_output
+    from analyse_spotify_playlist.metrics import (
+        MetricsRegistry,
+        set_metrics,
+        write_metrics,
+    )
+    from analyse_spotify_playlist.playlist_cache import (
+        PlaylistCache,
+        set_playlist_cache,
+    )
+    from analyse_spotify_playlist.response_archive import ResponseArchive, set_archive
+    from analyse_spotify_playlist.server import serve
+    from analyse_spotify_playlist.token_provider import (
+        TokenProvider,
+        set_token_provider,
+    )
+    from analyse_spotify_playlist.warehouse import Warehouse, set_warehouse
 
     verbose = False
     if args.verbose:
         verbose = args.verbose
     logger.set_logger(verbose)
-    input_ids = args.input.split(",")
+    if args.metrics is not None:
+        set_metrics(MetricsRegistry())
+    if args.serve is not None:
+        if args.warehouse is not None:
+            set_warehouse(Warehouse(args.warehouse))
+        serve(
+            args.host,
+            args.serve,
+            args.workers or SERVER_WORKERS,
+            args.incremental,
+            args.pipelined,
+        )
+        if args.metrics is not None:
+            write_metrics(args.metrics, args.metrics_output)
+        sys.exit(0)
+    if args.batch == "-":
+        input_ids = read_playlist_ids(sys.stdin)
+    elif args.batch is not None:
+        with open(args.batch, encoding="utf-8") as f:
+            input_ids = read_playlist_ids(f)
+    else:
+        input_ids = args.input.split(",")
 
     if len(input_ids) == 0:
         logger.print("No ids provided for analysis")
@@ -45,6 +221,16 @@ if "__main__" in __name__:
 
     depth = args.depth
     output_path = args.output
+    file_handler = FileOutput()
+    file_handler.set_output_format(args.format or "text")
+    file_handler.set_export_format(args.export)
+    if args.warehouse is not None:
+        set_warehouse(Warehouse(args.warehouse))
+    if args.export in ("arrow", "parquet"):
+        from analyse_spotify_playlist.track_export import columnar_export_available
+
+        if not columnar_export_available():
+            print("pyarrow is not installed, tracks will be exported as csv.")
 
     if isinstance(output_path, str):
         file_handler.set_output_path(output_path)
@@ -63,5 +249,37 @@ if "__main__" in __name__:
             "No valid output enabled: Please set -verbose flag, or an -output location."
         )
         sys.exit(1)
+    start_ndjson_output()
 
-    main(input_ids, depth)
+    archive_path = args.record or args.replay
+    if archive_path is not None:
+        # Every request goes through the archive, so the caches start empty
+        # and are discarded at exit.
+        set_feature_cache(FeatureCache(":memory:"))
+        playlist_cache_dir = tempfile.TemporaryDirectory()
+        set_playlist_cache(PlaylistCache(playlist_cache_dir.name))
+        if args.replay is not None:
+            # The replayed token is a placeholder, and must not be cached.
+            set_token_provider(TokenProvider(cache_path=None))
+        set_archive(
+            ResponseArchive(archive_path, "record" if args.record else "replay")
+        )
+
+    try:
+        if args.batch is not None:
+            main_batch(
+                input_ids,
+                depth,
+                args.workers or BATCH_WORKERS,
+                args.processes,
+                args.incremental,
+                args.pipelined,
+            )
+        elif args.use_async:
+            main_async(input_ids, depth)
+        else:
+            main(input_ids, depth, args.incremental, args.pipelined)
+    finally:
+        set_archive(None)
+        if args.metrics is not None:
+            write_metrics(args.metrics, args.metrics_output)
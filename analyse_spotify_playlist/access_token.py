@@ -52,6 +52,13 @@ class AccessToken:
             return True
         return False
 
+    def expires_within(self, seconds: float) -> bool:
+        """Check if token will have expired in the given number of seconds."""
+        now = datetime.now().timestamp()
+        if self.__exp_time <= now + seconds:
+            return True
+        return False
+
     def get_refresh_token(self) -> str:
         """Return token."""
         if self.__refresh_token:
@@ -1,85 +1,469 @@
 """Get Playlist information and analyse."""
 
-from analyse_spotify_playlist.access_token import AccessToken
-from analyse_spotify_playlist.file_output import FileOutput
+import asyncio
+from typing import Callable
+
+from aiohttp import ClientSession
+
+from analyse_spotify_playlist.async_outbound_requests import (
+    create_session,
+    pull_playlist_data_async,
+    pull_playlist_metadata_async,
+    pull_remaining_tracks_async,
+    pull_tracks_audio_features_async,
+)
+from analyse_spotify_playlist.feature_cache import (
+    FeatureCache,
+    get_feature_cache,
+    merge_audio_features,
+)
+from analyse_spotify_playlist.feature_pipeline import FeaturePipeline
+from analyse_spotify_playlist.file_output import FileOutput, ReportWriter
+from analyse_spotify_playlist.json_report import output_json
 from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import increment, timer
 from analyse_spotify_playlist.outbound_requests import (
-    pull_next_set_of_tracks,
+    get_playlist_fields,
+    get_track_page_fields,
+    iter_tracks_audio_features,
     pull_playlist_data,
-    pull_tracks_audio_features_r,
-    request_access_token,
+    pull_playlist_metadata,
+    pull_remaining_tracks_parallel,
+    pull_tracks_audio_features,
 )
 from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.playlist_cache import (
+    get_playlist_cache,
+    is_unchanged,
+    playlist_from_cache,
+)
+from analyse_spotify_playlist.token_provider import get_token_provider
+from analyse_spotify_playlist.track_registry import TrackRegistry, get_track_registry
 from analyse_spotify_playlist.utils import (
     clean_raw_playlist_data,
     clean_up_track_features,
     convert_duration_ms,
     convert_time_signature,
+    performance_timer,
 )
+from analyse_spotify_playlist.warehouse import get_warehouse
 
 logger = Log()
 
 
 def populate_track_features(playlist: Playlist, cleaned_feature_list: tuple) -> None:
-    """Populate track in playlist with the audio features."""
-    for id, track_feature in cleaned_feature_list:
-        if id is None:
-            continue
-        playlist.get_track(id).populate_audio_features(**track_feature)
+    """Populate track in playlist with the audio features.
 
+    The features are also stored in the warehouse, if it is enabled."""
+    playlist.add_audio_features(cleaned_feature_list)
+    warehouse = get_warehouse()
+    if warehouse is not None:
+        warehouse.put_audio_features(cleaned_feature_list)
 
-def analyse_playlists(playlist_id: str, depth: int) -> None:
-    """Trigger the analysis."""
-    file_handler = FileOutput()
-    token = AccessToken(**request_access_token())
-    raw_playlist = pull_playlist_data(token.get_token(), playlist_id)
 
+def analyse_playlists(
+    playlist_id: str, depth: int, incremental: bool = False, pipelined: bool = False
+) -> None:
+    """Trigger the analysis."""
+    playlist = load_playlist(playlist_id, depth, incremental, pipelined)
+    output_report(playlist, depth)
+
+
+def load_playlist(
+    playlist_id: str, depth: int, incremental: bool = False, pipelined: bool = False
+) -> Playlist:
+    """Return the playlist, with every track and its audio features populated.
+
+    If incremental, the statistics are updated as each page of tracks and
+    each batch of audio features arrives, rather than once all are fetched.
+    If pipelined, the audio features are requested while the pages of tracks
+    are still arriving."""
+    token = get_token_provider()
+    if pipelined:
+        return fetch_playlist_pipelined(
+            token.get_token(), playlist_id, depth, incremental
+        )
+    playlist = fetch_playlist(token.get_token(), playlist_id, depth, incremental)
+    registry = get_track_registry()
+    if registry is not None:
+        fetch_shared_audio_features(token.get_token(), playlist, registry, incremental)
+    elif incremental:
+        stream_audio_features(token.get_token(), playlist)
+    else:
+        track_ids = playlist.get_all_track_ids()
+        audio_features_list = fetch_audio_features(token.get_token(), track_ids)
+        populate_track_features(
+            playlist, list(map(clean_up_track_features, audio_features_list))
+        )
+    return playlist
+
+
+def build_playlist(
+    raw_playlist: dict, pages: list[dict], incremental: bool = False
+) -> Playlist:
+    """Create the playlist from the raw response and the remaining track pages."""
     clean_playlist = clean_raw_playlist_data(raw_playlist)
-    playlist = Playlist(**clean_playlist)
+    playlist = Playlist(
+        **clean_playlist, incremental=incremental, registry=get_track_registry()
+    )
+    for page in pages:
+        playlist.add_tracks(page)
+    return playlist
+
+
+@performance_timer("playlist_fetch")
+def fetch_playlist(
+    token: str,
+    playlist_id: str,
+    depth: int,
+    incremental: bool = False,
+    on_tracks: Callable[[Playlist, list[str]], None] | None = None,
+) -> Playlist:
+    """Return the playlist with all of its tracks.
+
+    Only the fields read at the analytical depth are requested. If the
+    playlist is cached, only its metadata is requested. The tracks are
+    served from the cache when the snapshot has not changed. The pages of
+    tracks are only kept once added if the cache needs them. on_tracks is
+    called with the ids of the tracks added, as each page is added."""
+    fields = get_playlist_fields(depth)
+    playlist_cache = get_playlist_cache()
+    entry = None
+    etag = None
+    if playlist_cache is not None:
+        entry = playlist_cache.get(playlist_id)
+    if entry is not None:
+        metadata, etag = pull_playlist_metadata(token, playlist_id, entry.get("etag"))
+        if is_unchanged(entry, metadata, fields):
+            playlist = playlist_cache_hit(
+                playlist_id, entry, metadata, etag, incremental
+            )
+            if on_tracks is not None:
+                on_tracks(playlist, playlist.get_all_track_ids())
+            return playlist
+
+    raw_playlist = pull_playlist_data(token, playlist_id, fields)
+    playlist = build_playlist(raw_playlist, [], incremental)
+    if on_tracks is not None:
+        on_tracks(playlist, playlist.get_all_track_ids())
+    pages = []
     if playlist.next_url:
-        pull_next_set_of_tracks(token.get_token(), playlist)
+        pages = pull_remaining_tracks_parallel(
+            token,
+            playlist,
+            fields=get_track_page_fields(depth),
+            keep_pages=playlist_cache is not None,
+            on_tracks=on_tracks,
+        )
+    playlist_cache_miss(playlist_id, etag, raw_playlist, pages, fields)
+    return playlist
+
+
+def fetch_playlist_pipelined(
+    token: str, playlist_id: str, depth: int, incremental: bool = False
+) -> Playlist:
+    """Return the playlist with all of its tracks and their audio features.
+
+    A batch of audio features is requested as soon as enough new track ids
+    have arrived, while the later pages of tracks are still downloading."""
+    with FeaturePipeline(token, populate_track_features) as pipeline:
+        playlist = fetch_playlist(
+            token, playlist_id, depth, incremental, pipeline.add_tracks
+        )
+        pipeline.finish()
+    feature_cache = get_feature_cache()
+    if feature_cache is not None:
+        log_feature_cache(feature_cache, pipeline.cached, pipeline.requested)
+    return playlist
+
+
+@performance_timer("playlist_fetch")
+async def fetch_playlist_async(
+    session: ClientSession, token: str, playlist_id: str, depth: int
+) -> Playlist:
+    """Return the playlist with all of its tracks.
+
+    Only the fields read at the analytical depth are requested. If the
+    playlist is cached, only its metadata is requested. The tracks are
+    served from the cache when the snapshot has not changed."""
+    fields = get_playlist_fields(depth)
+    playlist_cache = get_playlist_cache()
+    entry = None
+    etag = None
+    if playlist_cache is not None:
+        entry = playlist_cache.get(playlist_id)
+    if entry is not None:
+        metadata, etag = await pull_playlist_metadata_async(
+            session, token, playlist_id, entry.get("etag")
+        )
+        if is_unchanged(entry, metadata, fields):
+            return playlist_cache_hit(playlist_id, entry, metadata, etag)
+
+    raw_playlist = await pull_playlist_data_async(session, token, playlist_id, fields)
+    playlist = Playlist(
+        **clean_raw_playlist_data(raw_playlist), registry=get_track_registry()
+    )
+    pages = []
+    if playlist.next_url:
+        pages = await pull_remaining_tracks_async(
+            session, token, playlist, get_track_page_fields(depth)
+        )
+    playlist_cache_miss(playlist_id, etag, raw_playlist, pages, fields)
+    return playlist
+
+
+def playlist_cache_hit(
+    playlist_id: str,
+    entry: dict,
+    metadata: dict | None,
+    etag: str | None,
+    incremental: bool = False,
+) -> Playlist:
+    """Build the playlist from an unchanged cache entry."""
+    playlist_cache = get_playlist_cache()
+    playlist_cache.record(True)
+    logger.print(f"Playlist {playlist_id} is unchanged, using cached tracks")
+    raw_playlist, pages = playlist_from_cache(entry, metadata)
+    playlist_cache.update_etag(playlist_id, entry, etag)
+    return build_playlist(raw_playlist, pages, incremental)
+
+
+def playlist_cache_miss(
+    playlist_id: str,
+    etag: str | None,
+    raw_playlist: dict,
+    pages: list[dict],
+    fields: str,
+) -> None:
+    """Store a newly fetched playlist in the cache, if it is enabled."""
+    playlist_cache = get_playlist_cache()
+    if playlist_cache is None:
+        return
+    playlist_cache.record(False)
+    playlist_cache.put(
+        playlist_id, raw_playlist.get("snapshot_id"), etag, raw_playlist, pages, fields
+    )
+
+
+def fetch_audio_features(token: str, track_ids: list[str]) -> list:
+    """Return audio features for the tracks, only requesting those not cached."""
+    feature_cache = get_feature_cache()
+    if feature_cache is None:
+        return pull_tracks_audio_features(token, track_ids)
+    cached = feature_cache.get_many(track_ids)
+    missing = [x for x in track_ids if x not in cached]
+    fetched = pull_tracks_audio_features(token, missing)
+    feature_cache.put_many(fetched)
+    log_feature_cache(feature_cache, len(cached), len(missing))
+    return merge_audio_features(track_ids, cached, fetched)
+
+
+async def fetch_audio_features_async(
+    session: ClientSession, token: str, track_ids: list[str]
+) -> list:
+    """Return audio features for the tracks, only requesting those not cached."""
+    feature_cache = get_feature_cache()
+    if feature_cache is None:
+        return await pull_tracks_audio_features_async(session, token, track_ids)
+    cached = feature_cache.get_many(track_ids)
+    missing = [x for x in track_ids if x not in cached]
+    fetched = await pull_tracks_audio_features_async(session, token, missing)
+    feature_cache.put_many(fetched)
+    log_feature_cache(feature_cache, len(cached), len(missing))
+    return merge_audio_features(track_ids, cached, fetched)
+
+
+def stream_audio_features(
+    token: str, playlist: Playlist, track_ids: list[str] | None = None
+) -> None:
+    """Populate the audio features of the playlist, one batch at a time.
+
+    Cached features are populated first, then each requested batch as soon as
+    it arrives, so the full list of features is never held. Only the given
+    tracks are populated, or every track if None."""
+    if track_ids is None:
+        track_ids = playlist.get_all_track_ids()
+    feature_cache = get_feature_cache()
+    missing = track_ids
+    if feature_cache is not None:
+        cached = feature_cache.get_many(track_ids)
+        populate_track_features(
+            playlist,
+            [clean_up_track_features(cached[x]) for x in track_ids if x in cached],
+        )
+        missing = [x for x in track_ids if x not in cached]
+    for batch in iter_tracks_audio_features(token, missing):
+        if feature_cache is not None:
+            feature_cache.put_many(batch)
+        populate_track_features(playlist, list(map(clean_up_track_features, batch)))
+    if feature_cache is not None:
+        log_feature_cache(feature_cache, len(track_ids) - len(missing), len(missing))
+
+
+def fetch_shared_audio_features(
+    token: str, playlist: Playlist, registry: TrackRegistry, incremental: bool = False
+) -> None:
+    """Populate the audio features of the playlist, sharing them through the registry.
+
+    Only tracks the registry has never seen are requested. Features another
+    playlist has already requested are waited for, rather than requested again.
+    If that playlist failed to request them, they are claimed and requested
+    here instead."""
+    track_ids = playlist.get_all_track_ids()
+    while len(track_ids) > 0:
+        claimed, shared = registry.claim_features(track_ids)
+        populated = False
+        try:
+            if incremental:
+                stream_audio_features(token, playlist, claimed)
+            else:
+                features = fetch_audio_features(token, claimed)
+                populate_track_features(
+                    playlist, list(map(clean_up_track_features, features))
+                )
+            populated = True
+        finally:
+            registry.release_features(claimed, populated)
+        track_ids = registry.wait_for_features(shared)
+        playlist.add_shared_features([x for x in shared if x not in track_ids])
+
+
+async def fetch_shared_audio_features_async(
+    session: ClientSession, token: str, playlist: Playlist, registry: TrackRegistry
+) -> None:
+    """Populate the audio features of the playlist, sharing them through the registry.
+
+    As fetch_shared_audio_features, waiting for features requested by another
+    playlist off the event loop."""
+    track_ids = playlist.get_all_track_ids()
+    while len(track_ids) > 0:
+        claimed, shared = registry.claim_features(track_ids)
+        populated = False
+        try:
+            features = await fetch_audio_features_async(session, token, claimed)
+            populate_track_features(
+                playlist, list(map(clean_up_track_features, features))
+            )
+            populated = True
+        finally:
+            registry.release_features(claimed, populated)
+        track_ids = await asyncio.get_running_loop().run_in_executor(
+            None, registry.wait_for_features, shared
+        )
+        playlist.add_shared_features([x for x in shared if x not in track_ids])
+
+
+def log_feature_cache(feature_cache: FeatureCache, hits: int, misses: int) -> None:
+    """Log the cache hits for a playlist, and the hit ratio for the run."""
+    logger.print(
+        f"Audio features cache: {hits} cached, {misses} requested "
+        f"(hit ratio this run: {round(feature_cache.hit_ratio() * 100, 2)}%)"
+    )
+
+
+async def analyse_playlists_async(playlist_ids: list[str], depth: int) -> None:
+    """Trigger the analysis for all playlists concurrently, on one event loop."""
+    async with create_session() as session:
+        await asyncio.gather(
+            *(
+                analyse_playlist_async(session, playlist_id, depth)
+                for playlist_id in playlist_ids
+            )
+        )
+
+
+async def analyse_playlist_async(
+    session: ClientSession, playlist_id: str, depth: int
+) -> None:
+    """Fetch and analyse a single playlist using the shared session."""
+    playlist = await load_playlist_async(session, playlist_id, depth)
+    output_report(playlist, depth)
+
+
+async def load_playlist_async(
+    session: ClientSession, playlist_id: str, depth: int
+) -> Playlist:
+    """Return the playlist, with every track and its audio features populated."""
+    token = get_token_provider()
+    playlist = await fetch_playlist_async(
+        session, await token.get_token_async(session), playlist_id, depth
+    )
+    registry = get_track_registry()
+    if registry is not None:
+        await fetch_shared_audio_features_async(
+            session, await token.get_token_async(session), playlist, registry
+        )
+        return playlist
     track_ids = playlist.get_all_track_ids()
-    audio_features_list = pull_tracks_audio_features_r(token.get_token(), track_ids)
+    audio_features_list = await fetch_audio_features_async(
+        session, await token.get_token_async(session), track_ids
+    )
+    populate_track_features(
+        playlist, list(map(clean_up_track_features, audio_features_list))
+    )
+    return playlist
+
+
+def report_playlist(playlist: Playlist, audio_features_list: list, depth: int) -> None:
+    """Populate the audio features, analyse the playlist and output the result."""
     cleaned_features = list(map(clean_up_track_features, audio_features_list))
     populate_track_features(playlist, cleaned_features)
-    playlist.analyse_tracks_audio_feature()
-    playlist.oldest_and_newest()
-    if file_handler.write_to_file:
-        file_handler.set_file_name(playlist.name)
-        file_handler.create_file()
-    output_analysis(playlist, depth, file_handler)
+    output_report(playlist, depth)
 
 
-def output_analysis(playlist: Playlist, depth: int, file_handler: FileOutput) -> None:
-    """Output Analysis details."""
-    header = "----- PLAYLIST ANALYSIS -----\n"
-    logger.print(header)
-    file_handler.write(header)
+def analyse_populated_playlist(playlist: Playlist) -> None:
+    """Gather the statistics of the populated playlist.
 
-    playlist_info = playlist_information(playlist)
-    logger.print(playlist_info)
-    file_handler.write(playlist_info)
+    If the warehouse is enabled, the playlist is stored in it."""
+    with timer("analysis"):
+        playlist.analyse_tracks_audio_feature()
+        playlist.oldest_and_newest()
+    increment("playlists_analysed")
+    increment("tracks_analysed", len(playlist.tracks))
+    warehouse = get_warehouse()
+    if warehouse is not None:
+        with timer("warehouse"):
+            warehouse.put_playlist(playlist)
 
-    track_summary = playlist_track_summary(playlist)
-    logger.print(track_summary)
-    file_handler.write(track_summary)
 
+def output_report(playlist: Playlist, depth: int) -> None:
+    """Analyse the populated playlist and output the result.
+
+    If an export format is set, the tracks are also exported to the output
+    path."""
+    file_handler = FileOutput()
+    analyse_populated_playlist(playlist)
+    if file_handler.write_to_file:
+        file_handler.set_file_name(playlist.name)
+    if FileOutput.output_format != "text":
+        output_json(playlist, file_handler)
+    else:
+        with ReportWriter(file_handler) as report:
+            output_analysis(playlist, depth, report)
+    if file_handler.write_to_file and FileOutput.export_format is not None:
+        # Imported here, as pyarrow is slow to import and most runs do not
+        # export the tracks.
+        from analyse_spotify_playlist.track_export import export_tracks
+
+        export_tracks(playlist, file_handler.export_path(), FileOutput.export_format)
+
+
+@performance_timer("render")
+def output_analysis(playlist: Playlist, depth: int, report: ReportWriter) -> None:
+    """Output Analysis details, one section at a time."""
+    report.write("----- PLAYLIST ANALYSIS -----\n")
+    report.write(playlist_information(playlist))
+    report.write(playlist_track_summary(playlist))
     if depth > 0:
-        in_depth = in_depth_breakdown(playlist)
-        logger.print(in_depth)
-        file_handler.write(in_depth)
+        report.write(in_depth_breakdown(playlist))
     if depth > 1:
-        raw_audio_features = audio_features_breakdown(playlist)
-        logger.print(raw_audio_features)
-        file_handler.write(raw_audio_features)
-    footer = "-----------------------------"
-    logger.print(footer)
-    file_handler.write(footer)
+        report.write(audio_features_breakdown(playlist))
+    report.write("-----------------------------")
 
 
 def audio_features_breakdown(playlist: Playlist) -> None:
     """Print the min and max values for the audio features."""
-    audio_breakdown = "\n--- RAW AUDIO FEATURES BREAKDOWN ---"
+    audio_breakdown = ["\n--- RAW AUDIO FEATURES BREAKDOWN ---"]
 
     keys = [
         "duration_ms",
@@ -98,7 +482,9 @@ def audio_features_breakdown(playlist: Playlist) -> None:
     min_max_list = playlist.min_max_analysis
     average_list = playlist.average_analysis
     for key in keys:
-        audio_breakdown += f"\n\n{key.title().replace('_Ms', '').replace('_',' ')}:"
+        audio_breakdown.append(
+            f"\n\n{key.title().replace('_Ms', '').replace('_',' ')}:"
+        )
         min = min_max_list[key][0]
         min_track = playlist.get_track(min[0])
         max = min_max_list[key][1]
@@ -106,21 +492,21 @@ def audio_features_breakdown(playlist: Playlist) -> None:
         to_add = ""
         if "duration" in key:
             to_add = f"""
-Minimum: {convert_duration_ms(min[1])} Track: {min_track._name}, by {min_track._artists[0]['name']} (ID: {min[0]})
-Maximum: {convert_duration_ms(max[1])} Track: {max_track._name}, by {max_track._artists[0]['name']} (ID: {max[0]})
+Minimum: {convert_duration_ms(min[1])} Track: {min_track._name}, by {min_track.get_artist_name()} (ID: {min[0]})
+Maximum: {convert_duration_ms(max[1])} Track: {max_track._name}, by {max_track.get_artist_name()} (ID: {max[0]})
 Average: {convert_duration_ms(average_list[key])}"""
         elif "time_signature" == key:
             to_add = f"""
-Minimum: {convert_time_signature(min[1])} Track: {min_track._name}, by {min_track._artists[0]['name']} (ID: {min[0]})
-Maximum: {convert_time_signature(max[1])} Track: {max_track._name}, by {max_track._artists[0]['name']} (ID: {max[0]})
+Minimum: {convert_time_signature(min[1])} Track: {min_track._name}, by {min_track.get_artist_name()} (ID: {min[0]})
+Maximum: {convert_time_signature(max[1])} Track: {max_track._name}, by {max_track.get_artist_name()} (ID: {max[0]})
 Average: {convert_time_signature(average_list[key])}"""
         else:
             to_add = f"""
-Minimum: {(min[1])} Track: {min_track._name}, by {min_track._artists[0]['name']} (ID: {min[0]})
-Maximum: {(max[1])} Track: {max_track._name}, by {max_track._artists[0]['name']} (ID: {max[0]})
+Minimum: {(min[1])} Track: {min_track._name}, by {min_track.get_artist_name()} (ID: {min[0]})
+Maximum: {(max[1])} Track: {max_track._name}, by {max_track.get_artist_name()} (ID: {max[0]})
 Average: {(average_list[key])}"""
-        audio_breakdown += to_add
-    return audio_breakdown
+        audio_breakdown.append(to_add)
+    return "".join(audio_breakdown)
 
 
 def playlist_information(playlist: Playlist) -> str:
@@ -138,13 +524,15 @@ Playlist Type: {playlist.get_playlist_visibility()}
 
 def playlist_track_summary(playlist: Playlist) -> str:
     """Return a summary of the tracks info."""
-    track_summary = f"""--- TRACK SUMMARY ---
-Total Playable Tracks: {len(playlist._tracks)}
-Total Tracks marked as Explicit: {playlist.total_explicit_tracks()} ({round(playlist.total_explicit_tracks()/len(playlist._tracks) * 100, 2)}%)
-
-Oldest Track: "{playlist.oldest_track._name}", by {playlist.oldest_track._artists[0]['name']}, Released: {playlist.oldest_track.get_release_date()}
-Newest Track: "{playlist.newest_track._name}", by {playlist.newest_track._artists[0]['name']}, Released: {playlist.newest_track.get_release_date()}
-"""
+    total_tracks = len(playlist._tracks)
+    total_explicit = playlist.total_explicit_tracks()
+    track_summary = [f"""--- TRACK SUMMARY ---
+Total Playable Tracks: {total_tracks}
+Total Tracks marked as Explicit: {total_explicit} ({round(total_explicit/total_tracks * 100, 2)}%)
+
+Oldest Track: "{playlist.oldest_track._name}", by {playlist.oldest_track.get_artist_name()}, Released: {playlist.oldest_track.get_release_date()}
+Newest Track: "{playlist.newest_track._name}", by {playlist.newest_track.get_artist_name()}, Released: {playlist.newest_track.get_release_date()}
+"""]
     min_max_list = playlist.min_max_analysis
     average_list = playlist.average_analysis
 
@@ -153,38 +541,44 @@ Newest Track: "{playlist.newest_track._name}", by {playlist.newest_track._artist
     max_duration = min_max_list["duration_ms"][1]
     max_duration_track = playlist.get_track(max_duration[0])
 
-    track_summary += f"""
-The Shortest Track in the playlist is: \"{min_duration_track._name}\", by {min_duration_track._artists[0]['name']} with a runtime of {convert_duration_ms(min_duration[1])}
-The Longest Track in the playlist is: \"{max_duration_track._name}\", by {max_duration_track._artists[0]['name']} with a runtime of {convert_duration_ms(max_duration[1])}
+    decade = playlist.get_most_common_decade()
+    album_type = playlist.get_most_common_album_type()
+    key = playlist.get_most_common_key()
+    mode = playlist.get_most_common_mode()
+    time_signature = playlist.get_most_common_time_signature()
+
+    track_summary.append(f"""
+The Shortest Track in the playlist is: \"{min_duration_track._name}\", by {min_duration_track.get_artist_name()} with a runtime of {convert_duration_ms(min_duration[1])}
+The Longest Track in the playlist is: \"{max_duration_track._name}\", by {max_duration_track.get_artist_name()} with a runtime of {convert_duration_ms(max_duration[1])}
 The Average Track duration is: {convert_duration_ms(average_list['duration_ms'])}
 
-Most Tracks Are from the {playlist.get_most_common_decade()[0]}'s ({round(playlist.get_most_common_decade()[1]/len(playlist._tracks) * 100, 2)}%)
-Most Tracks Are from the {playlist.get_most_common_album_type()[0].title()} Release ({round(playlist.get_most_common_album_type()[1]/len(playlist._tracks) * 100, 2)}%)
+Most Tracks Are from the {decade[0]}'s ({round(decade[1]/total_tracks * 100, 2)}%)
+Most Tracks Are from the {album_type[0].title()} Release ({round(album_type[1]/total_tracks * 100, 2)}%)
 
-The Most Common Key is: {playlist.get_most_common_key()[0]} ({round(playlist.get_most_common_key()[1]/len(playlist._tracks) * 100, 2)}%)
-The Most Common Mode is: {playlist.get_most_common_mode()[0]} ({round(playlist.get_most_common_mode()[1]/len(playlist._tracks) * 100, 2)}%)
-The Most Common Time Signature is: {convert_time_signature(playlist.get_most_common_time_signature()[0])} ({round(playlist.get_most_common_time_signature()[1]/len(playlist._tracks) * 100, 2)}%)
-"""
+The Most Common Key is: {key[0]} ({round(key[1]/total_tracks * 100, 2)}%)
+The Most Common Mode is: {mode[0]} ({round(mode[1]/total_tracks * 100, 2)}%)
+The Most Common Time Signature is: {convert_time_signature(time_signature[0])} ({round(time_signature[1]/total_tracks * 100, 2)}%)
+""")
     min_loudness = min_max_list["loudness"][0]
     min_loudness_track = playlist.get_track(min_loudness[0])
     max_loudness = min_max_list["loudness"][1]
     max_loudness_track = playlist.get_track(max_loudness[0])
 
-    track_summary += f"""
-The Quietest Track in the playlist is: \"{min_loudness_track._name}\", by {min_loudness_track._artists[0]['name']} with {min_loudness[1]} dB
-The Loudest Track in the playlist is: \"{max_loudness_track._name}\", by {max_loudness_track._artists[0]['name']} with {max_loudness[1]} dB
+    track_summary.append(f"""
+The Quietest Track in the playlist is: \"{min_loudness_track._name}\", by {min_loudness_track.get_artist_name()} with {min_loudness[1]} dB
+The Loudest Track in the playlist is: \"{max_loudness_track._name}\", by {max_loudness_track.get_artist_name()} with {max_loudness[1]} dB
 The Average dB is: {round(average_list['loudness'],2)} dB
-"""
+""")
 
     min_tempo = min_max_list["tempo"][0]
     min_tempo_track = playlist.get_track(min_tempo[0])
     max_tempo = min_max_list["tempo"][1]
     max_tempo_track = playlist.get_track(max_tempo[0])
-    track_summary += f"""
-The Track with the lowest tempo is: \"{min_tempo_track._name}\", by {min_tempo_track._artists[0]['name']} with a {min_tempo[1]} BPM
-The Track with the highest tempo is: \"{max_tempo_track._name}\", by {max_tempo_track._artists[0]['name']} with {max_tempo[1]} BPM
+    track_summary.append(f"""
+The Track with the lowest tempo is: \"{min_tempo_track._name}\", by {min_tempo_track.get_artist_name()} with a {min_tempo[1]} BPM
+The Track with the highest tempo is: \"{max_tempo_track._name}\", by {max_tempo_track.get_artist_name()} with {max_tempo[1]} BPM
 The Average Tempo is: {round(average_list['tempo'],2)} BPM
-"""
+""")
     average_valence = average_list["valence"]
     desc = None
     if average_valence > 0.66:
@@ -199,11 +593,11 @@ The Average Tempo is: {round(average_list['tempo'],2)} BPM
     max_valence = min_max_list["valence"][1]
     max_valence_track = playlist.get_track(max_valence[0])
 
-    track_summary += f"""
+    track_summary.append(f"""
 The Vibe of the playlist is {desc}
-The Least Positive Track in the playlist is: \"{min_valence_track._name}\", by {min_valence_track._artists[0]['name']} with a Valence score of {round(min_valence[1] * 100,2)}%
-The Most Positive Track in the playlist is: \"{max_valence_track._name}\", by {max_valence_track._artists[0]['name']} with a Valence score of {round(max_valence[1] * 100, 2)}%
-"""
+The Least Positive Track in the playlist is: \"{min_valence_track._name}\", by {min_valence_track.get_artist_name()} with a Valence score of {round(min_valence[1] * 100,2)}%
+The Most Positive Track in the playlist is: \"{max_valence_track._name}\", by {max_valence_track.get_artist_name()} with a Valence score of {round(max_valence[1] * 100, 2)}%
+""")
 
     average_danceability = average_list["danceability"]
     desc = None
@@ -219,11 +613,11 @@ The Most Positive Track in the playlist is: \"{max_valence_track._name}\", by {m
     max_danceability = min_max_list["danceability"][1]
     max_danceability_track = playlist.get_track(max_danceability[0])
 
-    track_summary += f"""
+    track_summary.append(f"""
 {desc}.
-The Least Danceable Track in the playlist is: \"{min_danceability_track._name}\", by {min_danceability_track._artists[0]['name']} with a danceability score of {round(min_danceability[1] * 100,2)}%
-The Most Danceable Track in the playlist is: \"{max_danceability_track._name}\", by {max_danceability_track._artists[0]['name']} with a danceability score of {round(max_danceability[1] * 100, 2)}%
-"""
+The Least Danceable Track in the playlist is: \"{min_danceability_track._name}\", by {min_danceability_track.get_artist_name()} with a danceability score of {round(min_danceability[1] * 100,2)}%
+The Most Danceable Track in the playlist is: \"{max_danceability_track._name}\", by {max_danceability_track.get_artist_name()} with a danceability score of {round(max_danceability[1] * 100, 2)}%
+""")
     average_energy = average_list["energy"]
     desc = None
     if average_energy > 0.66:
@@ -237,70 +631,84 @@ The Most Danceable Track in the playlist is: \"{max_danceability_track._name}\",
     min_energy_track = playlist.get_track(min_energy[0])
     max_energy = min_max_list["energy"][1]
     max_energy_track = playlist.get_track(max_energy[0])
-    track_summary += f"""
+    track_summary.append(f"""
 {desc}.
-The Lowest Energy Track in the playlist is: \"{min_energy_track._name}\", by {min_energy_track._artists[0]['name']} with a energy score of {round(min_energy[1] * 100,2)}%
-The Highest Energy Track in the playlist is: \"{max_energy_track._name}\", by {max_energy_track._artists[0]['name']} with a energy score of {round(max_energy[1] * 100, 2)}%
+The Lowest Energy Track in the playlist is: \"{min_energy_track._name}\", by {min_energy_track.get_artist_name()} with a energy score of {round(min_energy[1] * 100,2)}%
+The Highest Energy Track in the playlist is: \"{max_energy_track._name}\", by {max_energy_track.get_artist_name()} with a energy score of {round(max_energy[1] * 100, 2)}%
 
 The playlist contains {playlist.total_instrumental_tracks()} Instrumental tracks *
 The playlist contains {playlist.total_spoken_word_tracks()} Spoken Word tracks *
 
 The Most Popular Tracks in the playlist (according to spotify):
-"""
+""")
     most_popular = playlist.get_most_popular_list()
     for i in range(len(most_popular)):
         if i + 1 < 10:
-            track_summary += f"\n {i+1}.  {most_popular[i]._name} - {most_popular[i]._artists[0]['name']} ({most_popular[i]._popularity})"
+            track_summary.append(
+                f"\n {i+1}.  {most_popular[i]._name} - {most_popular[i].get_artist_name()} ({most_popular[i]._popularity})"
+            )
         else:
-            track_summary += f"\n{i+1}.  {most_popular[i]._name} - {most_popular[i]._artists[0]['name']} ({most_popular[i]._popularity})"
+            track_summary.append(
+                f"\n{i+1}.  {most_popular[i]._name} - {most_popular[i].get_artist_name()} ({most_popular[i]._popularity})"
+            )
 
-    track_summary += (
+    track_summary.append(
         f"\n\nThe Least Popular Tracks in the playlist (according to spotify) **:"
     )
     least_popular = playlist.get_least_popular_list()
     for i in range(len(least_popular)):
         if i + 1 < 10:
-            track_summary += f"\n {i+1}.  {least_popular[i]._name} - {least_popular[i]._artists[0]['name']} ({least_popular[i]._popularity})"
+            track_summary.append(
+                f"\n {i+1}.  {least_popular[i]._name} - {least_popular[i].get_artist_name()} ({least_popular[i]._popularity})"
+            )
         else:
-            track_summary += f"\n{i+1}.  {least_popular[i]._name} - {least_popular[i]._artists[0]['name']} ({least_popular[i]._popularity})"
-    track_summary += """
+            track_summary.append(
+                f"\n{i+1}.  {least_popular[i]._name} - {least_popular[i].get_artist_name()} ({least_popular[i]._popularity})"
+            )
+    track_summary.append("""
 
 *  Allegedly.
 ** If all have a score of zero, then list is in order of added to playlist.
-"""
-    return track_summary
+""")
+    return "".join(track_summary)
 
 
 def in_depth_breakdown(playlist: Playlist) -> None:
     """Print an in depth breakdown of the tracks."""
-    in_depth = f"""--- IN DEPTH BREAKDOWNS ---
+    in_depth = [f"""--- IN DEPTH BREAKDOWNS ---
 
- Album Type Breakdown:"""
+ Album Type Breakdown:"""]
     breakdown = playlist.get_album_type_breakdown()
     for key, value in breakdown.items():
-        in_depth += f"\n  {key.title()}: {value}"
-    in_depth += "\n\n Decade Release Breakdown:"
+        in_depth.append(f"\n  {key.title()}: {value}")
+    in_depth.append("\n\n Decade Release Breakdown:")
     breakdown = playlist.get_track_decade_release_breakdown()
     for key, value in breakdown.items():
-        in_depth += f"\n  {key}: {value}"
-    in_depth += "\n\n Key Breakdown:"
+        in_depth.append(f"\n  {key}: {value}")
+    in_depth.append("\n\n Key Breakdown:")
     breakdown = playlist.get_key_breakdown()
     for key, value in breakdown.items():
-        in_depth += f"\n  {key}: {value}"
-    in_depth += "\n\n Mode Breakdown:"
+        in_depth.append(f"\n  {key}: {value}")
+    in_depth.append("\n\n Mode Breakdown:")
     breakdown = playlist.get_mode_breakdown()
     for key, value in breakdown.items():
-        in_depth += f"\n  {key}: {value}"
-    in_depth += "\n\n Time Signature Breakdown:"
+        in_depth.append(f"\n  {key}: {value}")
+    in_depth.append("\n\n Time Signature Breakdown:")
     breakdown = playlist.get_time_signature_breakdown()
     for key, value in breakdown.items():
-        in_depth += f"\n  {convert_time_signature(key)}: {value}"
+        in_depth.append(f"\n  {convert_time_signature(key)}: {value}")
     if playlist.total_instrumental_tracks() > 0:
-        in_depth += "\n\nInstrumental Tracks: (*Spotify's instrumental score if often way off. Chances are half the tracks below won't be instrumental.)"
+        in_depth.append(
+            "\n\nInstrumental Tracks: (*Spotify's instrumental score if often way off. Chances are half the tracks below won't be instrumental.)"
+        )
         for track in playlist.get_instrumental_tracks():
-            in_depth += f"\n  {track._name} - {track._artists[0]['name']}   (Instrumentalness score: {track._instrumentalness})"
+            in_depth.append(
+                f"\n  {track._name} - {track.get_artist_name()}   (Instrumentalness score: {track._instrumentalness})"
+            )
     if playlist.total_spoken_word_tracks() > 0:
-        in_depth += "\n\nSpoken Word Tracks:"
+        in_depth.append("\n\nSpoken Word Tracks:")
         for track in playlist.get_spoken_word_tracks():
-            in_depth += f"\n  {track._name} - {track._artists[0]['name']}   (Speechiness score: {track._speechiness})"
-    return in_depth
+            in_depth.append(
+                f"\n  {track._name} - {track.get_artist_name()}   (Speechiness score: {track._speechiness})"
+            )
+    return "".join(in_depth)
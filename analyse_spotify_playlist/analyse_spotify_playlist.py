@@ -1,11 +1,45 @@
 """Main entry for Application."""
 
-from analyse_spotify_playlist.analyse import analyse_playlists
+import asyncio
+
+from analyse_spotify_playlist.analyse import analyse_playlists, analyse_playlists_async
+from analyse_spotify_playlist.batch import run_batch, write_failure_summary
+from analyse_spotify_playlist.track_registry import shared_tracks
 from analyse_spotify_playlist.utils import performance_timer
 
 
 @performance_timer
-def main(playlist_ids: list[str], verbose: bool):
+def main(
+    playlist_ids: list[str],
+    verbose: bool,
+    incremental: bool = False,
+    pipelined: bool = False,
+):
     """Start application."""
-    for playlist_id in playlist_ids:
-        analyse_playlists(playlist_id, verbose)
+    with shared_tracks():
+        for playlist_id in playlist_ids:
+            analyse_playlists(playlist_id, verbose, incremental, pipelined)
+
+
+@performance_timer
+def main_async(playlist_ids: list[str], depth: int):
+    """Start application, analysing all playlists concurrently with asyncio."""
+    with shared_tracks():
+        asyncio.run(analyse_playlists_async(playlist_ids, depth))
+
+
+@performance_timer
+def main_batch(
+    playlist_ids: list[str],
+    depth: int,
+    workers: int,
+    use_processes: bool = False,
+    incremental: bool = False,
+    pipelined: bool = False,
+):
+    """Start application, analysing the playlists on a pool of workers."""
+    with shared_tracks():
+        failures = run_batch(
+            playlist_ids, depth, workers, use_processes, incremental, pipelined
+        )
+    write_failure_summary(len(playlist_ids), failures)
@@ -0,0 +1,232 @@
+"""Asyncio variant of the Outbound HTTPS requests to Spotify."""
+
+import asyncio
+import json
+from collections.abc import Mapping
+
+from aiohttp import ClientResponseError, ClientSession, RequestInfo, TCPConnector
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from analyse_spotify_playlist.config import (
+    ASYNC_CONNECTION_LIMIT,
+    ASYNC_CONNECTION_LIMIT_PER_HOST,
+    AUDIO_FEATURES_BATCH_SIZE,
+    CLIENT_ID,
+    CLIENT_SECRET,
+    PAGE_SIZE,
+    PLAYLIST_METADATA_FIELDS,
+    SPOTIFY_ACCOUNTS_URL,
+    SPOTIFY_API_URL,
+)
+from analyse_spotify_playlist.metrics import increment
+from analyse_spotify_playlist.outbound_requests import (
+    get_remaining_page_offsets,
+    set_auth_header,
+)
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.request_scheduler import get_scheduler
+from analyse_spotify_playlist.response_archive import get_archive
+from analyse_spotify_playlist.utils import performance_timer, split_into_batches
+
+
+def create_session(
+    limit: int = ASYNC_CONNECTION_LIMIT,
+    limit_per_host: int = ASYNC_CONNECTION_LIMIT_PER_HOST,
+) -> ClientSession:
+    """Create a session with a pooled connector.
+
+    The connector limits bound the number of requests in flight, so every
+    playlist in a run can share the one session."""
+    connector = TCPConnector(limit=limit, limit_per_host=limit_per_host)
+    return ClientSession(connector=connector)
+
+
+async def send_request_async(
+    session: ClientSession, method: str, url: str, **kwargs
+) -> tuple[int, Mapping, dict | None]:
+    """Send a request through the shared scheduler.
+
+    Requests wait for a slot from the scheduler, and throttled or failed
+    requests are retried for as long as the scheduler allows. As with the
+    HttpClient, the final response is recorded to the archive if set, error
+    or not, and is replayed from it when replaying.
+
+    Returns:
+        status (int), headers (case insensitive), json body (dict | None, None for a 304)
+
+    Raises:
+        ClientResponseError: if the final response, sent or replayed, is an error.
+    """
+    archive = get_archive()
+    if archive is not None and archive.replaying:
+        entry = archive.lookup(method, url, kwargs.get("params"))
+        headers = CIMultiDict(entry["headers"])
+        if entry["status"] >= 400:
+            request_info = RequestInfo(
+                URL(url), method, CIMultiDictProxy(CIMultiDict())
+            )
+            raise ClientResponseError(
+                request_info,
+                (),
+                status=entry["status"],
+                headers=headers,
+            )
+        if entry["status"] == 304:
+            return entry["status"], headers, None
+        return entry["status"], headers, json.loads(entry["content"])
+    scheduler = get_scheduler()
+    attempt = 0
+    while True:
+        wait = scheduler.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with session.request(method, url, **kwargs) as res:
+            increment("requests_sent")
+            delay = scheduler.retry_delay(res.status, res.headers, attempt)
+            if delay is None:
+                if archive is not None:
+                    archive.record(
+                        method,
+                        url,
+                        kwargs.get("params"),
+                        res.status,
+                        res.headers,
+                        await res.text(),
+                    )
+                res.raise_for_status()
+                if res.status == 304:
+                    return res.status, res.headers.copy(), None
+                return res.status, res.headers.copy(), await res.json()
+        attempt += 1
+        increment("requests_retried")
+        await asyncio.sleep(delay)
+
+
+async def request_json_async(
+    session: ClientSession, method: str, url: str, **kwargs
+) -> dict:
+    """Send a request through the shared scheduler and return the json body."""
+    _status, _headers, body = await send_request_async(session, method, url, **kwargs)
+    return body
+
+
+@performance_timer("token")
+async def request_access_token_async(session: ClientSession) -> dict:
+    """Request access token from Spotify."""
+    body = {
+        "grant_type": "client_credentials",
+        "client_id": CLIENT_ID,
+        "client_secret": CLIENT_SECRET,
+    }
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+    return await request_json_async(
+        session, "POST", SPOTIFY_ACCOUNTS_URL, data=body, headers=headers
+    )
+
+
+@performance_timer("first_page")
+async def pull_playlist_data_async(
+    session: ClientSession, token: str, playlist_id: str, fields: str | None = None
+) -> dict:
+    """Request Playlist data from Spotify."""
+    url = f"{SPOTIFY_API_URL}playlists/{playlist_id}"
+    params = {}
+    if fields:
+        params["fields"] = fields
+    return await request_json_async(
+        session, "GET", url, params=params, headers=set_auth_header(token)
+    )
+
+
+@performance_timer("playlist_metadata")
+async def pull_playlist_metadata_async(
+    session: ClientSession, token: str, playlist_id: str, etag: str | None = None
+) -> tuple[dict | None, str | None]:
+    """Request only the Playlist metadata, used to check if it has changed.
+
+    If an etag is provided the request is conditional, and None is returned
+    in place of the metadata when the playlist has not changed."""
+    url = f"{SPOTIFY_API_URL}playlists/{playlist_id}"
+    params = {"fields": PLAYLIST_METADATA_FIELDS}
+    headers = set_auth_header(token)
+    if etag:
+        headers["If-None-Match"] = etag
+    status, res_headers, metadata = await send_request_async(
+        session, "GET", url, params=params, headers=headers
+    )
+    if status == 304:
+        return None, etag
+    return metadata, res_headers.get("ETag")
+
+
+@performance_timer("page")
+async def pull_track_page_async(
+    session: ClientSession,
+    token: str,
+    playlist_id: str,
+    offset: int,
+    limit: int = PAGE_SIZE,
+    fields: str | None = None,
+) -> dict:
+    """Request a single page of tracks for the playlist, starting at offset."""
+    url = f"{SPOTIFY_API_URL}playlists/{playlist_id}/tracks"
+    params = {"offset": offset, "limit": limit}
+    if fields:
+        params["fields"] = fields
+    return await request_json_async(
+        session, "GET", url, params=params, headers=set_auth_header(token)
+    )
+
+
+async def pull_remaining_tracks_async(
+    session: ClientSession, token: str, playlist: Playlist, fields: str | None = None
+) -> list[dict]:
+    """Fetch every remaining page of tracks concurrently.
+
+    Pages are added to the playlist in playlist order. The pages are returned
+    in the same order."""
+    offsets, limit = get_remaining_page_offsets(playlist)
+    pages = await asyncio.gather(
+        *(
+            pull_track_page_async(session, token, playlist.id, offset, limit, fields)
+            for offset in offsets
+        )
+    )
+    for page in pages:
+        playlist.add_tracks(page)
+    return pages
+
+
+@performance_timer("feature_batch")
+async def audio_feature_request_async(
+    session: ClientSession, token: str, track_ids: list[str]
+) -> list:
+    """Request the audio features of the provided track_ids."""
+    if len(track_ids) > 100:
+        raise ValueError("too many track ids to request. Maximum is 100")
+    if len(track_ids) == 0:
+        return []
+    id_string = ",".join(track_ids)
+
+    url = f"{SPOTIFY_API_URL}audio-features"
+    params = {"ids": id_string}
+    res = await request_json_async(
+        session, "GET", url, params=params, headers=set_auth_header(token)
+    )
+    return res["audio_features"]
+
+
+async def pull_tracks_audio_features_async(
+    session: ClientSession, token: str, track_ids: list[str]
+) -> list:
+    """Request the audio features for all track ids, in id order."""
+    batches = split_into_batches(track_ids, AUDIO_FEATURES_BATCH_SIZE)
+    results = await asyncio.gather(
+        *(audio_feature_request_async(session, token, batch) for batch in batches)
+    )
+    features = []
+    for batch_features in results:
+        features.extend(batch_features)
+    return features
@@ -0,0 +1,170 @@
+"""Analyse many playlists at once, from a file or stdin."""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, TextIO
+
+from analyse_spotify_playlist.analyse import analyse_playlists
+from analyse_spotify_playlist.config import (
+    BATCH_FAILURES_FILE,
+    BATCH_WORKERS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+)
+from analyse_spotify_playlist.feature_cache import set_feature_cache
+from analyse_spotify_playlist.file_output import FileOutput
+from analyse_spotify_playlist.http_client import set_client
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import increment
+from analyse_spotify_playlist.playlist_cache import set_playlist_cache
+from analyse_spotify_playlist.request_scheduler import RequestScheduler, set_scheduler
+from analyse_spotify_playlist.token_provider import (
+    TokenProvider,
+    get_token_provider,
+    set_token_provider,
+)
+from analyse_spotify_playlist.track_registry import TrackRegistry, set_track_registry
+from analyse_spotify_playlist.warehouse import Warehouse, get_warehouse, set_warehouse
+
+logger = Log()
+
+
+def read_playlist_ids(source: TextIO) -> list[str]:
+    """Return the playlist ids listed in the source, in order.
+
+    Ids are split by line or comma. Blank lines and lines starting with #
+    are skipped, and repeated ids are only returned once."""
+    playlist_ids = {}
+    for line in source:
+        line = line.strip()
+        if line == "" or line.startswith("#"):
+            continue
+        for playlist_id in line.split(","):
+            playlist_id = playlist_id.strip()
+            if playlist_id != "":
+                playlist_ids[playlist_id] = None
+    return list(playlist_ids)
+
+
+def analyse_batch_item(
+    playlist_id: str, depth: int, incremental: bool = False, pipelined: bool = False
+) -> str | None:
+    """Analyse one playlist, returning the error if it failed."""
+    try:
+        analyse_playlists(playlist_id, depth, incremental, pipelined)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def init_process_worker(
+    workers: int,
+    verbose: bool,
+    write_to_file: bool,
+    output_path,
+    output_format: str,
+    export_format: str | None,
+    warehouse_path,
+    token: dict,
+    token_cache_path,
+) -> None:
+    """Set up a worker process for the batch.
+
+    The HTTP pool, caches and warehouse are reopened in the worker rather
+    than shared with the parent, tracks are shared between the playlists
+    the worker analyses, and the rate limit is split between the workers. The
+    worker starts with the parent's token, whichever way it was started."""
+    Log.log_messages = verbose
+    FileOutput.write_to_file = write_to_file
+    FileOutput.path = output_path
+    FileOutput.output_format = output_format
+    FileOutput.export_format = export_format
+    set_client(None)
+    set_feature_cache(None)
+    set_playlist_cache(None)
+    set_warehouse(None if warehouse_path is None else Warehouse(warehouse_path))
+    set_track_registry(TrackRegistry())
+    token_provider = TokenProvider(token_cache_path)
+    token_provider.use_token(token)
+    set_token_provider(token_provider)
+    requests_per_second = None
+    if RATE_LIMIT_PER_SECOND is not None:
+        requests_per_second = RATE_LIMIT_PER_SECOND / workers
+    set_scheduler(
+        RequestScheduler(requests_per_second, max(RATE_LIMIT_BURST // workers, 1))
+    )
+
+
+def create_executor(workers: int, use_processes: bool) -> Executor:
+    """Return the pool the playlists are analysed on."""
+    if not use_processes:
+        return ThreadPoolExecutor(max_workers=workers)
+    warehouse = get_warehouse()
+    token_provider = get_token_provider()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_process_worker,
+        initargs=(
+            workers,
+            Log.log_messages,
+            FileOutput.write_to_file,
+            FileOutput.path,
+            FileOutput.output_format,
+            FileOutput.export_format,
+            None if warehouse is None else warehouse.path,
+            token_provider.get_access_token().to_dict(),
+            token_provider.cache_path,
+        ),
+    )
+
+
+def run_batch(
+    playlist_ids: Iterable[str],
+    depth: int,
+    workers: int = BATCH_WORKERS,
+    use_processes: bool = False,
+    incremental: bool = False,
+    pipelined: bool = False,
+) -> dict[str, str]:
+    """Analyse every playlist on a pool of workers.
+
+    Worker threads share the token provider and HTTP pool. Worker processes
+    each have their own HTTP pool, and are handed the token requested here.
+    A failed playlist does not stop the batch. Returns the error for each
+    playlist that failed."""
+    playlist_ids = list(playlist_ids)
+    # Request the token once up front, rather than once per worker.
+    get_token_provider().get_token()
+    failures = {}
+    with create_executor(workers, use_processes) as executor:
+        errors = executor.map(
+            analyse_batch_item,
+            playlist_ids,
+            [depth] * len(playlist_ids),
+            [incremental] * len(playlist_ids),
+            [pipelined] * len(playlist_ids),
+        )
+        for playlist_id, error in zip(playlist_ids, errors):
+            if error is not None:
+                logger.print(f"Playlist {playlist_id} failed: {error}")
+                increment("playlists_failed")
+                failures[playlist_id] = error
+    return failures
+
+
+def write_failure_summary(total: int, failures: dict[str, str]) -> None:
+    """Output how many playlists were analysed, and why any failed.
+
+    If file output is enabled, the failures are also written to the
+    output path."""
+    print(f"Analysed {total - len(failures)} of {total} playlists.")
+    if len(failures) == 0:
+        return
+    summary = "".join(
+        f"{playlist_id}\t{error}\n" for playlist_id, error in failures.items()
+    )
+    print(f"{len(failures)} failed:\n{summary}", end="")
+    if FileOutput.write_to_file:
+        with open(
+            FileOutput.path.joinpath(BATCH_FAILURES_FILE), "w", encoding="utf-8"
+        ) as f:
+            f.write(summary)
@@ -7,3 +7,117 @@ SPOTIFY_ACCOUNTS_URL = "https://accounts.spotify.com/api/token"
 # Client info from setting up a developer app
 CLIENT_ID = ""
 CLIENT_SECRET = ""
+
+# Access token
+# File the access token is cached in between runs. Set to None to disable the cache.
+TOKEN_CACHE_PATH = "~/.cache/analyse_spotify_playlist/token.json"
+# Request a new token when the current one expires within this many seconds.
+TOKEN_REFRESH_MARGIN = 60
+
+# Audio features cache
+# SQLite file the audio features are cached in. Set to None to disable the cache.
+FEATURE_CACHE_PATH = "~/.cache/analyse_spotify_playlist/audio_features.sqlite3"
+# Maximum number of tracks to keep in the cache. Least recently used are removed first.
+FEATURE_CACHE_MAX_ENTRIES = 500_000
+
+# Warehouse
+# SQLite database every analysed playlist, track and audio feature is stored in.
+# None to not store them. Can also be set with --warehouse.
+WAREHOUSE_PATH = None
+
+# Playlist cache
+# Directory the tracks of each playlist are cached in. Set to None to disable the cache.
+PLAYLIST_CACHE_PATH = "~/.cache/analyse_spotify_playlist/playlists"
+
+# Fields filter
+# Playlist fields requested from Spotify. Only what the analysis reads is requested.
+PLAYLIST_FIELDS = (
+    "collaborative,description,followers(total),id,name,owner(display_name),"
+    "public,snapshot_id"
+)
+# Fields requested to check if a playlist has changed since it was cached.
+PLAYLIST_METADATA_FIELDS = f"{PLAYLIST_FIELDS},tracks(total)"
+# Track fields requested from Spotify, with the lowest analytical depth that reads them.
+TRACK_FIELDS_BY_DEPTH = {
+    "id": 0,
+    "name": 0,
+    "artists(name)": 0,
+    "album(album_type,release_date)": 0,
+    "duration_ms": 0,
+    "explicit": 0,
+    "popularity": 0,
+}
+
+# HTTP connection pool
+# Number of hosts to keep a pool of connections for.
+HTTP_POOL_CONNECTIONS = 4
+# Maximum number of kept-alive connections per host.
+HTTP_POOL_MAXSIZE = 16
+# Block when the per host limit is reached, instead of opening a throwaway connection.
+HTTP_POOL_BLOCK = True
+
+# Rate limiting and retries, shared by every request.
+# Requests per second allowed across all workers. Set to None to disable.
+RATE_LIMIT_PER_SECOND = 20
+# Number of requests allowed to go out at once before the rate applies.
+RATE_LIMIT_BURST = 20
+# Number of times a throttled (429) or failed (5xx) request is retried.
+MAX_RETRIES = 5
+# Base and maximum wait in seconds between retries of a failed request.
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+# Wait used when a 429 response has no usable Retry-After header.
+DEFAULT_RETRY_AFTER = 1
+
+# Concurrency
+# Number of tracks requested per page of a playlist. 100 is the maximum Spotify allows.
+PAGE_SIZE = 100
+# Maximum number of requests to have in flight at once for a playlist.
+MAX_WORKERS = 8
+# Number of track ids per audio features request. 100 is the maximum Spotify allows.
+AUDIO_FEATURES_BATCH_SIZE = 100
+
+# Asyncio client
+# Maximum number of connections open at once, across all playlists.
+ASYNC_CONNECTION_LIMIT = 200
+# Maximum number of connections open at once to a single host.
+ASYNC_CONNECTION_LIMIT_PER_HOST = 100
+
+# Report output
+# Formats the analysis can be output in.
+OUTPUT_FORMATS = ["text", "json", "ndjson"]
+# Size of the buffer in front of each report file, in bytes.
+REPORT_BUFFER_SIZE = 64 * 1024
+
+# Batch mode
+# Number of playlists analysed at once.
+BATCH_WORKERS = 4
+# Name of the file listing the playlists that failed, in the output path.
+BATCH_FAILURES_FILE = "batch_failures.txt"
+# Name of the file every playlist is appended to, in the NDJSON output format.
+NDJSON_FILE = "analysis.ndjson"
+
+# Server mode
+# Address the server listens on. Only local connections are accepted by default.
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+# Number of playlists analysed at once.
+SERVER_WORKERS = 4
+# Number of rendered reports kept in memory. Least recently used are removed first.
+SERVER_REPORT_CACHE_SIZE = 256
+# Seconds a rendered report is served for before the playlist is analysed again.
+SERVER_REPORT_TTL = 300
+
+# Track export
+# Formats the tracks can be exported in. arrow and parquet need pyarrow.
+EXPORT_FORMATS = ["csv", "arrow", "parquet"]
+# Number of tracks converted and written at a time.
+EXPORT_CHUNK_SIZE = 10_000
+
+# Metrics
+# Formats the metrics of a run can be output in, with --metrics.
+METRICS_FORMATS = ["summary", "json", "prometheus"]
+# Upper bounds in seconds of the latency histogram buckets.
+METRICS_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+# Latest timings kept per stage, to work out the percentiles from.
+METRICS_MAX_SAMPLES = 10_000
@@ -0,0 +1,149 @@
+"""Persistent cache of track audio features."""
+
+import json
+import sqlite3
+import threading
+from pathlib import PosixPath
+from time import time
+
+from analyse_spotify_playlist.config import (
+    FEATURE_CACHE_MAX_ENTRIES,
+    FEATURE_CACHE_PATH,
+)
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.utils import split_into_batches
+
+logger = Log()
+
+# Stay under SQLite's limit on the number of variables in one statement.
+MAX_VARIABLES = 500
+
+
+class FeatureCache:
+    """SQLite backed cache of audio features, keyed by track id.
+
+    Audio features for a track never change, so once fetched they are kept
+    until the cache is full, then the least recently used are evicted."""
+
+    def __init__(
+        self,
+        path: str = FEATURE_CACHE_PATH,
+        max_entries: int = FEATURE_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """Open (or create) the cache database."""
+        if path != ":memory:":
+            path = PosixPath(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("""CREATE TABLE IF NOT EXISTS audio_features (
+                    id TEXT PRIMARY KEY,
+                    features TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )""")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS audio_features_last_used "
+                "ON audio_features (last_used)"
+            )
+
+    def get_many(self, track_ids: list[str]) -> dict[str, dict]:
+        """Return the cached audio features for the track ids that are cached."""
+        found = {}
+        with self._lock, self._connection:
+            for batch in split_into_batches(track_ids, MAX_VARIABLES):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT id, features FROM audio_features WHERE id IN ({placeholders})",
+                    batch,
+                )
+                for track_id, features in rows:
+                    found[track_id] = json.loads(features)
+            now = time()
+            self._connection.executemany(
+                "UPDATE audio_features SET last_used = ? WHERE id = ?",
+                [(now, track_id) for track_id in found],
+            )
+            self.hits += len(found)
+            self.misses += len(track_ids) - len(found)
+        return found
+
+    def put_many(self, audio_features: list[dict | None]) -> None:
+        """Add audio features to the cache. Tracks without features are skipped."""
+        now = time()
+        rows = [
+            (features["id"], json.dumps(features), now)
+            for features in audio_features
+            if isinstance(features, dict)
+        ]
+        if len(rows) == 0:
+            return
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO audio_features (id, features, last_used) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self.__evict()
+
+    def __evict(self) -> None:
+        """Remove the least recently used entries above max_entries."""
+        (total,) = self._connection.execute(
+            "SELECT COUNT(*) FROM audio_features"
+        ).fetchone()
+        if total <= self.max_entries:
+            return
+        self._connection.execute(
+            "DELETE FROM audio_features WHERE id IN "
+            "(SELECT id FROM audio_features ORDER BY last_used LIMIT ?)",
+            (total - self.max_entries,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (total,) = self._connection.execute(
+                "SELECT COUNT(*) FROM audio_features"
+            ).fetchone()
+        return total
+
+    def hit_ratio(self) -> float:
+        """Return the share of lookups that were found in the cache."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+def merge_audio_features(
+    track_ids: list[str], cached: dict[str, dict], fetched: list[dict | None]
+) -> list[dict | None]:
+    """Combine cached and newly fetched audio features, in track id order."""
+    fetched_by_id = {
+        features["id"]: features for features in fetched if isinstance(features, dict)
+    }
+    return [cached.get(x, fetched_by_id.get(x)) for x in track_ids]
+
+
+_cache: FeatureCache | None = None
+
+
+def get_feature_cache() -> FeatureCache | None:
+    """Return the shared cache, or None if the cache is disabled."""
+    global _cache
+    if _cache is None and FEATURE_CACHE_PATH is not None:
+        _cache = FeatureCache()
+    return _cache
+
+
+def set_feature_cache(cache: FeatureCache | None) -> None:
+    """Replace the shared cache. Pass None to reopen it on next use."""
+    global _cache
+    _cache = cache
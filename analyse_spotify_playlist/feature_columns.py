@@ -0,0 +1,96 @@
+"""Columnar store of the audio features for a playlist."""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from analyse_spotify_playlist.track import Track
+
+# The numeric values analysed for every track, in report order.
+COLUMN_KEYS = [
+    "acousticness",
+    "danceability",
+    "energy",
+    "instrumentalness",
+    "liveness",
+    "loudness",
+    "speechiness",
+    "tempo",
+    "time_signature",
+    "valence",
+    "duration_ms",
+    "popularity",
+]
+
+
+class FeatureColumns:
+    """One float array per audio feature, with a parallel array of track ids.
+
+    Tracks without a value for a feature hold NaN, and are skipped by the
+    reductions."""
+
+    def __init__(
+        self, tracks: dict[str, Track], columns: dict[str, np.ndarray] | None = None
+    ) -> None:
+        """Build the columns from the tracks, unless they have already been built.
+
+        Prebuilt columns must be in the same order as the tracks."""
+        self._tracks = tracks
+        self.ids = np.array(list(tracks.keys()), dtype=object)
+        if columns is not None:
+            self.columns = columns
+            return
+        self.columns: dict[str, np.ndarray] = {}
+        for key in COLUMN_KEYS:
+            get_value = attrgetter(f"_{key}")
+            self.columns[key] = np.fromiter(
+                (
+                    np.nan if get_value(track) is None else get_value(track)
+                    for track in tracks.values()
+                ),
+                dtype=float,
+                count=len(tracks),
+            )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __value_at(self, key: str, index: int) -> tuple[str, float | int]:
+        """Return the track id and its original value for the row."""
+        track_id = self.ids[index]
+        return track_id, getattr(self._tracks[track_id], f"_{key}")
+
+    def min_max(self) -> dict[str, list[list[str, float]]]:
+        """Return the track with the minimum and maximum value for each key.
+
+        Matches find_min_max_audio_features: the first track wins a tie, and
+        a key with no values keeps [None, inf], [None, -inf]."""
+        min_max = {}
+        for key, column in self.columns.items():
+            if np.isnan(column).all():
+                min_max[key] = [[None, float("inf")], [None, float("-inf")]]
+                continue
+            min_max[key] = [
+                list(self.__value_at(key, int(np.nanargmin(column)))),
+                list(self.__value_at(key, int(np.nanargmax(column)))),
+            ]
+        return min_max
+
+    def average(self) -> dict[str, float]:
+        """Return the average value for each key.
+
+        Matches find_average_audio_features: the total is divided by the
+        number of tracks, including those without a value."""
+        no_of_tracks = len(self)
+        average = {}
+        for key, column in self.columns.items():
+            total = float(np.nansum(column))
+            if key == "duration_ms":
+                average[key] = int(total // no_of_tracks)
+            else:
+                average[key] = round(total / no_of_tracks, 5)
+        return average
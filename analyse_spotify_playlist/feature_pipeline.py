@@ -0,0 +1,130 @@
+"""Request the audio features of a playlist while its tracks are still arriving."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+from analyse_spotify_playlist.config import AUDIO_FEATURES_BATCH_SIZE, MAX_WORKERS
+from analyse_spotify_playlist.feature_cache import get_feature_cache
+from analyse_spotify_playlist.outbound_requests import audio_feature_request
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.track_registry import get_track_registry
+from analyse_spotify_playlist.utils import clean_up_track_features
+
+
+class FeaturePipeline:
+    """Dispatch a batch of audio features as soon as enough track ids arrive.
+
+    Track ids are queued as each page of tracks is added, and a request is
+    sent once AUDIO_FEATURES_BATCH_SIZE ids are waiting, while later pages are
+    still downloading. Cached features are populated straight away. The
+    requests run on their own pool of workers, but the features are matched
+    back to their tracks on the calling thread, as each page is added and
+    when the pipeline finishes, so the playlist is only changed from one
+    thread. If tracks are shared through a registry, only the tracks it has
+    never seen are requested."""
+
+    def __init__(
+        self,
+        token: str,
+        populate: Callable[[Playlist, list[tuple]], None],
+        max_workers: int = MAX_WORKERS,
+        batch_size: int = AUDIO_FEATURES_BATCH_SIZE,
+    ) -> None:
+        """Set up the pool of workers.
+
+        populate is called with the playlist and each list of cleaned features."""
+        self.token = token
+        self.populate = populate
+        self.batch_size = batch_size
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.feature_cache = get_feature_cache()
+        self.registry = get_track_registry()
+        self.playlist: Playlist | None = None
+        self.pending: list[str] = []
+        # Each request, and the track ids it is for.
+        self.in_flight: dict[Future, list[str]] = {}
+        # Tracks claimed by another playlist in the registry.
+        self.shared: list[str] = []
+        self.cached = 0
+        self.requested = 0
+
+    def __enter__(self) -> "FeaturePipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        if self.registry is not None:
+            # Release the claims of any batch that was not populated.
+            unpopulated = [x for ids in self.in_flight.values() for x in ids]
+            self.registry.release_features(self.pending + unpopulated, False)
+
+    def add_tracks(self, playlist: Playlist, track_ids: list[str]) -> None:
+        """Queue the ids of newly added tracks, dispatching every full batch.
+
+        Features of batches that have already completed are populated."""
+        self.playlist = playlist
+        if self.registry is not None:
+            track_ids, shared = self.registry.claim_features(track_ids)
+            self.shared.extend(shared)
+        if self.feature_cache is not None and len(track_ids) > 0:
+            cached = self.feature_cache.get_many(track_ids)
+            self.cached += len(cached)
+            self.populate(
+                playlist,
+                [clean_up_track_features(cached[x]) for x in track_ids if x in cached],
+            )
+            if self.registry is not None:
+                self.registry.release_features(list(cached))
+            track_ids = [x for x in track_ids if x not in cached]
+        self.pending.extend(track_ids)
+        while len(self.pending) >= self.batch_size:
+            self.__dispatch(self.pending[: self.batch_size])
+            self.pending = self.pending[self.batch_size :]
+        self.__populate_completed(block=False)
+
+    def finish(self) -> None:
+        """Dispatch the remaining ids, and populate every batch as it completes.
+
+        Then wait for the features of tracks another playlist requested. Any
+        that playlist failed to request are claimed and requested here."""
+        self.__drain()
+        if self.registry is None or self.playlist is None:
+            return
+        while len(self.shared) > 0:
+            shared = self.shared
+            self.shared = []
+            unpopulated = self.registry.wait_for_features(shared)
+            self.playlist.add_shared_features(
+                [x for x in shared if x not in unpopulated]
+            )
+            if len(unpopulated) > 0:
+                self.add_tracks(self.playlist, unpopulated)
+                self.__drain()
+
+    def __drain(self) -> None:
+        """Dispatch the remaining ids, and populate every batch in flight."""
+        if len(self.pending) > 0:
+            self.__dispatch(self.pending)
+            self.pending = []
+        while len(self.in_flight) > 0:
+            self.__populate_completed(block=True)
+
+    def __dispatch(self, track_ids: list[str]) -> None:
+        self.requested += len(track_ids)
+        future = self.executor.submit(audio_feature_request, self.token, track_ids)
+        self.in_flight[future] = track_ids
+
+    def __populate_completed(self, block: bool) -> None:
+        """Populate the batches that have completed, waiting for one if block."""
+        if block:
+            done, _ = wait(self.in_flight, return_when=FIRST_COMPLETED)
+        else:
+            done = [future for future in self.in_flight if future.done()]
+        for future in done:
+            batch = future.result()
+            track_ids = self.in_flight.pop(future)
+            if self.feature_cache is not None:
+                self.feature_cache.put_many(batch)
+            self.populate(self.playlist, list(map(clean_up_track_features, batch)))
+            if self.registry is not None:
+                self.registry.release_features(track_ids)
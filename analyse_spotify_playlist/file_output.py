@@ -1,6 +1,19 @@
 """Class to manage writing to files."""
 
+import sys
+import threading
 from pathlib import PosixPath
+from typing import Iterable, TextIO
+
+from analyse_spotify_playlist.config import (
+    NDJSON_FILE,
+    OUTPUT_FORMATS,
+    REPORT_BUFFER_SIZE,
+)
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import timer
+
+logger = Log()
 
 
 class FileOutput:
@@ -8,8 +21,13 @@ class FileOutput:
 
     write_to_file = False
     path = None
+    # One of OUTPUT_FORMATS
+    output_format = "text"
+    # One of EXPORT_FORMATS, or None to not export the tracks
+    export_format = None
 
     def __init__(self) -> None:
+        self.base_name = None
         self.file_name = None
 
     @staticmethod
@@ -27,30 +45,111 @@ class FileOutput:
         """Set the write to file flag."""
         FileOutput.write_to_file = flag
 
+    def set_output_format(self, output_format: str) -> None:
+        """Set the format of the analysis output."""
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        FileOutput.output_format = output_format
+
+    def set_export_format(self, export_format: str | None) -> None:
+        """Set the format the tracks are exported in, or None to not export them."""
+        FileOutput.export_format = export_format
+
     def set_file_name(self, playlist_name: str) -> None:
         """Set the file name to be playlist name."""
-        self.file_name = f"{playlist_name.replace(' ', '_').replace('/', '-')}_analysis"
+        self.base_name = playlist_name.replace(" ", "_").replace("/", "-")
+        self.file_name = f"{self.base_name}_analysis"
+
+    def export_path(self) -> PosixPath:
+        """Return the path of the track export, without an extension."""
+        return self.path.joinpath(f"{self.base_name}_tracks")
+
+    def open_file(self, extension: str = "txt") -> TextIO:
+        """Open the file for writing, replacing any previous content."""
+        return open(
+            self.path.joinpath(f"{self.file_name}.{extension}"),
+            "w",
+            encoding="utf-8",
+            buffering=REPORT_BUFFER_SIZE,
+        )
+
+
+class ReportWriter:
+    """Streams the sections of a playlist report to the terminal and the file.
+
+    The file is opened once, when the writer is entered, and each section is
+    written to it through a buffer as soon as it is produced. The buffer is
+    flushed and the file closed when the writer exits. While printing to the
+    terminal, one report is output at a time, so reports written from
+    several threads do not interleave."""
+
+    _terminal_lock = threading.Lock()
+
+    def __init__(self, file_handler: FileOutput, extension: str = "txt") -> None:
+        self.file_handler = file_handler
+        self.extension = extension
+        self.file: TextIO | None = None
+        self.holds_terminal = False
 
-    def create_file(self) -> None:
-        """Create empty file."""
+    def __enter__(self) -> "ReportWriter":
         if FileOutput.write_to_file:
-            with open(
-                self.path.joinpath(f"{self.file_name}.txt"),
-                "w",
-                encoding="utf-8",
-            ) as f:
-                f.writelines("")
-                f.close()
-        return
+            self.file = self.file_handler.open_file(self.extension)
+        if Log.log_messages:
+            ReportWriter._terminal_lock.acquire()
+            self.holds_terminal = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.file is not None:
+            # Most of the report is still buffered, and is written on close.
+            with timer("write"):
+                self.file.close()
+            self.file = None
+        if self.holds_terminal:
+            self.holds_terminal = False
+            ReportWriter._terminal_lock.release()
+
+    def write(self, section: str) -> None:
+        """Output a section of the report to each enabled sink."""
+        logger.print(section)
+        if self.file is not None:
+            self.file.write(section)
+
+    def write_chunks(self, chunks: Iterable[str]) -> None:
+        """Output a section of the report as it is produced, chunk by chunk."""
+        for chunk in chunks:
+            if self.holds_terminal:
+                sys.stdout.write(chunk)
+            if self.file is not None:
+                self.file.write(chunk)
+        if self.holds_terminal:
+            sys.stdout.write("\n")
+
+
+_ndjson_lock = threading.Lock()
+
+
+def start_ndjson_output() -> None:
+    """Empty the NDJSON file, if it is the output, before a run appends to it.
+
+    Call once at the start of the run, so the file only holds the playlists
+    of this run, as the other formats replace their files."""
+    if FileOutput.output_format == "ndjson" and FileOutput.write_to_file:
+        with open(FileOutput.path.joinpath(NDJSON_FILE), "w", encoding="utf-8"):
+            pass
+
+
+def append_ndjson_line(line: str) -> None:
+    """Output one line of the NDJSON output, to each enabled sink.
 
-    def write(self, to_write: str) -> None:
-        """Write string to the file."""
+    Every playlist is appended to the same file, one line at a time. The
+    lock only keeps the threads of one process from interleaving their
+    lines. Worker processes each append on their own, so a long line can
+    be interleaved with a line from another worker."""
+    with _ndjson_lock:
+        logger.print(line)
         if FileOutput.write_to_file:
-            with open(
-                self.path.joinpath(f"{self.file_name}.txt"),
-                "a",
-                encoding="utf-8",
+            with timer("write"), open(
+                FileOutput.path.joinpath(NDJSON_FILE), "a", encoding="utf-8"
             ) as f:
-                f.writelines(to_write)
-                f.close()
-        return
+                f.write(f"{line}\n")
@@ -0,0 +1,119 @@
+"""Pooled HTTP client used for all requests to Spotify."""
+
+from time import sleep
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+
+from analyse_spotify_playlist.config import (
+    HTTP_POOL_BLOCK,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+)
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import increment
+from analyse_spotify_playlist.request_scheduler import RequestScheduler, get_scheduler
+from analyse_spotify_playlist.response_archive import get_archive
+
+logger = Log()
+
+
+class HttpClient:
+    """Keep-alive HTTP client, sharing one connection pool between requests."""
+
+    def __init__(
+        self,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        pool_block: bool = HTTP_POOL_BLOCK,
+        scheduler: RequestScheduler | None = None,
+    ) -> None:
+        """Set up the session and mount the pooled adapter."""
+        self.session = Session()
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.scheduler = scheduler
+        self.requests_sent = 0
+
+    def get(self, url: str, **kwargs) -> Response:
+        """Send a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data=None, **kwargs) -> Response:
+        """Send a POST request."""
+        return self.request("POST", url, data=data, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        """Send a request through the pool and log how long it took.
+
+        Requests wait for a slot from the scheduler, and throttled or failed
+        requests are retried for as long as the scheduler allows. When
+        replaying an archive, the recorded response is returned instead, and
+        when recording, the final response is added to the archive."""
+        archive = get_archive()
+        if archive is not None and archive.replaying:
+            logger.print(f"{method} {url} replayed from {archive.path}")
+            return archive.replay(method, url, kwargs.get("params"))
+        scheduler = self.scheduler or get_scheduler()
+        attempt = 0
+        while True:
+            wait = scheduler.reserve()
+            if wait > 0:
+                sleep(wait)
+            res = self.session.request(method, url, **kwargs)
+            self.requests_sent += 1
+            increment("requests_sent")
+            logger.print(
+                f"{method} {url} took {res.elapsed.total_seconds()}s "
+                f"(requests sent: {self.requests_sent}, connections opened: {self.connections_opened()})"
+            )
+            delay = scheduler.retry_delay(res.status_code, res.headers, attempt)
+            if delay is None:
+                if archive is not None:
+                    archive.record(
+                        method,
+                        url,
+                        kwargs.get("params"),
+                        res.status_code,
+                        res.headers,
+                        res.text,
+                    )
+                return res
+            attempt += 1
+            increment("requests_retried")
+            sleep(delay)
+
+    def connections_opened(self) -> int:
+        """Return the number of connections the pool has had to open.
+
+        Any request above this number reused a kept-alive connection."""
+        pools = self.adapter.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_client: HttpClient | None = None
+
+
+def get_client() -> HttpClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+
+def set_client(client: HttpClient | None) -> None:
+    """Replace the shared client. Pass None to recreate it on next use."""
+    global _client
+    if _client is not None and _client is not client:
+        _client.close()
+    _client = client
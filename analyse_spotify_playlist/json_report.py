@@ -0,0 +1,121 @@
+"""Machine readable output of the playlist analysis, as JSON or NDJSON."""
+
+from __future__ import annotations
+
+import json
+from math import isinf
+from typing import TYPE_CHECKING, Iterator
+
+from analyse_spotify_playlist.feature_columns import COLUMN_KEYS
+from analyse_spotify_playlist.file_output import (
+    FileOutput,
+    ReportWriter,
+    append_ndjson_line,
+)
+from analyse_spotify_playlist.utils import performance_timer
+
+if TYPE_CHECKING:
+    from analyse_spotify_playlist.playlist import Playlist
+    from analyse_spotify_playlist.track import Track
+
+
+def track_details(track: Track | None) -> dict | None:
+    """Return the details identifying a track."""
+    if track is None:
+        return None
+    return {
+        "id": track._id,
+        "name": track._name,
+        "artist": track.get_artist_name(),
+        "release_date": track.get_release_date(),
+        "popularity": track._popularity,
+    }
+
+
+def most_common(breakdown_entry: tuple) -> dict:
+    """Return the most common value of a breakdown, and how many tracks have it."""
+    value, count = breakdown_entry
+    return {"value": value, "count": count}
+
+
+def feature_analysis(playlist: Playlist) -> dict:
+    """Return the minimum, maximum and average value for each audio feature.
+
+    The minimum and maximum are None for a feature no track has a value for."""
+    min_max_list = playlist.min_max_analysis
+    average_list = playlist.average_analysis
+    features = {}
+    for key in COLUMN_KEYS:
+        extremes = {}
+        for name, (track_id, value) in zip(["min", "max"], min_max_list[key]):
+            if track_id is None or isinf(value):
+                extremes[name] = None
+            else:
+                extremes[name] = {"id": track_id, "value": value}
+        features[key] = {**extremes, "average": average_list[key]}
+    return features
+
+
+@performance_timer("render")
+def playlist_analysis(playlist: Playlist) -> dict:
+    """Return the analysis of the playlist as plain data.
+
+    Call once the playlist has been analysed. Unlike the text report, every
+    section is included whatever the analytical depth."""
+    return {
+        "id": playlist.id,
+        "name": playlist.name,
+        "description": playlist.description,
+        "owner": playlist.owner,
+        "followers": playlist.followers,
+        "collaborative": playlist.collaborative == "Yes",
+        "public": playlist.public,
+        "total_tracks": playlist.total_tracks,
+        "playable_tracks": len(playlist.tracks),
+        "explicit_tracks": playlist.total_explicit_tracks(),
+        "oldest_track": track_details(playlist.oldest_track),
+        "newest_track": track_details(playlist.newest_track),
+        "most_common": {
+            "decade": most_common(playlist.get_most_common_decade()),
+            "album_type": most_common(playlist.get_most_common_album_type()),
+            "key": most_common(playlist.get_most_common_key()),
+            "mode": most_common(playlist.get_most_common_mode()),
+            "time_signature": most_common(playlist.get_most_common_time_signature()),
+        },
+        "breakdowns": {
+            "album_type": playlist.get_album_type_breakdown(),
+            "decade": playlist.get_track_decade_release_breakdown(),
+            "key": playlist.get_key_breakdown(),
+            "mode": playlist.get_mode_breakdown(),
+            "time_signature": playlist.get_time_signature_breakdown(),
+        },
+        "most_popular": list(map(track_details, playlist.get_most_popular_list())),
+        "least_popular": list(map(track_details, playlist.get_least_popular_list())),
+        "instrumental_tracks": [
+            {**track_details(track), "instrumentalness": track._instrumentalness}
+            for track in playlist.get_instrumental_tracks()
+        ],
+        "spoken_word_tracks": [
+            {**track_details(track), "speechiness": track._speechiness}
+            for track in playlist.get_spoken_word_tracks()
+        ],
+        "audio_features": feature_analysis(playlist),
+    }
+
+
+def encode_analysis(playlist: Playlist, indent: int | None = None) -> Iterator[str]:
+    """Yield the analysis of the playlist as JSON, a chunk at a time."""
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+    return encoder.iterencode(playlist_analysis(playlist))
+
+
+def output_json(playlist: Playlist, file_handler: FileOutput) -> None:
+    """Output the analysis of the playlist in the JSON or NDJSON format.
+
+    JSON is streamed to a file per playlist. NDJSON is appended to one file
+    shared by every playlist, one line each."""
+    if FileOutput.output_format == "ndjson":
+        append_ndjson_line("".join(encode_analysis(playlist)))
+        return
+    with ReportWriter(file_handler, "json") as report:
+        report.write_chunks(encode_analysis(playlist, indent=2))
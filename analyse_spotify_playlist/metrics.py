@@ -0,0 +1,210 @@
+"""Timers and counters collected for each stage of a run."""
+
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from math import ceil
+from typing import ContextManager, Iterator
+
+from analyse_spotify_playlist.config import (
+    METRICS_BUCKETS,
+    METRICS_FORMATS,
+    METRICS_MAX_SAMPLES,
+)
+
+# Prefix of every metric name in the Prometheus text format.
+PROMETHEUS_PREFIX = "analyse_spotify_playlist"
+PERCENTILES = [50, 95, 99]
+
+
+class Histogram:
+    """Latency of every call to one stage.
+
+    The count and total cover every call. The percentiles are worked out
+    from the latest max_samples timings."""
+
+    def __init__(self, buckets: list[float], max_samples: int) -> None:
+        """Set up class."""
+        self.buckets = buckets
+        # Calls in each bucket, not including the buckets below it.
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, seconds: float) -> None:
+        """Add the timing of one call."""
+        self.count += 1
+        self.total += seconds
+        index = bisect_left(self.buckets, seconds)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Return the timing percent of the calls took at most, by nearest rank."""
+        if len(self.samples) == 0:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[max(ceil(percent / 100 * len(ordered)) - 1, 0)]
+
+    def summary(self) -> dict:
+        """Return the count, total and percentiles, in seconds."""
+        summary = {"count": self.count, "total": self.total}
+        for percent in PERCENTILES:
+            summary[f"p{percent}"] = self.percentile(percent)
+        return summary
+
+
+class MetricsRegistry:
+    """Named timers and counters, shared by every thread of a run."""
+
+    def __init__(
+        self,
+        buckets: list[float] = METRICS_BUCKETS,
+        max_samples: int = METRICS_MAX_SAMPLES,
+    ) -> None:
+        """Set up class."""
+        self.buckets = sorted(buckets)
+        self.max_samples = max_samples
+        self._timers: dict[str, Histogram] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Add the timing of one call to the named timer."""
+        with self._lock:
+            if name not in self._timers:
+                self._timers[name] = Histogram(self.buckets, self.max_samples)
+            self._timers[name].observe(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Add amount to the named counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Time the block under the named timer, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        """Return the summary of every timer, and the value of every counter."""
+        with self._lock:
+            return {
+                "timers": {
+                    name: self._timers[name].summary() for name in sorted(self._timers)
+                },
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def to_json(self) -> str:
+        """Return the summary as JSON, with the timings in seconds."""
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Return every timer and counter in the Prometheus text format.
+
+        Each timer is a stage of one histogram, in seconds."""
+        name = f"{PROMETHEUS_PREFIX}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time taken by each stage of the analysis.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage in sorted(self._timers):
+                timer = self._timers[stage]
+                cumulative = 0
+                for bound, count in zip(timer.buckets, timer.bucket_counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'{name}_bucket{{stage="{stage}",le="+Inf"}} {timer.count}'
+                )
+                lines.append(f'{name}_sum{{stage="{stage}"}} {timer.total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {timer.count}')
+            for counter in sorted(self._counters):
+                counter_name = f"{PROMETHEUS_PREFIX}_{counter}_total"
+                lines.append(f"# TYPE {counter_name} counter")
+                lines.append(f"{counter_name} {self._counters[counter]}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self) -> str:
+        """Return the summary as a table, with the percentiles in milliseconds."""
+        summary = self.summary()
+        lines = [
+            f"{'Stage':<20} {'Count':>7} {'Total (s)':>10} "
+            + " ".join(f"{f'p{x} (ms)':>9}" for x in PERCENTILES)
+        ]
+        for name, timer in summary["timers"].items():
+            lines.append(
+                f"{name:<20} {timer['count']:>7} {timer['total']:>10.3f} "
+                + " ".join(f"{timer[f'p{x}'] * 1000:>9.1f}" for x in PERCENTILES)
+            )
+        if len(summary["counters"]) > 0:
+            lines.append(f"\n{'Counter':<20} {'Value':>7}")
+            for name, value in summary["counters"].items():
+                lines.append(f"{name:<20} {value:>7}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, metrics_format: str) -> str:
+        """Return the metrics in one of METRICS_FORMATS."""
+        if metrics_format not in METRICS_FORMATS:
+            raise ValueError(f"Unknown metrics format: {metrics_format}")
+        if metrics_format == "json":
+            return self.to_json()
+        if metrics_format == "prometheus":
+            return self.to_prometheus()
+        return self.format_summary()
+
+
+_metrics: MetricsRegistry | None = None
+# Returned by timer while metrics are disabled. It holds no state, so one is
+# shared by every block.
+_disabled_timer = nullcontext()
+
+
+def get_metrics() -> MetricsRegistry | None:
+    """Return the shared registry, or None if metrics are disabled."""
+    return _metrics
+
+
+def set_metrics(metrics: MetricsRegistry | None) -> None:
+    """Replace the shared registry. Pass None to disable metrics."""
+    global _metrics
+    _metrics = metrics
+
+
+def timer(name: str) -> ContextManager:
+    """Time the block under the named timer, if metrics are enabled."""
+    if _metrics is None:
+        return _disabled_timer
+    return _metrics.time(name)
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Add amount to the named counter, if metrics are enabled."""
+    if _metrics is not None:
+        _metrics.increment(name, amount)
+
+
+def write_metrics(metrics_format: str, path: str | None = None) -> None:
+    """Output the shared metrics to the file at path, or to stderr."""
+    if _metrics is None:
+        return
+    output = _metrics.export(metrics_format)
+    if path is None:
+        sys.stderr.write(output)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(output)
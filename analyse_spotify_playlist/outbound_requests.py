@@ -1,17 +1,27 @@
 """All the Outbound HTTPS requests to Spotify."""
 
-from requests import get, post
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+from urllib.parse import parse_qs, urlparse
 
 from analyse_spotify_playlist.config import (
+    AUDIO_FEATURES_BATCH_SIZE,
     CLIENT_ID,
     CLIENT_SECRET,
+    MAX_WORKERS,
+    PAGE_SIZE,
+    PLAYLIST_FIELDS,
+    PLAYLIST_METADATA_FIELDS,
     SPOTIFY_ACCOUNTS_URL,
     SPOTIFY_API_URL,
+    TRACK_FIELDS_BY_DEPTH,
 )
+from analyse_spotify_playlist.http_client import get_client
 from analyse_spotify_playlist.playlist import Playlist
-from analyse_spotify_playlist.utils import performance_timer
+from analyse_spotify_playlist.utils import performance_timer, split_into_batches
 
 
+@performance_timer("token")
 def request_access_token() -> dict:
     """Request access token from Spotify."""
     body = {
@@ -21,7 +31,7 @@ def request_access_token() -> dict:
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    res = post(SPOTIFY_ACCOUNTS_URL, body, headers=headers)
+    res = get_client().post(SPOTIFY_ACCOUNTS_URL, body, headers=headers)
     res.raise_for_status()
 
     return res.json()
@@ -32,29 +42,73 @@ def set_auth_header(token: str) -> dict:
     return {"Authorization": f"Bearer {token}"}
 
 
-def pull_playlist_data(token: str, playlist_id: str) -> dict:
+def get_track_page_fields(depth: int) -> str:
+    """Return the fields filter for a page of tracks, at the analytical depth."""
+    track_fields = ",".join(
+        field
+        for field, min_depth in TRACK_FIELDS_BY_DEPTH.items()
+        if min_depth <= depth
+    )
+    return f"next,total,items(track({track_fields}))"
+
+
+def get_playlist_fields(depth: int) -> str:
+    """Return the fields filter for a playlist, at the analytical depth."""
+    return f"{PLAYLIST_FIELDS},tracks({get_track_page_fields(depth)})"
+
+
+@performance_timer("first_page")
+def pull_playlist_data(token: str, playlist_id: str, fields: str | None = None) -> dict:
     """Request Playlist data from Spotify
 
     Args:
         token (str): Authorisation token for the request
         playlist_id (str): Id for the playlist.
+        fields (str): Optional filter, to only return the fields needed.
 
     Returns:
         raw playlist data (dict)
     """
     url = f"{SPOTIFY_API_URL}playlists/{playlist_id}"
-    res = get(url, headers=set_auth_header(token))
+    params = {}
+    if fields:
+        params["fields"] = fields
+    res = get_client().get(url, params=params, headers=set_auth_header(token))
     res.raise_for_status()
 
     return res.json()
 
 
+@performance_timer("playlist_metadata")
+def pull_playlist_metadata(
+    token: str, playlist_id: str, etag: str | None = None
+) -> tuple[dict | None, str | None]:
+    """Request only the Playlist metadata, used to check if it has changed.
+
+    If an etag is provided the request is conditional, and None is returned
+    in place of the metadata when the playlist has not changed.
+
+    Returns:
+        metadata (dict | None), etag (str | None)
+    """
+    url = f"{SPOTIFY_API_URL}playlists/{playlist_id}"
+    params = {"fields": PLAYLIST_METADATA_FIELDS}
+    headers = set_auth_header(token)
+    if etag:
+        headers["If-None-Match"] = etag
+    res = get_client().get(url, params=params, headers=headers)
+    res.raise_for_status()
+
+    if res.status_code == 304:
+        return None, etag
+    return res.json(), res.headers.get("ETag")
+
+
 def pull_next_set_of_tracks(token: str, playlist: Playlist) -> None:
     """Use the 'next' Url to fetch the next set of Tracks for the playlist."""
     url = playlist.next_url
-    res = get(url, headers=set_auth_header(token))
+    res = get_client().get(url, headers=set_auth_header(token))
     res.raise_for_status()
-    # print(f"Response took - {res.elapsed.total_seconds()}s")
 
     tracks = res.json()
     playlist.add_tracks(tracks)
@@ -62,7 +116,70 @@ def pull_next_set_of_tracks(token: str, playlist: Playlist) -> None:
         pull_next_set_of_tracks(token, playlist)
 
 
-# @performance_timer
+@performance_timer("page")
+def pull_track_page(
+    token: str,
+    playlist_id: str,
+    offset: int,
+    limit: int = PAGE_SIZE,
+    fields: str | None = None,
+) -> dict:
+    """Request a single page of tracks for the playlist, starting at offset."""
+    url = f"{SPOTIFY_API_URL}playlists/{playlist_id}/tracks"
+    params = {"offset": offset, "limit": limit}
+    if fields:
+        params["fields"] = fields
+    res = get_client().get(url, params=params, headers=set_auth_header(token))
+    res.raise_for_status()
+
+    return res.json()
+
+
+def get_remaining_page_offsets(playlist: Playlist) -> tuple[list[int], int]:
+    """Work out the offsets of every page after the first.
+
+    The offset and limit of the next page are read from the 'next' Url, then
+    stepped through until the total number of tracks is reached."""
+    if not playlist.next_url:
+        return [], PAGE_SIZE
+    query = parse_qs(urlparse(playlist.next_url).query)
+    offset = int(query.get("offset", [PAGE_SIZE])[0])
+    limit = int(query.get("limit", [PAGE_SIZE])[0])
+    return list(range(offset, playlist.total_tracks, limit)), limit
+
+
+def pull_remaining_tracks_parallel(
+    token: str,
+    playlist: Playlist,
+    max_workers: int = MAX_WORKERS,
+    fields: str | None = None,
+    keep_pages: bool = True,
+    on_tracks: Callable[[Playlist, list[str]], None] | None = None,
+) -> list[dict]:
+    """Fetch every remaining page of tracks concurrently.
+
+    Pages are requested by offset on a bounded pool of workers, and added to
+    the playlist in playlist order. The pages are returned in the same order,
+    unless keep_pages is False, in which case each page is released once added.
+    on_tracks is called with the ids of the tracks added from each page."""
+    offsets, limit = get_remaining_page_offsets(playlist)
+    if len(offsets) == 0:
+        return []
+
+    def pull_page(offset: int) -> dict:
+        return pull_track_page(token, playlist.id, offset, limit, fields)
+
+    pages = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for page in executor.map(pull_page, offsets):
+            added = playlist.add_tracks(page)
+            if on_tracks is not None:
+                on_tracks(playlist, added)
+            if keep_pages:
+                pages.append(page)
+    return pages
+
+
 def pull_tracks_audio_features_r(token: str, track_ids: list[str]) -> list:
     """Recursively Split id list down to size and make the request."""
     if len(track_ids) <= 100:
@@ -76,6 +193,40 @@ def pull_tracks_audio_features_r(token: str, track_ids: list[str]) -> list:
     return features
 
 
+def pull_tracks_audio_features(
+    token: str, track_ids: list[str], max_workers: int = MAX_WORKERS
+) -> list:
+    """Request the audio features for all track ids.
+
+    The ids are split into batches once, and the batches are requested
+    concurrently on a bounded pool of workers. Results are returned in the
+    same order as track_ids."""
+    features = []
+    for batch_features in iter_tracks_audio_features(token, track_ids, max_workers):
+        features.extend(batch_features)
+    return features
+
+
+def iter_tracks_audio_features(
+    token: str, track_ids: list[str], max_workers: int = MAX_WORKERS
+) -> Iterator[list]:
+    """Yield the audio features for the track ids, one batch at a time.
+
+    The batches are requested concurrently on a bounded pool of workers, and
+    yielded in the same order as track_ids as soon as each one is ready."""
+    batches = split_into_batches(track_ids, AUDIO_FEATURES_BATCH_SIZE)
+    if len(batches) <= 1:
+        yield audio_feature_request(token, track_ids)
+        return
+
+    def request_batch(batch: list[str]) -> list:
+        return audio_feature_request(token, batch)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(request_batch, batches)
+
+
+@performance_timer("feature_batch")
 def audio_feature_request(token: str, track_ids: list[str]) -> list:
     """Request the audio features of the provided track_ids."""
     if len(track_ids) > 100:
@@ -86,7 +237,7 @@ def audio_feature_request(token: str, track_ids: list[str]) -> list:
 
     url = f"{SPOTIFY_API_URL}audio-features"
     params = {"ids": id_string}
-    res = get(url, params=params, headers=set_auth_header(token))
+    res = get_client().get(url, params=params, headers=set_auth_header(token))
     res.raise_for_status()
 
     return res.json()["audio_features"]
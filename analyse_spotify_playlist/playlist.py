@@ -1,11 +1,13 @@
 """Class definition for the Playlist data."""
 
-from copy import deepcopy
+import heapq
+from types import MappingProxyType
 
-from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.playlist_stats import PlaylistStats
+from analyse_spotify_playlist.running_stats import RunningStats
+from analyse_spotify_playlist.track import RecordTable, Track
+from analyse_spotify_playlist.track_registry import TrackRegistry
 from analyse_spotify_playlist.utils import (
-    find_average_audio_features,
-    find_min_max_audio_features,
     get_most_common_from_breakdown,
     performance_timer,
 )
@@ -24,9 +26,18 @@ class Playlist:
         id: str,
         public: bool,
         tracks: dict,
+        snapshot_id: str | None = None,
+        incremental: bool = False,
+        registry: TrackRegistry | None = None,
     ) -> None:
-        """Playlist Constructor."""
+        """Playlist Constructor.
+
+        If incremental, the statistics are updated as tracks and audio
+        features are added, rather than gathered once they are all present.
+        If a registry is given, tracks are shared with the other playlists
+        in the run."""
         self.id = id
+        self.snapshot_id = snapshot_id
         self.name = name
         self.owner = "Unknown"
         self.collaborative = "No"
@@ -35,7 +46,14 @@ class Playlist:
         self.public = public
         self.total_tracks = tracks.get("total", 0)
         self._tracks: dict[str, Track] = {}
+        self.registry = registry
+        # Shares album and artist records between the tracks, when they are
+        # not shared through the registry.
+        self.records = RecordTable() if registry is None else None
         self.next_url = None
+        self.stats: PlaylistStats | RunningStats | None = None
+        self.running_stats: RunningStats | None = None
+        self.feature_columns = None
         self.min_max_analysis = None
         self.average_analysis = None
         self.oldest_track = None
@@ -48,6 +66,9 @@ class Playlist:
         self.instrumental_tracks = None
         self.spoken_word_tracks = None
 
+        if incremental:
+            self.running_stats = RunningStats()
+
         if owner.get("display_name"):
             self.owner = owner.get("display_name")
 
@@ -57,6 +78,11 @@ class Playlist:
         if tracks.get("items", None):
             self.add_tracks(tracks)
 
+    @property
+    def tracks(self) -> MappingProxyType:
+        """Read-only view of the tracks, keyed by track id."""
+        return MappingProxyType(self._tracks)
+
     def get_track(self, track_id: str) -> Track | None:
         """Return track id if it exists."""
         if not isinstance(track_id, str) or track_id == "":
@@ -70,136 +96,145 @@ class Playlist:
             id_list = list(self._tracks.keys())
         return id_list
 
-    def add_tracks(self, tracks: dict) -> None:
-        """Populate the tracks list."""
+    def add_tracks(self, tracks: dict) -> list[str]:
+        """Populate the tracks list, returning the ids of the tracks added.
+
+        A track already in the playlist is kept as it is, along with any
+        audio features it has been populated with."""
+        added = []
         for track in tracks.get("items", []):
             if track["track"]["name"] in (None, ""):
                 continue
-            self._tracks[track["track"]["id"]] = Track(**track["track"])
+            if track["track"]["id"] in self._tracks:
+                continue
+            if self.registry is not None:
+                new_track = self.registry.get_or_create(track["track"])
+            else:
+                new_track = Track(**track["track"], records=self.records)
+            self._tracks[track["track"]["id"]] = new_track
+            added.append(new_track)
         self.next_url = tracks.get("next", None)
+        self.stats = None
+        if self.running_stats is not None:
+            self.running_stats.add_tracks(added)
+        return [track._id for track in added]
+
+    def add_audio_features(self, cleaned_feature_list: list[tuple]) -> None:
+        """Populate the tracks with their cleaned audio features."""
+        for id, track_feature in cleaned_feature_list:
+            if id is None:
+                continue
+            track = self.get_track(id)
+            track.populate_audio_features(**track_feature)
+            if self.running_stats is not None:
+                self.running_stats.add_features(track)
+        self.stats = None
+
+    def add_shared_features(self, track_ids: list[str]) -> None:
+        """Count the audio features of tracks populated by another playlist.
+
+        The tracks are shared through the registry, so they already hold
+        their features. Only the running statistics need updating."""
+        self.stats = None
+        if self.running_stats is None:
+            return
+        for track_id in track_ids:
+            self.running_stats.add_features(self._tracks[track_id])
 
     def analyse_tracks_audio_feature(self) -> None:
-        """Find the min, max, and average for audio features."""
-        self.min_max_analysis = find_min_max_audio_features(self._tracks)
-        self.average_analysis = find_average_audio_features(self._tracks)
+        """Gather the statistics for the playlist, in a single pass over the tracks.
+
+        Call once the tracks and their audio features are populated. The
+        results are kept until more tracks or audio features are added. In
+        incremental mode the statistics are already up to date, so nothing is
+        gathered."""
+        if self.running_stats is not None:
+            self.stats = self.running_stats
+        else:
+            self.stats = PlaylistStats(self._tracks)
+            self.feature_columns = self.stats.feature_columns
+        self.min_max_analysis = self.stats.min_max_analysis
+        self.average_analysis = self.stats.average_analysis
+        self.album_type_breakdown = self.stats.album_type_breakdown
+        self.decade_release_breakdown = self.stats.decade_release_breakdown
+        self.key_breakdown = self.stats.key_breakdown
+        self.mode_breakdown = self.stats.mode_breakdown
+        self.time_signature_breakdown = self.stats.time_signature_breakdown
+        self.instrumental_tracks = self.stats.instrumental_tracks
+        self.spoken_word_tracks = self.stats.spoken_word_tracks
+
+    def get_stats(self) -> PlaylistStats:
+        """Return the playlist statistics, gathering them if needed."""
+        if self.stats is None:
+            self.analyse_tracks_audio_feature()
+        return self.stats
 
     def total_explicit_tracks(self) -> int:
         """Return the total number of explicit tracks in playlist."""
-        explicit = 0
-        for _id, track in self._tracks.items():
-            if track._explicit:
-                explicit += 1
-        return explicit
+        return self.get_stats().total_explicit
 
     def get_album_type_breakdown(self) -> dict:
         """Breakdown album type for each track.
 
         i.e Single, Compilation, Album
         """
-        if self.album_type_breakdown is None:
-            self.album_type_breakdown = {"album": 0, "single": 0, "compilation": 0}
-            for _id, track in self._tracks.items():
-                self.album_type_breakdown[track.get_album_type()] += 1
-        return self.album_type_breakdown
+        return self.get_stats().album_type_breakdown
 
     def oldest_and_newest(self) -> None:
-        """Return the oldest track (by release date) in the playlist."""
-
-        def sort_by_date(track_tuple: tuple[str, Track]):
-            return track_tuple[1].get_release_date()
-
-        sorted_tracks = sorted(deepcopy(self._tracks).items(), key=sort_by_date)
-        self.oldest_track = sorted_tracks[0][1]
-        self.newest_track = sorted_tracks[-1][1]
+        """Find the oldest and newest tracks (by release date) in the playlist.
+
+        Of tracks released on the same date, the oldest is the first in the
+        playlist and the newest is the last."""
+        if self.running_stats is not None:
+            self.oldest_track = self.running_stats.oldest_track
+            self.newest_track = self.running_stats.newest_track
+            return
+        oldest = newest = None
+        oldest_date = newest_date = None
+        for track in self._tracks.values():
+            release_date = track.get_release_date()
+            if oldest is None or release_date < oldest_date:
+                oldest, oldest_date = track, release_date
+            if newest is None or release_date >= newest_date:
+                newest, newest_date = track, release_date
+        self.oldest_track = oldest
+        self.newest_track = newest
 
     def get_track_decade_release_breakdown(self) -> dict:
         """Breakdown decade release for tracks."""
-        if self.decade_release_breakdown is None:
-            self.decade_release_breakdown = {}
-            track_list = deepcopy(self._tracks).items()
-            for track_id, track in track_list:
-                year_released = track.get_release_date()[0:4]
-                decade = f"{year_released[0:3]}0"
-                if not decade in self.decade_release_breakdown:
-                    self.decade_release_breakdown[decade] = 1
-                else:
-                    self.decade_release_breakdown[decade] += 1
-        return dict(sorted(self.decade_release_breakdown.items()))
+        return dict(sorted(self.get_stats().decade_release_breakdown.items()))
 
     def get_key_breakdown(self) -> dict:
         """Breakdown of the track Keys."""
-        if self.key_breakdown is None:
-            self.key_breakdown = {
-                "C": 0,
-                "C♯/D♭": 0,
-                "D": 0,
-                "D♯/E♭": 0,
-                "E/F♭": 0,
-                "E♯/F": 0,
-                "F♯/G♭": 0,
-                "G": 0,
-                "G♯/A♭": 0,
-                "A": 0,
-                "A♯/B♭": 0,
-                "B": 0,
-            }
-
-            for _id, track in self._tracks.items():
-                if track._key:
-                    self.key_breakdown[track._key] += 1
-        return self.key_breakdown
+        return self.get_stats().key_breakdown
 
     def get_mode_breakdown(self) -> dict:
         """Breakdown of the track mode."""
-        if self.mode_breakdown is None:
-            self.mode_breakdown = {"Minor": 0, "Major": 0}
-            for _id, track in self._tracks.items():
-                if track._mode:
-                    self.mode_breakdown[track._mode] += 1
-        return self.mode_breakdown
+        return self.get_stats().mode_breakdown
 
     def get_time_signature_breakdown(self) -> dict:
         """Breakdown of the track Time Signature."""
-        if self.time_signature_breakdown is None:
-            self.time_signature_breakdown = {}
-            for track_id, track in self._tracks.items():
-                if track._time_signature is None:
-                    continue
-                if not track._time_signature in self.time_signature_breakdown:
-                    self.time_signature_breakdown[track._time_signature] = 1
-                else:
-                    self.time_signature_breakdown[track._time_signature] += 1
-        return self.time_signature_breakdown
+        return self.get_stats().time_signature_breakdown
 
     def get_most_common_decade(self) -> tuple[str, int]:
         """Return the most common decade for tracks in playlist."""
-        if self.decade_release_breakdown is None:
-            self.get_track_decade_release_breakdown()
-        return get_most_common_from_breakdown(self.decade_release_breakdown)
+        return get_most_common_from_breakdown(self.get_stats().decade_release_breakdown)
 
     def get_most_common_album_type(self) -> tuple[str, int]:
         """Return the most common album type."""
-        if self.album_type_breakdown is None:
-            self.get_album_type_breakdown()
-        return get_most_common_from_breakdown(self.album_type_breakdown)
+        return get_most_common_from_breakdown(self.get_stats().album_type_breakdown)
 
     def get_most_common_key(self) -> tuple[str, int]:
         """Return the most common key in the playlist."""
-        if self.key_breakdown is None:
-            self.get_key_breakdown()
-        return get_most_common_from_breakdown(self.key_breakdown)
+        return get_most_common_from_breakdown(self.get_stats().key_breakdown)
 
     def get_most_common_mode(self) -> tuple[str, int]:
         """Return the most common mode in the playlist."""
-        if self.mode_breakdown is None:
-            self.get_mode_breakdown()
-        return get_most_common_from_breakdown(self.mode_breakdown)
+        return get_most_common_from_breakdown(self.get_stats().mode_breakdown)
 
     def get_most_common_time_signature(self) -> tuple[str, int]:
         """Return the most common time signature in the playlist."""
-        if self.time_signature_breakdown is None:
-            self.get_time_signature_breakdown()
-        return get_most_common_from_breakdown(self.time_signature_breakdown)
+        return get_most_common_from_breakdown(self.get_stats().time_signature_breakdown)
 
     def get_playlist_visibility(self) -> str:
         """Return string Public / Private based on playlist."""
@@ -208,69 +243,33 @@ class Playlist:
         return "Private"
 
     @staticmethod
-    def __sort_by_popularity(track_tuple: tuple[str, Track]):
-        return track_tuple[1]._popularity
+    def __sort_by_popularity(track: Track):
+        return track._popularity
 
-    def get_most_popular_list(self) -> list:
+    def get_most_popular_list(self, list_size: int = 10) -> list:
         """Return most popular tracks in the playlist."""
-        list_size = 10
-        if len(self._tracks) < list_size:
-            list_size = len(self._tracks)
-        tracks_copy = deepcopy(self._tracks).items()
-
-        sorted_list = sorted(tracks_copy, key=self.__sort_by_popularity, reverse=True)
-        to_return = []
-        for i in range(list_size):
-            to_return.append(sorted_list[i][1])
+        return heapq.nlargest(
+            list_size, self._tracks.values(), key=self.__sort_by_popularity
+        )
 
-        return to_return
-
-    def get_least_popular_list(self) -> list:
+    def get_least_popular_list(self, list_size: int = 10) -> list:
         """Return least popular tracks in the playlist."""
-        list_size = 10
-        if len(self._tracks) < list_size:
-            list_size = len(self._tracks)
-        tracks_copy = deepcopy(self._tracks).items()
-
-        sorted_list = sorted(tracks_copy, key=self.__sort_by_popularity, reverse=False)
-        to_return = []
-        for i in range(list_size):
-            to_return.append(sorted_list[i][1])
-
-        return to_return
+        return heapq.nsmallest(
+            list_size, self._tracks.values(), key=self.__sort_by_popularity
+        )
 
     def get_instrumental_tracks(self) -> list:
-        """Populate list with instrumental tracks."""
-        # Spotify considers a track instrumental if the score is over 0.5
-        if self.instrumental_tracks is None:
-            self.instrumental_tracks = []
-            for _track_id, track in self._tracks.items():
-                if track._instrumentalness is None:
-                    continue
-                if track._instrumentalness >= 0.5:
-                    self.instrumental_tracks.append(track)
-        return self.instrumental_tracks
+        """Return the instrumental tracks."""
+        return self.get_stats().instrumental_tracks
 
     def total_instrumental_tracks(self) -> int:
         """Return sum of instrumental tracks."""
-        if self.instrumental_tracks is None:
-            self.get_instrumental_tracks()
-        return len(self.instrumental_tracks)
+        return len(self.get_stats().instrumental_tracks)
 
     def get_spoken_word_tracks(self) -> list:
-        """Populate list with spoken word tracks."""
-        # Spotify considers a track spoken word if the score is over 0.66
-        if self.spoken_word_tracks is None:
-            self.spoken_word_tracks = []
-            for _track_id, track in self._tracks.items():
-                if track._speechiness is None:
-                    continue
-                if track._speechiness >= 0.66:
-                    self.spoken_word_tracks.append(track)
-        return self.spoken_word_tracks
+        """Return the spoken word tracks."""
+        return self.get_stats().spoken_word_tracks
 
     def total_spoken_word_tracks(self) -> int:
         """Return sum of spoken_word tracks."""
-        if self.spoken_word_tracks is None:
-            self.get_spoken_word_tracks()
-        return len(self.spoken_word_tracks)
+        return len(self.get_stats().spoken_word_tracks)
@@ -0,0 +1,135 @@
+"""Persistent cache of playlist tracks, keyed by playlist snapshot."""
+
+import gzip
+import json
+import os
+import threading
+from pathlib import PosixPath
+
+from analyse_spotify_playlist.config import PLAYLIST_CACHE_PATH
+from analyse_spotify_playlist.logger import Log
+
+logger = Log()
+
+
+class PlaylistCache:
+    """Cache the raw responses for a playlist, one gzipped file per playlist id.
+
+    A cached entry holds the snapshot_id and ETag the playlist had when it
+    was fetched, so it can be reused for as long as the playlist is unchanged."""
+
+    def __init__(self, path: str = PLAYLIST_CACHE_PATH) -> None:
+        """Set up the cache directory."""
+        self.path = PosixPath(path).expanduser()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __file_path(self, playlist_id: str) -> PosixPath:
+        """Return the cache file for a playlist."""
+        return self.path.joinpath(f"{playlist_id.replace('/', '-')}.json.gz")
+
+    def get(self, playlist_id: str) -> dict | None:
+        """Return the cached entry for the playlist, if there is one."""
+        file_path = self.__file_path(playlist_id)
+        if not file_path.exists():
+            return None
+        try:
+            with gzip.open(file_path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(
+        self,
+        playlist_id: str,
+        snapshot_id: str,
+        etag: str | None,
+        playlist: dict,
+        pages: list[dict],
+        fields: str | None = None,
+    ) -> None:
+        """Store the raw playlist response and its track pages.
+
+        fields is the filter the responses were requested with."""
+        entry = {
+            "snapshot_id": snapshot_id,
+            "etag": etag,
+            "fields": fields,
+            "playlist": playlist,
+            "pages": pages,
+        }
+        file_path = self.__file_path(playlist_id)
+        temp_path = file_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            logger.print(f"Unable to cache playlist {playlist_id}: {e}")
+
+    def update_etag(self, playlist_id: str, entry: dict, etag: str | None) -> None:
+        """Store a new ETag for an entry that is otherwise unchanged."""
+        if etag is None or entry.get("etag") == etag:
+            return
+        self.put(
+            playlist_id,
+            entry["snapshot_id"],
+            etag,
+            entry["playlist"],
+            entry["pages"],
+            entry.get("fields"),
+        )
+
+    def record(self, hit: bool) -> None:
+        """Count a cache hit or miss."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def is_unchanged(
+    entry: dict | None, metadata: dict | None, fields: str | None = None
+) -> bool:
+    """Check if the cached entry is still current.
+
+    metadata is None when a conditional request found the playlist unchanged.
+    An entry requested with a different fields filter is not reused."""
+    if entry is None or entry.get("fields") != fields:
+        return False
+    if metadata is None:
+        return True
+    return metadata.get("snapshot_id") == entry.get("snapshot_id")
+
+
+def playlist_from_cache(entry: dict, metadata: dict | None) -> tuple[dict, list[dict]]:
+    """Return the raw playlist and track pages from the cache.
+
+    The playlist details (followers, description, etc.) can change without
+    a new snapshot, so the latest metadata is used where there is some."""
+    raw_playlist = entry["playlist"]
+    if metadata is not None:
+        for key, value in metadata.items():
+            if key != "tracks":
+                raw_playlist[key] = value
+    return raw_playlist, entry["pages"]
+
+
+_cache: PlaylistCache | None = None
+
+
+def get_playlist_cache() -> PlaylistCache | None:
+    """Return the shared cache, or None if the cache is disabled."""
+    global _cache
+    if _cache is None and PLAYLIST_CACHE_PATH is not None:
+        _cache = PlaylistCache()
+    return _cache
+
+
+def set_playlist_cache(cache: PlaylistCache | None) -> None:
+    """Replace the shared cache. Pass None to reopen it on next use."""
+    global _cache
+    _cache = cache
@@ -0,0 +1,86 @@
+"""Statistics for a playlist, gathered in a single pass over its tracks."""
+
+from __future__ import annotations
+
+from math import nan
+from operator import attrgetter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from analyse_spotify_playlist.feature_columns import COLUMN_KEYS, FeatureColumns
+from analyse_spotify_playlist.utils import KEY_NAMES
+
+if TYPE_CHECKING:
+    from analyse_spotify_playlist.track import Track
+
+# Spotify considers a track instrumental if the score is over 0.5
+INSTRUMENTAL_THRESHOLD = 0.5
+# Spotify considers a track spoken word if the score is over 0.66
+SPOKEN_WORD_THRESHOLD = 0.66
+
+
+class PlaylistStats:
+    """Every counter and breakdown the analysis reports for a playlist.
+
+    All of them, and the audio feature columns, are gathered in one pass
+    over the tracks, once the tracks and their features are populated."""
+
+    def __init__(self, tracks: dict[str, Track]) -> None:
+        """Gather the statistics for the tracks."""
+        self.total_explicit = 0
+        self.album_type_breakdown = {"album": 0, "single": 0, "compilation": 0}
+        self.decade_release_breakdown: dict[str, int] = {}
+        self.key_breakdown = {key: 0 for key in KEY_NAMES}
+        self.mode_breakdown = {"Minor": 0, "Major": 0}
+        self.time_signature_breakdown: dict[int, int] = {}
+        self.instrumental_tracks: list[Track] = []
+        self.spoken_word_tracks: list[Track] = []
+
+        values = {key: [] for key in COLUMN_KEYS}
+        column_getters = [
+            (values[key].append, attrgetter(f"_{key}")) for key in COLUMN_KEYS
+        ]
+
+        album_types = self.album_type_breakdown
+        decades = self.decade_release_breakdown
+        keys = self.key_breakdown
+        modes = self.mode_breakdown
+        time_signatures = self.time_signature_breakdown
+        for track in tracks.values():
+            if track._explicit:
+                self.total_explicit += 1
+
+            album_type = track.get_album_type()
+            album_types[album_type] = album_types.get(album_type, 0) + 1
+            decade = f"{track.get_release_date()[0:3]}0"
+            decades[decade] = decades.get(decade, 0) + 1
+
+            if track._key in keys:
+                keys[track._key] += 1
+            if track._mode:
+                modes[track._mode] += 1
+            if track._time_signature is not None:
+                time_signatures[track._time_signature] = (
+                    time_signatures.get(track._time_signature, 0) + 1
+                )
+            if (
+                track._instrumentalness is not None
+                and track._instrumentalness >= INSTRUMENTAL_THRESHOLD
+            ):
+                self.instrumental_tracks.append(track)
+            if (
+                track._speechiness is not None
+                and track._speechiness >= SPOKEN_WORD_THRESHOLD
+            ):
+                self.spoken_word_tracks.append(track)
+
+            for append, get_value in column_getters:
+                value = get_value(track)
+                append(nan if value is None else value)
+
+        self.feature_columns = FeatureColumns(
+            tracks, {key: np.array(values[key], dtype=float) for key in COLUMN_KEYS}
+        )
+        self.min_max_analysis = self.feature_columns.min_max()
+        self.average_analysis = self.feature_columns.average()
@@ -0,0 +1,124 @@
+"""Schedule outbound requests within Spotify's rate limit."""
+
+import random
+import threading
+from time import monotonic
+
+from analyse_spotify_playlist.config import (
+    DEFAULT_RETRY_AFTER,
+    MAX_RETRIES,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
+from analyse_spotify_playlist.logger import Log
+
+logger = Log()
+
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+class RequestScheduler:
+    """Requests-per-second budget shared by every caller, with retry rules.
+
+    Callers reserve a slot before sending a request, then ask whether the
+    response should be retried. A 429 pauses every caller for the Retry-After
+    period, and a 5xx is retried after a jittered exponential backoff."""
+
+    def __init__(
+        self,
+        requests_per_second: float | None = RATE_LIMIT_PER_SECOND,
+        burst: int = RATE_LIMIT_BURST,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_max: float = RETRY_BACKOFF_MAX,
+    ) -> None:
+        """Set up class."""
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = 0
+        self.throttled = 0
+        self.retried = 0
+        self.time_waited = 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    def reserve(self) -> float:
+        """Reserve a slot for a request. Return the seconds to wait before sending."""
+        with self._lock:
+            now = monotonic()
+            send_at = max(now, self._paused_until)
+            if self.requests_per_second:
+                interval = 1 / self.requests_per_second
+                tolerance = interval * (self.burst - 1)
+                send_at = max(send_at, self._next_slot - tolerance)
+                self._next_slot = max(self._next_slot, send_at) + interval
+            self.requests += 1
+            wait = send_at - now
+            self.time_waited += wait
+            return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+
+    def retry_delay(self, status: int, headers: dict, attempt: int) -> float | None:
+        """Return the seconds to wait before retrying, or None to not retry."""
+        if status != 429 and status not in RETRY_STATUS_CODES:
+            return None
+        if attempt >= self.max_retries:
+            logger.print(f"Giving up after {attempt} retries, status: {status}")
+            return None
+        with self._lock:
+            self.retried += 1
+            if status == 429:
+                self.throttled += 1
+        if status == 429:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            logger.print(f"Rate limited, pausing requests for {retry_after}s")
+            self.pause(retry_after)
+            return 0.0
+        backoff = min(self.backoff_max, self.backoff_base * 2**attempt)
+        delay = random.uniform(backoff / 2, backoff)
+        logger.print(f"Status {status}, retrying in {round(delay, 2)}s")
+        return delay
+
+    def stats(self) -> dict:
+        """Return the counters for requests sent, throttled and retried."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retried": self.retried,
+            "time_waited": round(self.time_waited, 3),
+        }
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Convert a Retry-After header value in seconds to a float."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+_scheduler: RequestScheduler | None = None
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the shared scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = RequestScheduler()
+    return _scheduler
+
+
+def set_scheduler(scheduler: RequestScheduler | None) -> None:
+    """Replace the shared scheduler. Pass None to recreate it on next use."""
+    global _scheduler
+    _scheduler = scheduler
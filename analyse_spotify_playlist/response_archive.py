@@ -0,0 +1,145 @@
+"""Record the responses from Spotify to an archive, and replay them offline."""
+
+import hashlib
+import json
+import threading
+import zipfile
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from analyse_spotify_playlist.config import SPOTIFY_ACCOUNTS_URL
+
+ARCHIVE_MODES = ["record", "replay"]
+# Response headers kept in the archive. Only the ETag is read by the app.
+RECORDED_HEADERS = ["Content-Type", "ETag"]
+# Served in place of the access token when replaying, which is never recorded.
+REPLAY_TOKEN = {"access_token": "replay", "token_type": "Bearer", "expires_in": 3600}
+
+
+def request_key(method: str, url: str, params: dict | None = None) -> str:
+    """Return the key a request is archived under.
+
+    The query parameters are sorted, and the headers and body are left out,
+    so the key does not hold the access token or client secret."""
+    key = f"{method.upper()} {url}"
+    if params:
+        key = f"{key}?{urlencode(sorted(params.items()), doseq=True)}"
+    return key
+
+
+class ResponseArchive:
+    """Zip archive holding one compressed JSON entry per response.
+
+    In record mode each response is added as it is received. A request made
+    more than once is only recorded the first time. In replay mode responses
+    are served from the archive, and no request is sent to Spotify. Requests
+    for an access token are not recorded, and a placeholder is replayed."""
+
+    def __init__(self, path: str, mode: str = "replay") -> None:
+        """Open the archive. Recording replaces any existing archive."""
+        if mode not in ARCHIVE_MODES:
+            raise ValueError(f"Unknown archive mode {mode}")
+        self.path = path
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(
+            path, "w" if mode == "record" else "r", zipfile.ZIP_DEFLATED
+        )
+        self._names = set(self._zip.namelist())
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def __entry_name(key: str) -> str:
+        return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    @staticmethod
+    def is_token_request(url: str) -> bool:
+        return url == SPOTIFY_ACCOUNTS_URL
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        params: dict | None,
+        status: int,
+        headers,
+        content: str,
+    ) -> None:
+        """Add a response to the archive."""
+        if not self.recording or self.is_token_request(url):
+            return
+        key = request_key(method, url, params)
+        name = self.__entry_name(key)
+        entry = {
+            "key": key,
+            "status": status,
+            "headers": {h: headers[h] for h in RECORDED_HEADERS if h in headers},
+            "content": content,
+        }
+        with self._lock:
+            if name in self._names:
+                return
+            self._names.add(name)
+            self._zip.writestr(name, json.dumps(entry))
+
+    def lookup(self, method: str, url: str, params: dict | None = None) -> dict:
+        """Return the recorded status, headers and content of a request.
+
+        Raises:
+            KeyError: if the request was not recorded.
+        """
+        if self.is_token_request(url):
+            return {"status": 200, "headers": {}, "content": json.dumps(REPLAY_TOKEN)}
+        key = request_key(method, url, params)
+        name = self.__entry_name(key)
+        with self._lock:
+            if name not in self._names:
+                self.misses += 1
+                raise KeyError(f"No recorded response for {key}")
+            self.hits += 1
+            return json.loads(self._zip.read(name))
+
+    def replay(self, method: str, url: str, params: dict | None = None) -> Response:
+        """Return the recorded response to a request, as if it had been sent."""
+        entry = self.lookup(method, url, params)
+        res = Response()
+        res.status_code = entry["status"]
+        res.headers = CaseInsensitiveDict(entry["headers"])
+        res._content = entry["content"].encode("utf-8")
+        res.encoding = "utf-8"
+        res.url = url
+        res.elapsed = timedelta(0)
+        return res
+
+    def close(self) -> None:
+        """Close the archive, writing its index when recording."""
+        with self._lock:
+            self._zip.close()
+
+
+_archive: ResponseArchive | None = None
+
+
+def get_archive() -> ResponseArchive | None:
+    """Return the shared archive, or None if not recording or replaying."""
+    return _archive
+
+
+def set_archive(archive: ResponseArchive | None) -> None:
+    """Replace the shared archive, closing the previous one."""
+    global _archive
+    if _archive is not None and _archive is not archive:
+        _archive.close()
+    _archive = archive
@@ -0,0 +1,200 @@
+"""Statistics for a playlist, updated as its tracks and features arrive."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+from analyse_spotify_playlist.feature_columns import COLUMN_KEYS
+from analyse_spotify_playlist.playlist_stats import (
+    INSTRUMENTAL_THRESHOLD,
+    SPOKEN_WORD_THRESHOLD,
+)
+from analyse_spotify_playlist.utils import KEY_NAMES
+
+if TYPE_CHECKING:
+    from analyse_spotify_playlist.track import Track
+
+# Keys read from the track itself, rather than its audio features.
+TRACK_COLUMN_KEYS = ["duration_ms", "popularity"]
+FEATURE_COLUMN_KEYS = [key for key in COLUMN_KEYS if key not in TRACK_COLUMN_KEYS]
+
+
+class RunningFeature:
+    """Running mean, minimum and maximum of one audio feature.
+
+    The mean is updated with Welford's method. Ties for the minimum and
+    maximum go to the track earliest in the playlist, whatever order the
+    values arrive in."""
+
+    __slots__ = ("count", "mean", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        # (value, position in playlist, track id)
+        self.min: tuple | None = None
+        self.max: tuple | None = None
+
+    def add(self, value: float | int, position: int, track_id: str) -> None:
+        """Add the value of a track to the aggregates."""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        if (
+            self.min is None
+            or value < self.min[0]
+            or (value == self.min[0] and position < self.min[1])
+        ):
+            self.min = (value, position, track_id)
+        if (
+            self.max is None
+            or value > self.max[0]
+            or (value == self.max[0] and position < self.max[1])
+        ):
+            self.max = (value, position, track_id)
+
+    def min_max(self) -> list[list[str, float]]:
+        """Return the track id and value of the minimum and maximum."""
+        if self.min is None:
+            return [[None, float("inf")], [None, float("-inf")]]
+        return [[self.min[2], self.min[0]], [self.max[2], self.max[0]]]
+
+    def total(self) -> float:
+        """Return the sum of the values added."""
+        return self.mean * self.count
+
+
+class RunningStats:
+    """Every counter and breakdown the analysis reports for a playlist.
+
+    Unlike PlaylistStats, which is gathered once all tracks and features are
+    populated, the aggregates are updated as each page of tracks and each
+    batch of audio features is added, so the results are ready as soon as
+    the last one arrives. The results match those of PlaylistStats."""
+
+    def __init__(self) -> None:
+        self.total_tracks = 0
+        self.total_explicit = 0
+        self.album_type_breakdown = {"album": 0, "single": 0, "compilation": 0}
+        self.decade_release_breakdown: dict[str, int] = {}
+        self.key_breakdown = {key: 0 for key in KEY_NAMES}
+        self.mode_breakdown = {"Minor": 0, "Major": 0}
+        self.oldest_track: Track | None = None
+        self.newest_track: Track | None = None
+        self.features = {key: RunningFeature() for key in COLUMN_KEYS}
+        self.__positions: dict[str, int] = {}
+        self.__with_features: set[str] = set()
+        # time signature: [first position seen, count]
+        self.__time_signatures: dict[int, list[int]] = {}
+        self.__instrumental: list[tuple[int, Track]] = []
+        self.__spoken_word: list[tuple[int, Track]] = []
+
+    def add_tracks(self, tracks: Iterable[Track]) -> None:
+        """Update the aggregates read from the tracks, in playlist order.
+
+        A track already added is skipped."""
+        album_types = self.album_type_breakdown
+        decades = self.decade_release_breakdown
+        for track in tracks:
+            if track._id in self.__positions:
+                continue
+            position = self.total_tracks
+            self.__positions[track._id] = position
+            self.total_tracks += 1
+
+            if track._explicit:
+                self.total_explicit += 1
+            album_type = track.get_album_type()
+            album_types[album_type] = album_types.get(album_type, 0) + 1
+            release_date = track.get_release_date()
+            decade = f"{release_date[0:3]}0"
+            decades[decade] = decades.get(decade, 0) + 1
+
+            if self.oldest_track is None or (
+                release_date < self.oldest_track.get_release_date()
+            ):
+                self.oldest_track = track
+            if self.newest_track is None or (
+                release_date >= self.newest_track.get_release_date()
+            ):
+                self.newest_track = track
+
+            for key in TRACK_COLUMN_KEYS:
+                value = getattr(track, f"_{key}")
+                if value is not None:
+                    self.features[key].add(value, position, track._id)
+
+    def add_features(self, track: Track) -> None:
+        """Update the aggregates read from the audio features of the track.
+
+        The track must already have been added. The features of a track are
+        only counted once, and may be added in any order."""
+        position = self.__positions.get(track._id)
+        if position is None or track._id in self.__with_features:
+            return
+        self.__with_features.add(track._id)
+
+        if track._key in self.key_breakdown:
+            self.key_breakdown[track._key] += 1
+        if track._mode:
+            self.mode_breakdown[track._mode] += 1
+        if track._time_signature is not None:
+            seen = self.__time_signatures.setdefault(
+                track._time_signature, [position, 0]
+            )
+            seen[0] = min(seen[0], position)
+            seen[1] += 1
+        if (
+            track._instrumentalness is not None
+            and track._instrumentalness >= INSTRUMENTAL_THRESHOLD
+        ):
+            self.__instrumental.append((position, track))
+        if (
+            track._speechiness is not None
+            and track._speechiness >= SPOKEN_WORD_THRESHOLD
+        ):
+            self.__spoken_word.append((position, track))
+
+        for key in FEATURE_COLUMN_KEYS:
+            value = getattr(track, f"_{key}")
+            if value is not None:
+                self.features[key].add(value, position, track._id)
+
+    @property
+    def time_signature_breakdown(self) -> dict[int, int]:
+        """Tracks per time signature, in the order first seen in the playlist."""
+        ordered = sorted(self.__time_signatures.items(), key=lambda item: item[1][0])
+        return {signature: seen[1] for signature, seen in ordered}
+
+    @property
+    def instrumental_tracks(self) -> list[Track]:
+        """Instrumental tracks, in playlist order."""
+        return [track for _, track in sorted(self.__instrumental, key=_position)]
+
+    @property
+    def spoken_word_tracks(self) -> list[Track]:
+        """Spoken word tracks, in playlist order."""
+        return [track for _, track in sorted(self.__spoken_word, key=_position)]
+
+    @property
+    def min_max_analysis(self) -> dict[str, list[list[str, float]]]:
+        """The track with the minimum and maximum value for each key."""
+        return {key: feature.min_max() for key, feature in self.features.items()}
+
+    @property
+    def average_analysis(self) -> dict[str, float]:
+        """The average value for each key.
+
+        As in FeatureColumns.average, the total is divided by the number of
+        tracks, including those without a value."""
+        average = {}
+        for key, feature in self.features.items():
+            if key == "duration_ms":
+                # Durations are whole numbers, so the total is recovered exactly.
+                average[key] = int(round(feature.total())) // self.total_tracks
+            else:
+                average[key] = round(feature.total() / self.total_tracks, 5)
+        return average
+
+
+def _position(item: tuple[int, Track]) -> int:
+    return item[0]
@@ -0,0 +1,316 @@
+"""Serve the playlist analysis over a local HTTP API."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+
+from requests import HTTPError
+
+from analyse_spotify_playlist.analyse import (
+    analyse_populated_playlist,
+    load_playlist,
+    output_analysis,
+)
+from analyse_spotify_playlist.config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_REPORT_CACHE_SIZE,
+    SERVER_REPORT_TTL,
+    SERVER_WORKERS,
+)
+from analyse_spotify_playlist.feature_cache import get_feature_cache
+from analyse_spotify_playlist.json_report import playlist_analysis
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import get_metrics
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.token_provider import get_token_provider
+
+logger = Log()
+
+SERVER_FORMATS = ["text", "json"]
+
+
+class ReportCache:
+    """Rendered reports, keyed by playlist id, depth and format.
+
+    The least recently used report is removed once max_entries are held. A
+    report is only served for ttl seconds after it was rendered, after which
+    the playlist is analysed again."""
+
+    def __init__(
+        self,
+        max_entries: int = SERVER_REPORT_CACHE_SIZE,
+        ttl: float = SERVER_REPORT_TTL,
+    ) -> None:
+        """Set up class."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._reports: OrderedDict[tuple, tuple[float, str | dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._reports)
+
+    def get(self, key: tuple) -> str | dict | None:
+        """Return the report if it is held and has not expired."""
+        with self._lock:
+            entry = self._reports.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._reports[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._reports.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, report: str | dict) -> None:
+        """Add a report, removing the least recently used if full."""
+        with self._lock:
+            self._reports[key] = (time.monotonic(), report)
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_entries:
+                self._reports.popitem(last=False)
+
+
+def render_report(playlist: Playlist, depth: int, output_format: str) -> str | dict:
+    """Return the report of the analysed playlist, as text or plain data."""
+    if output_format == "json":
+        return playlist_analysis(playlist)
+    report = StringIO()
+    output_analysis(playlist, depth, report)
+    return report.getvalue()
+
+
+def read_options(query: dict) -> tuple[int, str]:
+    """Return the depth and format requested.
+
+    Raises:
+        ValueError: if either is not valid.
+    """
+    try:
+        depth = int(query.get("depth", 0))
+    except TypeError:
+        raise ValueError("depth must be 0, 1 or 2") from None
+    if depth not in (0, 1, 2):
+        raise ValueError("depth must be 0, 1 or 2")
+    output_format = query.get("format", "text")
+    if output_format not in SERVER_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(SERVER_FORMATS)}")
+    return depth, output_format
+
+
+def error_status(error: Exception) -> int:
+    """Return the status to respond with when an analysis failed.
+
+    Client errors from Spotify, such as an unknown playlist, are passed on.
+    Any other failure of Spotify is a bad gateway."""
+    if isinstance(error, HTTPError) and error.response is not None:
+        if 400 <= error.response.status_code < 500:
+            return error.response.status_code
+        return 502
+    return 500
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    """HTTP server analysing playlists on a pool of workers.
+
+    The token, connection pool and caches are shared by every request, and
+    stay warm between them. Rendered reports are kept in a ReportCache, and
+    concurrent requests for the same report share one analysis."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        workers: int = SERVER_WORKERS,
+        incremental: bool = False,
+        pipelined: bool = False,
+        reports: ReportCache | None = None,
+    ) -> None:
+        """Bind the server, and set up the pool of workers."""
+        super().__init__((host, port), AnalysisHandler)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.incremental = incremental
+        self.pipelined = pipelined
+        self.reports = reports if reports is not None else ReportCache()
+        self._in_flight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/"
+
+    def submit(self, playlist_id: str, depth: int, output_format: str) -> Future:
+        """Return a future for the report, served from the cache if held."""
+        key = (playlist_id, depth, output_format)
+        with self._lock:
+            # Checked under the lock, so an analysis that finishes between
+            # the check and taking the lock is not started again.
+            report = self.reports.get(key)
+            if report is not None:
+                future = Future()
+                future.set_result(report)
+                return future
+            if key not in self._in_flight:
+                self._in_flight[key] = self.executor.submit(self.__analyse, key)
+            return self._in_flight[key]
+
+    def __analyse(self, key: tuple) -> str | dict:
+        playlist_id, depth, output_format = key
+        try:
+            playlist = load_playlist(
+                playlist_id, depth, self.incremental, self.pipelined
+            )
+            analyse_populated_playlist(playlist)
+            report = render_report(playlist, depth, output_format)
+            self.reports.put(key, report)
+            return report
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def status(self) -> dict:
+        """Return the state of the server's caches."""
+        feature_cache = get_feature_cache()
+        return {
+            "status": "ok",
+            "reports_cached": len(self.reports),
+            "report_cache_hits": self.reports.hits,
+            "report_cache_misses": self.reports.misses,
+            "analyses_in_flight": len(self._in_flight),
+            "feature_cache_hit_ratio": (
+                None if feature_cache is None else feature_cache.hit_ratio()
+            ),
+        }
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    """Handle requests for the analysis of playlists.
+
+    GET /playlists/<id>?depth=0&format=text returns the report of one
+    playlist. POST /playlists, with a JSON body of {"ids": [...], "depth": 0,
+    "format": "json"}, returns the report of each playlist by id, and the
+    error for each that failed. GET /health returns the state of the caches,
+    and GET /metrics the metrics in the Prometheus text format, if enabled."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self.send_json(200, self.server.status())
+            return
+        if url.path == "/metrics":
+            metrics = get_metrics()
+            if metrics is None:
+                self.send_json(404, {"error": "Metrics are not enabled"})
+                return
+            self.send_body(
+                200,
+                metrics.to_prometheus().encode("utf-8"),
+                "text/plain; version=0.0.4; charset=utf-8",
+            )
+            return
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "playlists" or parts[1] == "":
+            self.send_json(404, {"error": "Not found"})
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            depth, output_format = read_options(query)
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        try:
+            report = self.server.submit(parts[1], depth, output_format).result()
+        except Exception as e:
+            self.send_json(error_status(e), {"error": f"{type(e).__name__}: {e}"})
+            return
+        if output_format == "json":
+            self.send_json(200, report)
+        else:
+            self.send_body(200, report.encode("utf-8"), "text/plain; charset=utf-8")
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path != "/playlists":
+            self.send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError("Content-Length must not be negative")
+            body = json.loads(self.rfile.read(length) or b"{}")
+            playlist_ids = body.get("ids", [])
+            if not isinstance(playlist_ids, list) or len(playlist_ids) == 0:
+                raise ValueError("ids must be a list of playlist ids")
+            if not all(isinstance(x, str) and x != "" for x in playlist_ids):
+                raise ValueError("each playlist id must be a non-empty string")
+            depth, output_format = read_options(
+                {key: body[key] for key in ["depth", "format"] if key in body}
+            )
+        except (ValueError, AttributeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        futures = {
+            playlist_id: self.server.submit(playlist_id, depth, output_format)
+            for playlist_id in playlist_ids
+        }
+        reports = {}
+        errors = {}
+        for playlist_id, future in futures.items():
+            try:
+                reports[playlist_id] = future.result()
+            except Exception as e:
+                errors[playlist_id] = f"{type(e).__name__}: {e}"
+        self.send_json(200, {"reports": reports, "errors": errors})
+
+    def send_json(self, status: int, body) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_body(status, payload, "application/json")
+
+    def send_body(self, status: int, payload: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        logger.print(f"{self.address_string()} {format % args}")
+
+
+def serve(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    workers: int = SERVER_WORKERS,
+    incremental: bool = False,
+    pipelined: bool = False,
+) -> None:
+    """Run the server until interrupted.
+
+    The token is requested up front, so the first request does not wait
+    for it."""
+    get_token_provider().get_token()
+    server = AnalysisServer(host, port, workers, incremental, pipelined)
+    print(f"Serving playlist analysis on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,131 @@
+"""Provide a valid access token, reusing it across playlists and runs."""
+
+import asyncio
+import json
+import os
+import threading
+from pathlib import PosixPath
+
+from analyse_spotify_playlist.access_token import AccessToken
+from analyse_spotify_playlist.async_outbound_requests import (
+    request_access_token_async,
+)
+from analyse_spotify_playlist.config import (
+    CLIENT_ID,
+    TOKEN_CACHE_PATH,
+    TOKEN_REFRESH_MARGIN,
+)
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.outbound_requests import request_access_token
+
+logger = Log()
+
+
+class TokenProvider:
+    """Hand out the current access token, requesting a new one only when needed.
+
+    The token is cached on disk so the next run can reuse it, and is refreshed
+    refresh_margin seconds before it would expire."""
+
+    def __init__(
+        self,
+        cache_path: str | None = TOKEN_CACHE_PATH,
+        refresh_margin: float = TOKEN_REFRESH_MARGIN,
+    ) -> None:
+        """Set up class."""
+        self.cache_path = None
+        if cache_path is not None:
+            self.cache_path = PosixPath(cache_path).expanduser()
+        self.refresh_margin = refresh_margin
+        self.tokens_requested = 0
+        self._token: AccessToken | None = None
+        self._lock = threading.Lock()
+        self._async_lock: asyncio.Lock | None = None
+
+    def needs_refresh(self) -> bool:
+        """Check if there is no token, or it is about to expire."""
+        if self._token is None:
+            return True
+        return self._token.expires_within(self.refresh_margin)
+
+    def get_access_token(self) -> AccessToken:
+        """Return a valid token, loading or requesting one if needed."""
+        with self._lock:
+            if self.needs_refresh():
+                self._token = self.__load_cache()
+            if self.needs_refresh():
+                self.set_token(request_access_token())
+            return self._token
+
+    def get_token(self) -> str:
+        """Return a valid token string for the auth header."""
+        return self.get_access_token().get_token()
+
+    async def get_token_async(self, session) -> str:
+        """Return a valid token string, requesting a new one with the async client."""
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self.needs_refresh():
+                self._token = self.__load_cache()
+            if self.needs_refresh():
+                self.set_token(await request_access_token_async(session))
+            return self._token.get_token()
+
+    def set_token(self, raw_token: dict) -> None:
+        """Store a newly requested token, and write it to the cache."""
+        self._token = AccessToken(**raw_token)
+        self.tokens_requested += 1
+        logger.print(f"New access token requested ({self.tokens_requested} this run)")
+        self.__save_cache()
+
+    def use_token(self, token: dict) -> None:
+        """Use a token requested elsewhere.
+
+        Worker processes are handed the token of the main process, so they
+        do not each request one."""
+        self._token = AccessToken(**token)
+
+    def __load_cache(self) -> AccessToken | None:
+        """Read the token from the cache file, if there is a usable one."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return None
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.pop("client_id", None) != CLIENT_ID:
+                return None
+            return AccessToken(**cached)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def __save_cache(self) -> None:
+        """Write the token to the cache file, readable by the current user only."""
+        if self.cache_path is None:
+            return
+        to_save = self._token.to_dict()
+        to_save["client_id"] = CLIENT_ID
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(to_save, f)
+        except OSError as e:
+            logger.print(f"Unable to cache access token: {e}")
+
+
+_provider: TokenProvider | None = None
+
+
+def get_token_provider() -> TokenProvider:
+    """Return the shared token provider, creating it on first use."""
+    global _provider
+    if _provider is None:
+        _provider = TokenProvider()
+    return _provider
+
+
+def set_token_provider(provider: TokenProvider | None) -> None:
+    """Replace the shared token provider. Pass None to recreate it on next use."""
+    global _provider
+    _provider = provider
@@ -1,36 +1,126 @@
 """Class definition for Track data."""
 
+from typing import NamedTuple
+
 from analyse_spotify_playlist.utils import convert_key, convert_mode
 
 
+class Album(NamedTuple):
+    """The album details a Track keeps."""
+
+    album_type: str
+    release_date: str
+    name: str | None = None
+    id: str | None = None
+
+
+class Artist(NamedTuple):
+    """The artist details a Track keeps."""
+
+    name: str
+    id: str | None = None
+
+
+class RecordTable:
+    """Interned records, so tracks from the same album or artist share one object.
+
+    A table lives as long as the playlist, or the registry of the run, that
+    builds tracks with it, so records are not held once they are done with."""
+
+    def __init__(self) -> None:
+        """Set up class."""
+        self._albums: dict[Album, Album] = {}
+        self._artists: dict[Artist, Artist] = {}
+
+    def intern_album(self, album: dict) -> Album:
+        """Return the shared Album record for the album data."""
+        record = Album(
+            album.get("album_type"),
+            album.get("release_date"),
+            album.get("name"),
+            album.get("id"),
+        )
+        return self._albums.setdefault(record, record)
+
+    def intern_artists(self, artists: list[dict]) -> tuple[Artist, ...]:
+        """Return the shared Artist records for the artists data."""
+        records = []
+        for artist in artists:
+            record = Artist(artist.get("name"), artist.get("id"))
+            records.append(self._artists.setdefault(record, record))
+        return tuple(records)
+
+
 class Track:
     """Track in a playlist."""
 
+    __slots__ = (
+        "_album",
+        "_artists",
+        "_disc_number",
+        "_duration_ms",
+        "_explicit",
+        "_external_ids",
+        "_external_urls",
+        "_href",
+        "_id",
+        "_name",
+        "_popularity",
+        "_preview_url",
+        "_track_number",
+        "_type",
+        "_uri",
+        "_is_local",
+        "_episode",
+        "_track",
+        "_acousticness",
+        "_danceability",
+        "_energy",
+        "_instrumentalness",
+        "_key",
+        "_liveness",
+        "_loudness",
+        "_mode",
+        "_speechiness",
+        "_tempo",
+        "_time_signature",
+        "_valence",
+    )
+
     def __init__(
         self,
         album: dict,
         artists: dict,
-        available_markets: list[str],
-        disc_number: int,
-        duration_ms: int,
-        explicit: bool,
-        external_ids: dict,
-        external_urls: dict,
-        href: str,
-        id: str,
-        name: str,
-        popularity: int,
-        preview_url: str,
-        track_number: int,
-        type: str,
-        uri: str,
-        is_local: bool,
-        episode: bool,
-        track: bool,
+        available_markets: list[str] | None = None,
+        disc_number: int | None = None,
+        duration_ms: int | None = None,
+        explicit: bool | None = None,
+        external_ids: dict | None = None,
+        external_urls: dict | None = None,
+        href: str | None = None,
+        id: str | None = None,
+        name: str | None = None,
+        popularity: int | None = None,
+        preview_url: str | None = None,
+        track_number: int | None = None,
+        type: str | None = None,
+        uri: str | None = None,
+        is_local: bool | None = None,
+        episode: bool | None = None,
+        track: bool | None = None,
+        records: RecordTable | None = None,
     ) -> None:
-        self._album = album
-        self._artists = artists
-        self._available_markets = available_markets
+        """Track Constructor.
+
+        Only album and artists are required, as the playlist requests can be
+        filtered down to just the fields the analysis reads. Available markets
+        are not used by the analysis, so are not kept. The album and artist
+        records are shared with the other tracks built with the same records
+        table, if given."""
+        if records is None:
+            records = RecordTable()
+        self._album = records.intern_album(album)
+        self._artists = records.intern_artists(artists)
         self._disc_number = disc_number
         self._duration_ms = duration_ms
         self._explicit = explicit
@@ -93,8 +183,12 @@ class Track:
 
     def get_release_date(self) -> str:
         """Return release date for the track."""
-        return self._album["release_date"]
+        return self._album.release_date
 
     def get_album_type(self) -> str:
         """Return album type the track is from."""
-        return self._album["album_type"]
+        return self._album.album_type
+
+    def get_artist_name(self) -> str:
+        """Return the name of the main artist on the track."""
+        return self._artists[0].name
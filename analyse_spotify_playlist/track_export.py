@@ -0,0 +1,140 @@
+"""Export the tracks of a playlist, with their audio features, as a table."""
+
+from __future__ import annotations
+
+import csv
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from analyse_spotify_playlist.config import EXPORT_CHUNK_SIZE, EXPORT_FORMATS
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.utils import performance_timer
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+if TYPE_CHECKING:
+    from pathlib import PosixPath
+
+    from analyse_spotify_playlist.playlist import Playlist
+
+logger = Log()
+
+# Column name and type, in table order. Key and mode are exported as the
+# names the report uses.
+TRACK_TABLE_COLUMNS = [
+    ("playlist_id", "string"),
+    ("id", "string"),
+    ("name", "string"),
+    ("artist", "string"),
+    ("release_date", "string"),
+    ("popularity", "int64"),
+    ("duration_ms", "int64"),
+    ("acousticness", "float64"),
+    ("danceability", "float64"),
+    ("energy", "float64"),
+    ("instrumentalness", "float64"),
+    ("key", "string"),
+    ("liveness", "float64"),
+    ("loudness", "float64"),
+    ("mode", "string"),
+    ("speechiness", "float64"),
+    ("tempo", "float64"),
+    ("time_signature", "int64"),
+    ("valence", "float64"),
+]
+# Columns read straight from the Track attribute of the same name.
+TRACK_ATTRIBUTES = [name for name, _ in TRACK_TABLE_COLUMNS[5:]]
+
+
+def columnar_export_available() -> bool:
+    """Check if pyarrow is installed, for the arrow and parquet formats."""
+    return pyarrow is not None
+
+
+def iter_track_rows(playlist: Playlist) -> Iterator[tuple]:
+    """Yield a row of the track table for each track, in playlist order."""
+    for track in playlist.tracks.values():
+        yield (
+            playlist.id,
+            track._id,
+            track._name,
+            track.get_artist_name(),
+            track.get_release_date(),
+            *(getattr(track, f"_{name}") for name in TRACK_ATTRIBUTES),
+        )
+
+
+def iter_chunks(rows: Iterable[tuple], chunk_size: int) -> Iterator[list[tuple]]:
+    """Yield the rows in lists of at most chunk_size."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def write_csv(rows: Iterable[tuple], path: PosixPath, chunk_size: int) -> None:
+    """Write the rows to a CSV file with a header, a chunk at a time."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in TRACK_TABLE_COLUMNS])
+        for chunk in iter_chunks(rows, chunk_size):
+            writer.writerows(chunk)
+
+
+def arrow_schema():
+    """Return the Arrow schema of the track table."""
+    return pyarrow.schema(
+        [(name, pyarrow.type_for_alias(type)) for name, type in TRACK_TABLE_COLUMNS]
+    )
+
+
+def iter_record_batches(rows: Iterable[tuple], schema, chunk_size: int) -> Iterator:
+    """Yield the rows as Arrow record batches of at most chunk_size rows."""
+    for chunk in iter_chunks(rows, chunk_size):
+        columns = [
+            pyarrow.array(values, type=field.type)
+            for values, field in zip(zip(*chunk), schema)
+        ]
+        yield pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_arrow(rows: Iterable[tuple], path: PosixPath, chunk_size: int) -> None:
+    """Write the rows to an Arrow IPC file, a record batch at a time."""
+    schema = arrow_schema()
+    with pyarrow.ipc.new_file(str(path), schema) as writer:
+        for batch in iter_record_batches(rows, schema, chunk_size):
+            writer.write_batch(batch)
+
+
+def write_parquet(rows: Iterable[tuple], path: PosixPath, chunk_size: int) -> None:
+    """Write the rows to a Parquet file, a row group per record batch."""
+    schema = arrow_schema()
+    with pyarrow.parquet.ParquetWriter(str(path), schema) as writer:
+        for batch in iter_record_batches(rows, schema, chunk_size):
+            writer.write_batch(batch)
+
+
+@performance_timer("export")
+def export_tracks(
+    playlist: Playlist,
+    path: PosixPath,
+    export_format: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> PosixPath:
+    """Export the track table of the playlist, streamed a chunk at a time.
+
+    path is the file to write, without an extension. If pyarrow is not
+    installed, arrow and parquet fall back to CSV. Returns the file written."""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+    if export_format != "csv" and not columnar_export_available():
+        logger.print(f"pyarrow is not installed, exporting {path.name} as csv")
+        export_format = "csv"
+    writers = {"csv": write_csv, "arrow": write_arrow, "parquet": write_parquet}
+    path = path.with_name(f"{path.name}.{export_format}")
+    writers[export_format](iter_track_rows(playlist), path, chunk_size)
+    return path
@@ -0,0 +1,121 @@
+"""Tracks shared by every playlist analysed in a run."""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.track import RecordTable, Track
+
+logger = Log()
+
+
+class TrackRegistry:
+    """Hold one Track for each unique track seen in a run.
+
+    Playlists hold references to the registered tracks, so a track on many
+    playlists is only built and populated once. The audio features of a
+    track are only requested by the first playlist to claim it. A playlist
+    that finds the features already claimed waits for them to be populated,
+    rather than requesting them again."""
+
+    def __init__(self) -> None:
+        """Set up class."""
+        self._tracks: dict[str, Track] = {}
+        self.records = RecordTable()
+        self._fetched: set[str] = set()
+        self._in_flight: set[str] = set()
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self.tracks_reused = 0
+        self.features_reused = 0
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def get_or_create(self, track_data: dict) -> Track:
+        """Return the registered track, creating it from the data if new."""
+        with self._lock:
+            track = self._tracks.get(track_data["id"])
+            if track is not None:
+                self.tracks_reused += 1
+                return track
+            track = Track(**track_data, records=self.records)
+            self._tracks[track_data["id"]] = track
+            return track
+
+    def claim_features(self, track_ids: list[str]) -> tuple[list[str], list[str]]:
+        """Claim the tracks whose audio features have not been requested yet.
+
+        Returns:
+            the ids to request, and the ids whose features another playlist
+            has requested.
+        """
+        claimed = []
+        shared = []
+        with self._lock:
+            for track_id in track_ids:
+                if track_id in self._fetched or track_id in self._in_flight:
+                    shared.append(track_id)
+                else:
+                    self._in_flight.add(track_id)
+                    claimed.append(track_id)
+            self.features_reused += len(shared)
+        return claimed, shared
+
+    def release_features(self, track_ids: list[str], populated: bool = True) -> None:
+        """Release claimed tracks, once their audio features are populated.
+
+        If not populated, the features can be claimed again."""
+        with self._released:
+            for track_id in track_ids:
+                self._in_flight.discard(track_id)
+                if populated:
+                    self._fetched.add(track_id)
+            self._released.notify_all()
+
+    def wait_for_features(self, track_ids: list[str]) -> list[str]:
+        """Wait until no track is still claimed by another playlist.
+
+        Returns:
+            the ids released without their features, because the request of
+            the playlist that claimed them failed. These must be claimed and
+            requested again.
+        """
+        with self._released:
+            self._released.wait_for(
+                lambda: not any(x in self._in_flight for x in track_ids)
+            )
+            return [x for x in track_ids if x not in self._fetched]
+
+
+_registry: TrackRegistry | None = None
+
+
+def get_track_registry() -> TrackRegistry | None:
+    """Return the registry for the run, or None if tracks are not shared."""
+    return _registry
+
+
+def set_track_registry(registry: TrackRegistry | None) -> None:
+    """Replace the registry for the run. Pass None to stop sharing tracks."""
+    global _registry
+    _registry = registry
+
+
+@contextmanager
+def shared_tracks() -> Iterator[TrackRegistry]:
+    """Share tracks between the playlists analysed within the block.
+
+    How many tracks and audio features were reused is logged at the end."""
+    registry = TrackRegistry()
+    set_track_registry(registry)
+    try:
+        yield registry
+    finally:
+        set_track_registry(None)
+        logger.print(
+            f"Track registry: {len(registry)} unique tracks, "
+            f"{registry.tracks_reused} reused, "
+            f"{registry.features_reused} audio features shared"
+        )
@@ -2,34 +2,81 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import functools
+import inspect
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from analyse_spotify_playlist.track import Track
 
-from copy import deepcopy
 from time import perf_counter
 
 from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.metrics import get_metrics
 
 logger = Log()
 
 
-def performance_timer(func: function):
+def performance_timer(stage: Callable | str | None = None):
+    """Time each call of the decorated function, including calls that raise.
+
+    As @performance_timer("page"), every call is recorded under the stage in
+    the metrics registry, when metrics are enabled, and costs one check
+    otherwise. Used bare, as on the entry points, the call is recorded under
+    the name of the function and the time taken is also logged. Coroutine
+    functions are timed until they return."""
+    if callable(stage):
+        return _timed(stage, stage.__name__, log=True)
+    return lambda func: _timed(func, stage or func.__name__, log=False)
+
+
+def _timed(func: Callable, name: str, log: bool) -> Callable:
+    def record(start: float) -> None:
+        elapsed = perf_counter() - start
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.observe(name, elapsed)
+        if log:
+            logger.print(f"{func.__name__} complete. Time taken: {elapsed}")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if get_metrics() is None and not (log and Log.log_messages):
+                return await func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(start)
+
+        return async_wrapper
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        if get_metrics() is None and not (log and Log.log_messages):
+            return func(*args, **kwargs)
         start = perf_counter()
-        value = func(*args, **kwargs)
-        end = perf_counter()
-        logger.print(f"{func.__name__} complete. Time taken: {end - start}")
-        return value
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(start)
 
     return wrapper
 
 
+def split_into_batches(items: list, batch_size: int) -> list[list]:
+    """Split a list into consecutive batches of at most batch_size items."""
+    return [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+
+
 def clean_raw_playlist_data(playlist: dict) -> dict:
     """Return dict with playlist data.
 
-    Removes the excess data from request that isn't needed."""
+    Removes the excess data from request that isn't needed. The values are
+    shared with the response rather than copied, as they are only read. The
+    snapshot id is kept if the response has one."""
     keys = [
         "name",
         "owner",
@@ -40,10 +87,9 @@ def clean_raw_playlist_data(playlist: dict) -> dict:
         "public",
         "tracks",
     ]
-    playlist_copy = deepcopy(playlist)
-    clean = {}
-    for key in keys:
-        clean[key] = playlist_copy[key]
+    clean = {key: playlist[key] for key in keys}
+    if "snapshot_id" in playlist:
+        clean["snapshot_id"] = playlist["snapshot_id"]
     return clean
 
 
@@ -72,7 +118,6 @@ def clean_up_track_features(raw_feature_data: dict) -> tuple:
     return (feature_copy["id"], clean)
 
 
-# @performance_timer
 def find_min_max_audio_features(
     track_list: dict[str, Track],
 ) -> dict[str, list[list[str, float]]]:
@@ -117,7 +162,6 @@ def find_min_max_audio_features(
     return return_object
 
 
-# @performance_timer
 def find_average_audio_features(track_list: list[Track]) -> dict[str, float]:
     """Find the average value for a given key."""
     no_of_tracks = len(track_list)
@@ -151,6 +195,22 @@ def find_average_audio_features(track_list: list[Track]) -> dict[str, float]:
     return return_object
 
 
+KEY_NAMES = [
+    "C",
+    "C♯/D♭",
+    "D",
+    "D♯/E♭",
+    "E/F♭",
+    "E♯/F",
+    "F♯/G♭",
+    "G",
+    "G♯/A♭",
+    "A",
+    "A♯/B♭",
+    "B",
+]
+
+
 def convert_key(key: int) -> str:
     """Convert key from pitch class notation to Str value.
 
@@ -158,21 +218,7 @@ def convert_key(key: int) -> str:
     """
     if key == -1:
         return "No Key found."
-    key_list = [
-        "C",
-        "C♯/D♭",
-        "D",
-        "D♯/E♭",
-        "E/F♭",
-        "E♯/F",
-        "F♯/G♭",
-        "G",
-        "G♯/A♭",
-        "A",
-        "A♯/B♭",
-        "B",
-    ]
-    return key_list[key]
+    return KEY_NAMES[key]
 
 
 def convert_mode(mode: int) -> str:
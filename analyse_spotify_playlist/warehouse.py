@@ -0,0 +1,240 @@
+"""Local SQLite warehouse of the analysed playlists, tracks and audio features."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import PosixPath
+from time import time
+from typing import TYPE_CHECKING, Iterable
+
+from analyse_spotify_playlist.config import WAREHOUSE_PATH
+from analyse_spotify_playlist.utils import clean_up_track_features
+
+if TYPE_CHECKING:
+    from analyse_spotify_playlist.playlist import Playlist
+    from analyse_spotify_playlist.track import Track
+
+# Audio features stored as whole numbers. The rest are stored as REAL.
+INTEGER_FEATURES = ["key", "mode", "time_signature"]
+# The audio feature columns, in the order clean_up_track_features returns them.
+FEATURE_COLUMNS = [
+    "acousticness",
+    "danceability",
+    "energy",
+    "instrumentalness",
+    "key",
+    "liveness",
+    "loudness",
+    "mode",
+    "speechiness",
+    "tempo",
+    "time_signature",
+    "valence",
+]
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS playlists (
+        id TEXT PRIMARY KEY,
+        snapshot_id TEXT,
+        name TEXT,
+        description TEXT,
+        owner TEXT,
+        collaborative INTEGER,
+        public INTEGER,
+        followers INTEGER,
+        total_tracks INTEGER,
+        stored_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS playlists_snapshot_id ON playlists (snapshot_id)",
+    """CREATE TABLE IF NOT EXISTS tracks (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        artist TEXT,
+        album_type TEXT,
+        release_date TEXT,
+        duration_ms INTEGER,
+        explicit INTEGER,
+        popularity INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS playlist_tracks (
+        playlist_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        track_id TEXT NOT NULL,
+        PRIMARY KEY (playlist_id, position)
+    )""",
+    "CREATE INDEX IF NOT EXISTS playlist_tracks_track_id "
+    "ON playlist_tracks (track_id)",
+    "CREATE TABLE IF NOT EXISTS audio_features (track_id TEXT PRIMARY KEY, "
+    + ", ".join(
+        f"{column} INTEGER" if column in INTEGER_FEATURES else f"{column} REAL"
+        for column in FEATURE_COLUMNS
+    )
+    + ")",
+]
+
+UPSERT_TRACK = (
+    "INSERT INTO tracks (id, name, artist, album_type, release_date, "
+    "duration_ms, explicit, popularity) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+    "artist = excluded.artist, album_type = excluded.album_type, "
+    "release_date = excluded.release_date, duration_ms = excluded.duration_ms, "
+    "explicit = excluded.explicit, popularity = excluded.popularity"
+)
+UPSERT_FEATURES = (
+    f"INSERT INTO audio_features (track_id, {', '.join(FEATURE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * (len(FEATURE_COLUMNS) + 1))}) "
+    "ON CONFLICT (track_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in FEATURE_COLUMNS)
+)
+
+
+def track_row(track: Track) -> tuple:
+    """Return the row of the tracks table for the track."""
+    return (
+        track._id,
+        track._name,
+        track.get_artist_name(),
+        track.get_album_type(),
+        track.get_release_date(),
+        track._duration_ms,
+        track._explicit,
+        track._popularity,
+    )
+
+
+class Warehouse:
+    """SQLite store of every analysed playlist, its tracks and their audio features.
+
+    Rows are upserted in bulk, one transaction per call, so storing a
+    playlist again updates it in place. The playlists keep their snapshot
+    id, so later runs can tell whether a stored playlist is still current."""
+
+    def __init__(self, path: str = WAREHOUSE_PATH) -> None:
+        """Open (or create) the warehouse database."""
+        if path != ":memory:":
+            path = PosixPath(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def put_playlist(self, playlist: Playlist) -> None:
+        """Store the playlist, its tracks and their positions in it.
+
+        The track list replaces the one stored for the playlist."""
+        playlist_row = (
+            playlist.id,
+            playlist.snapshot_id,
+            playlist.name,
+            playlist.description,
+            playlist.owner,
+            playlist.collaborative == "Yes",
+            playlist.public,
+            playlist.followers,
+            playlist.total_tracks,
+            time(),
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO playlists VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                playlist_row,
+            )
+            self._connection.executemany(
+                UPSERT_TRACK, map(track_row, playlist.tracks.values())
+            )
+            self._connection.execute(
+                "DELETE FROM playlist_tracks WHERE playlist_id = ?", (playlist.id,)
+            )
+            self._connection.executemany(
+                "INSERT INTO playlist_tracks VALUES (?, ?, ?)",
+                (
+                    (playlist.id, position, track_id)
+                    for position, track_id in enumerate(playlist.tracks)
+                ),
+            )
+
+    def put_tracks(self, tracks: Iterable[Track]) -> None:
+        """Store the tracks, without adding them to a playlist.
+
+        The tracks are consumed as they are inserted, so they can be
+        generated lazily."""
+        with self._lock, self._connection:
+            self._connection.executemany(UPSERT_TRACK, map(track_row, tracks))
+
+    def put_audio_features(self, cleaned_features: Iterable[tuple]) -> None:
+        """Store audio features, as returned by clean_up_track_features.
+
+        Tracks without features are skipped."""
+        rows = (
+            (track_id, *(features[column] for column in FEATURE_COLUMNS))
+            for track_id, features in cleaned_features
+            if track_id is not None
+        )
+        with self._lock, self._connection:
+            self._connection.executemany(UPSERT_FEATURES, rows)
+
+    def put_raw_audio_features(self, audio_features: Iterable[dict | None]) -> None:
+        """Store audio features, as returned by the API."""
+        self.put_audio_features(map(clean_up_track_features, audio_features))
+
+    def get_snapshot_id(self, playlist_id: str) -> str | None:
+        """Return the snapshot id the playlist was stored at, if it is stored."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT snapshot_id FROM playlists WHERE id = ?", (playlist_id,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def playlist_tracks(self, playlist_id: str) -> list[sqlite3.Row]:
+        """Return the stored tracks of the playlist, in order.
+
+        Each row holds the track and its audio features."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT t.*, "
+                + ", ".join(f"f.{column}" for column in FEATURE_COLUMNS)
+                + " FROM playlist_tracks p JOIN tracks t ON t.id = p.track_id "
+                "LEFT JOIN audio_features f ON f.track_id = p.track_id "
+                "WHERE p.playlist_id = ? ORDER BY p.position",
+                (playlist_id,),
+            )
+            cursor.row_factory = sqlite3.Row
+            return cursor.fetchall()
+
+    def count(self, table: str) -> int:
+        """Return the number of rows in the table."""
+        if table not in ("playlists", "tracks", "playlist_tracks", "audio_features"):
+            raise ValueError(f"Unknown table: {table}")
+        with self._lock:
+            (total,) = self._connection.execute(
+                f"SELECT COUNT(*) FROM {table}"
+            ).fetchone()
+        return total
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+
+_warehouse: Warehouse | None = None
+
+
+def get_warehouse() -> Warehouse | None:
+    """Return the shared warehouse, or None if it is disabled."""
+    global _warehouse
+    if _warehouse is None and WAREHOUSE_PATH is not None:
+        _warehouse = Warehouse()
+    return _warehouse
+
+
+def set_warehouse(warehouse: Warehouse | None) -> None:
+    """Replace the shared warehouse. Pass None to reopen it on next use."""
+    global _warehouse
+    _warehouse = warehouse
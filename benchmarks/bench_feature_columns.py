@@ -0,0 +1,81 @@
+"""Benchmark the min/max/average audio feature analysis.
+
+Compares the per track loops in utils with the vectorised FeatureColumns
+reductions, at 1k, 10k and 100k tracks.
+
+Run with: python -m benchmarks.bench_feature_columns
+"""
+
+import random
+from time import perf_counter
+
+from analyse_spotify_playlist.feature_columns import FeatureColumns
+from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.utils import (
+    find_average_audio_features,
+    find_min_max_audio_features,
+)
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def make_tracks(total: int) -> dict[str, Track]:
+    """Return tracks with random audio features."""
+    rng = random.Random(total)
+    tracks = {}
+    for i in range(total):
+        track = Track(
+            album={"album_type": "album", "release_date": "2020-01-01"},
+            artists=[{"name": f"Artist {i % 500}"}],
+            id=f"id{i}",
+            name=f"Track {i}",
+            duration_ms=rng.randint(60000, 400000),
+            explicit=False,
+            popularity=rng.randint(0, 100),
+        )
+        track.populate_audio_features(
+            acousticness=rng.random(),
+            danceability=rng.random(),
+            energy=rng.random(),
+            instrumentalness=rng.random(),
+            key=rng.randint(0, 11),
+            liveness=rng.random(),
+            loudness=-rng.random() * 20,
+            mode=rng.randint(0, 1),
+            speechiness=rng.random(),
+            tempo=60 + rng.random() * 120,
+            time_signature=rng.randint(3, 5),
+            valence=rng.random(),
+        )
+        tracks[track._id] = track
+    return tracks
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """Return the fastest of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def loop_analysis(tracks: dict[str, Track]) -> None:
+    find_min_max_audio_features(tracks)
+    find_average_audio_features(tracks)
+
+
+def columnar_analysis(tracks: dict[str, Track]) -> None:
+    columns = FeatureColumns(tracks)
+    columns.min_max()
+    columns.average()
+
+
+if __name__ == "__main__":
+    print(f"{'Tracks':>8} {'Loops (s)':>10} {'Columns (s)':>12} {'Speedup':>8}")
+    for size in SIZES:
+        tracks = make_tracks(size)
+        loops = best_of(lambda: loop_analysis(tracks))
+        columns = best_of(lambda: columnar_analysis(tracks))
+        print(f"{size:>8} {loops:>10.4f} {columns:>12.4f} {loops / columns:>7.1f}x")
@@ -0,0 +1,76 @@
+"""Benchmark the cold start of the command line.
+
+Starts a new interpreter for each command, as cron and shell scripts do, and
+records the median wall time over RUNS runs, and the time spent importing
+modules, read from -X importtime. The interpreter on its own is the floor
+the other commands are measured against. --help and a usage error should
+stay close to it, as the analysis is only imported once the arguments are
+valid.
+
+Run with: python -m benchmarks.bench_import_time
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RUNS = 10
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    "Interpreter": ["-c", "pass"],
+    "--help": ["-m", "analyse_spotify_playlist", "--help"],
+    "Usage error": ["-m", "analyse_spotify_playlist", "-a", "-i", "id"],
+    "Analysis": ["-c", "import analyse_spotify_playlist.analyse_spotify_playlist"],
+}
+
+
+def run(args: list[str], import_time: bool = False) -> subprocess.CompletedProcess:
+    """Run the interpreter with the arguments, from the root of the repo."""
+    options = ["-X", "importtime"] if import_time else []
+    return subprocess.run(
+        [sys.executable, *options, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def wall_time(args: list[str]) -> float:
+    """Return the median wall time of the command, in milliseconds."""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        run(args)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def top_level_imports(args: list[str]) -> dict[str, float]:
+    """Return the cumulative import time of each top level import, in ms."""
+    imports = {}
+    for line in run(args, import_time=True).stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented under the module importing them.
+        if not name[1:].startswith(" "):
+            imports[name.strip()] = int(cumulative) / 1000
+    return imports
+
+
+if __name__ == "__main__":
+    print(f"Median of {RUNS} runs")
+    print(f"{'':>12} {'Wall (ms)':>10} {'Imports (ms)':>13}")
+    slowest = {}
+    for name, args in COMMANDS.items():
+        imports = top_level_imports(args)
+        slowest[name] = sorted(imports.items(), key=lambda x: x[1], reverse=True)
+        print(f"{name:>12} {wall_time(args):>10.1f} {sum(imports.values()):>13.1f}")
+    for name in ["--help", "Analysis"]:
+        print(f"\nSlowest imports for {name}")
+        for module, cumulative in slowest[name][:5]:
+            print(f"{cumulative:>8.1f} ms  {module}")
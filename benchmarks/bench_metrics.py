@@ -0,0 +1,47 @@
+"""Benchmark the overhead of timing a stage.
+
+Calls an empty function CALLS times undecorated, and decorated with
+performance_timer with metrics disabled and enabled, then does the same
+with a timer block. Records the time taken per call, in nanoseconds.
+
+Run with: python -m benchmarks.bench_metrics
+"""
+
+import time
+
+from analyse_spotify_playlist.metrics import MetricsRegistry, set_metrics, timer
+from analyse_spotify_playlist.utils import performance_timer
+
+CALLS = 200_000
+
+
+def stage() -> None:
+    pass
+
+
+timed_stage = performance_timer("stage")(stage)
+
+
+def timed_block() -> None:
+    with timer("stage"):
+        pass
+
+
+def per_call(func) -> float:
+    """Return the time taken by each call of func, in nanoseconds."""
+    start = time.perf_counter_ns()
+    for _ in range(CALLS):
+        func()
+    return (time.perf_counter_ns() - start) / CALLS
+
+
+if __name__ == "__main__":
+    print(f"{CALLS} calls")
+    print(f"{'':>24} {'ns per call':>12}")
+    print(f"{'Undecorated':>24} {per_call(stage):>12.0f}")
+    for enabled in [False, True]:
+        set_metrics(MetricsRegistry() if enabled else None)
+        state = "enabled" if enabled else "disabled"
+        print(f"{f'Decorated, {state}':>24} {per_call(timed_stage):>12.0f}")
+        print(f"{f'Block, {state}':>24} {per_call(timed_block):>12.0f}")
+    set_metrics(None)
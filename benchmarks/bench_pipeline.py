@@ -0,0 +1,87 @@
+"""Benchmark the pipelined fetch of a playlist and its audio features.
+
+Serves a 5k track playlist from a local stub of the Spotify API that adds a
+fixed latency to every response. Compares requesting the audio features
+once every page has arrived with requesting them while the pages are still
+arriving. The caches and rate limit are disabled for both.
+
+Run with: python -m benchmarks.bench_pipeline
+"""
+
+import time
+import unittest.mock
+from copy import deepcopy
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE, MOCK_PLAYLIST_RESPONSE
+from test.stub_server import StubServer
+from test.test_outbound_requests import mock_track_page
+from urllib.parse import parse_qs, urlparse
+
+from analyse_spotify_playlist.analyse import (
+    fetch_audio_features,
+    fetch_playlist,
+    fetch_playlist_pipelined,
+    populate_track_features,
+)
+from analyse_spotify_playlist.request_scheduler import RequestScheduler, set_scheduler
+from analyse_spotify_playlist.utils import clean_up_track_features
+
+TOTAL_TRACKS = 5_000
+LATENCY = 0.2
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+
+
+def routes(path: str) -> tuple:
+    """Serve the playlist, its pages and audio features, after the latency."""
+    time.sleep(LATENCY)
+    url = urlparse(path)
+    query = parse_qs(url.query)
+    if url.path == "/audio-features":
+        features = []
+        for track_id in query["ids"][0].split(","):
+            feature = deepcopy(MOCK_AUDIO_FEATURES_RESPONSE["audio_features"][0])
+            feature["id"] = track_id
+            features.append(feature)
+        return 200, {"audio_features": features}
+    if url.path.endswith("/tracks"):
+        offset = int(query["offset"][0])
+        limit = int(query["limit"][0])
+        return 200, mock_track_page(offset, limit, TOTAL_TRACKS)
+    raw = deepcopy(MOCK_PLAYLIST_RESPONSE)
+    raw["tracks"] = mock_track_page(0, 100, TOTAL_TRACKS)
+    return 200, raw
+
+
+def sequential() -> None:
+    playlist = fetch_playlist("token", PLAYLIST_ID, 2)
+    features = fetch_audio_features("token", playlist.get_all_track_ids())
+    populate_track_features(playlist, list(map(clean_up_track_features, features)))
+
+
+def pipelined() -> None:
+    fetch_playlist_pipelined("token", PLAYLIST_ID, 2)
+
+
+if __name__ == "__main__":
+    set_scheduler(RequestScheduler(None))
+    with StubServer(routes) as server:
+        patches = [
+            unittest.mock.patch(
+                "analyse_spotify_playlist.outbound_requests.SPOTIFY_API_URL",
+                server.url,
+            ),
+            unittest.mock.patch(
+                "analyse_spotify_playlist.feature_cache.FEATURE_CACHE_PATH", None
+            ),
+            unittest.mock.patch(
+                "analyse_spotify_playlist.playlist_cache.PLAYLIST_CACHE_PATH", None
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+        print(f"{TOTAL_TRACKS} tracks, {LATENCY * 1000:.0f}ms per response")
+        for name, func in [("Sequential", sequential), ("Pipelined", pipelined)]:
+            start = time.perf_counter()
+            func()
+            print(f"{name:>10}: {time.perf_counter() - start:.2f}s")
+        for patch in patches:
+            patch.stop()
@@ -0,0 +1,89 @@
+"""Benchmark the memory allocated by the Playlist ordering methods.
+
+Compares the previous implementations, which deep copied the tracks before
+sorting them, with the single scan and heap selection now used by Playlist.
+Records the peak memory allocated by each, traced with tracemalloc, at 1k,
+10k and 100k tracks.
+
+Run with: python -m benchmarks.bench_playlist_copies
+"""
+
+import tracemalloc
+from copy import deepcopy
+
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.track import Track
+from benchmarks.bench_feature_columns import SIZES, make_tracks
+
+
+def make_playlist(total: int) -> Playlist:
+    """Return a playlist holding random tracks."""
+    playlist = Playlist(
+        name="Benchmark",
+        owner={},
+        collaborative=False,
+        description="",
+        followers={},
+        id="benchmark",
+        public=True,
+        tracks={},
+    )
+    playlist._tracks = make_tracks(total)
+    return playlist
+
+
+def copied_oldest_and_newest(playlist: Playlist) -> tuple[Track, Track]:
+    sorted_tracks = sorted(
+        deepcopy(playlist._tracks).items(),
+        key=lambda item: item[1].get_release_date(),
+    )
+    return sorted_tracks[0][1], sorted_tracks[-1][1]
+
+
+def copied_most_popular_list(playlist: Playlist) -> list:
+    sorted_list = sorted(
+        deepcopy(playlist._tracks).items(),
+        key=lambda item: item[1]._popularity,
+        reverse=True,
+    )
+    return [item[1] for item in sorted_list[:10]]
+
+
+def copied_least_popular_list(playlist: Playlist) -> list:
+    sorted_list = sorted(
+        deepcopy(playlist._tracks).items(), key=lambda item: item[1]._popularity
+    )
+    return [item[1] for item in sorted_list[:10]]
+
+
+def peak_allocated(func) -> int:
+    """Return the peak memory allocated while func runs, in bytes."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def copied_analysis(playlist: Playlist) -> None:
+    copied_oldest_and_newest(playlist)
+    copied_most_popular_list(playlist)
+    copied_least_popular_list(playlist)
+
+
+def shared_analysis(playlist: Playlist) -> None:
+    playlist.oldest_and_newest()
+    playlist.get_most_popular_list()
+    playlist.get_least_popular_list()
+
+
+if __name__ == "__main__":
+    print(f"{'Tracks':>8} {'Copied (KiB)':>13} {'Shared (KiB)':>13} {'Saving':>8}")
+    for size in SIZES:
+        playlist = make_playlist(size)
+        copied = peak_allocated(lambda: copied_analysis(playlist))
+        shared = peak_allocated(lambda: shared_analysis(playlist))
+        print(
+            f"{size:>8} {copied / 1024:>13.1f} {shared / 1024:>13.1f}"
+            f" {copied / max(shared, 1):>7.1f}x"
+        )
@@ -0,0 +1,80 @@
+"""Benchmark the memory held per Track for a 10k track playlist.
+
+Compares the slotted Track against a plain class keeping every field in a
+per instance __dict__, as Track did before. The slotted tracks share one
+RecordTable, as the tracks of a playlist do.
+
+Run with: python -m benchmarks.bench_track_memory
+"""
+
+import gc
+import json
+import tracemalloc
+from copy import deepcopy
+from functools import partial
+from test.mock_data import MOCK_TRACK
+
+from analyse_spotify_playlist.track import RecordTable, Track
+
+TOTAL_TRACKS = 10_000
+TOTAL_ALBUMS = 1_000
+TOTAL_ARTISTS = 500
+
+
+class DictTrack:
+    """Track as it was stored before, with every field in __dict__."""
+
+    def __init__(self, **kwargs) -> None:
+        for key, value in kwargs.items():
+            setattr(self, f"_{key}", value)
+        for key in [
+            "acousticness",
+            "danceability",
+            "energy",
+            "instrumentalness",
+            "key",
+            "liveness",
+            "loudness",
+            "mode",
+            "speechiness",
+            "tempo",
+            "time_signature",
+            "valence",
+        ]:
+            setattr(self, f"_{key}", None)
+
+
+def raw_tracks_json() -> str:
+    """Return the tracks as a json string, like a page of the api response."""
+    tracks = []
+    for i in range(TOTAL_TRACKS):
+        track = deepcopy(MOCK_TRACK)
+        track["id"] = f"track{i}"
+        track["name"] = f"Track {i}"
+        track["album"]["id"] = f"album{i % TOTAL_ALBUMS}"
+        track["artists"][0]["id"] = f"artist{i % TOTAL_ARTISTS}"
+        track["artists"][0]["name"] = f"Artist {i % TOTAL_ARTISTS}"
+        tracks.append(track)
+    return json.dumps(tracks)
+
+
+def measure(track_class, tracks_json: str) -> int:
+    """Return the bytes still held after creating every track."""
+    gc.collect()
+    tracemalloc.start()
+    tracks = [track_class(**track) for track in json.loads(tracks_json)]
+    gc.collect()
+    held, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tracks
+    return held
+
+
+if __name__ == "__main__":
+    tracks_json = raw_tracks_json()
+    before = measure(DictTrack, tracks_json)
+    after = measure(partial(Track, records=RecordTable()), tracks_json)
+    print(f"Tracks: {TOTAL_TRACKS}")
+    print(f"Before (__dict__): {before / TOTAL_TRACKS:,.0f} bytes per track")
+    print(f"After  (__slots__): {after / TOTAL_TRACKS:,.0f} bytes per track")
+    print(f"Reduction: {round((1 - after / before) * 100, 1)}%")
@@ -0,0 +1,71 @@
+"""Benchmark sharing tracks between the playlists of a run.
+
+Builds 200 chart-like playlists of 100 tracks, drawn from a pool of 1,000
+hit songs, with and without a TrackRegistry. Records the memory still held
+once every playlist is built, traced with tracemalloc, and the number of
+audio features that would be requested.
+
+Run with: python -m benchmarks.bench_track_registry
+"""
+
+import gc
+import random
+import tracemalloc
+from copy import deepcopy
+from test.mock_data import MOCK_PLAYLIST_RESPONSE, MOCK_TRACK
+
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.track_registry import TrackRegistry
+from analyse_spotify_playlist.utils import clean_raw_playlist_data
+
+TOTAL_PLAYLISTS = 200
+PLAYLIST_SIZE = 100
+TOTAL_SONGS = 1_000
+
+
+def make_pages() -> list[dict]:
+    """Return the first page of tracks for each playlist."""
+    rng = random.Random(TOTAL_PLAYLISTS)
+    pages = []
+    for _ in range(TOTAL_PLAYLISTS):
+        items = []
+        for i in rng.sample(range(TOTAL_SONGS), PLAYLIST_SIZE):
+            track = deepcopy(MOCK_TRACK)
+            track["id"] = f"id{i}"
+            track["name"] = f"Track {i}"
+            items.append({"track": track})
+        pages.append({"items": items, "total": PLAYLIST_SIZE, "next": None})
+    return pages
+
+
+def build(pages: list[dict], registry: TrackRegistry | None) -> tuple[int, int]:
+    """Return the bytes held by the playlists, and the features to request."""
+    gc.collect()
+    tracemalloc.start()
+    playlists = []
+    features_requested = 0
+    for page in pages:
+        raw = {**MOCK_PLAYLIST_RESPONSE, "tracks": page}
+        playlist = Playlist(**clean_raw_playlist_data(raw), registry=registry)
+        playlists.append(playlist)
+        track_ids = playlist.get_all_track_ids()
+        if registry is not None:
+            track_ids, _ = registry.claim_features(track_ids)
+            registry.release_features(track_ids)
+        features_requested += len(track_ids)
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, features_requested
+
+
+if __name__ == "__main__":
+    pages = make_pages()
+    print(
+        f"{TOTAL_PLAYLISTS} playlists of {PLAYLIST_SIZE} tracks, "
+        f"from {TOTAL_SONGS} songs"
+    )
+    print(f"{'':>10} {'Held (KiB)':>11} {'Features requested':>19}")
+    for name, registry in [("Separate", None), ("Shared", TrackRegistry())]:
+        held, requested = build(pages, registry)
+        print(f"{name:>10} {held / 1024:>11.1f} {requested:>19}")
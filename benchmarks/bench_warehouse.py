@@ -0,0 +1,65 @@
+"""Benchmark storing tracks in the SQLite warehouse.
+
+Compares inserting one row per transaction with the bulk upsert the
+warehouse uses, which inserts every row in one transaction. The bulk
+upsert stores 1M track rows, generated as they are inserted. The row per
+transaction version only stores 20k rows, as it is far slower.
+
+Run with: python -m benchmarks.bench_warehouse
+"""
+
+import os
+import tempfile
+from time import perf_counter
+from typing import Iterator
+
+from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.warehouse import UPSERT_TRACK, Warehouse, track_row
+
+BULK_ROWS = 1_000_000
+ROW_BY_ROW_ROWS = 20_000
+
+
+def generate_tracks(total: int) -> Iterator[Track]:
+    """Yield tracks one at a time, so they are never all held at once."""
+    for i in range(total):
+        yield Track(
+            album={"album_type": "album", "release_date": f"{1960 + i % 60}-01-01"},
+            artists=[{"name": f"Artist {i % 5000}"}],
+            id=f"id{i}",
+            name=f"Track {i}",
+            duration_ms=60000 + i % 340000,
+            explicit=i % 3 == 0,
+            popularity=i % 101,
+        )
+
+
+def row_by_row(warehouse: Warehouse, total: int) -> None:
+    connection = warehouse._connection
+    for track in generate_tracks(total):
+        with connection:
+            connection.execute(UPSERT_TRACK, track_row(track))
+
+
+def bulk(warehouse: Warehouse, total: int) -> None:
+    warehouse.put_tracks(generate_tracks(total))
+
+
+def timed(func, total: int) -> float:
+    """Return the rows stored per second by func, in a new database."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        warehouse = Warehouse(os.path.join(temp_dir, "warehouse.sqlite3"))
+        start = perf_counter()
+        func(warehouse, total)
+        elapsed = perf_counter() - start
+        assert warehouse.count("tracks") == total
+        warehouse.close()
+    print(f"{func.__name__:>11} {total:>9} rows {elapsed:>8.2f}s", end="")
+    print(f" {total / elapsed:>10.0f} rows/s")
+    return total / elapsed
+
+
+if __name__ == "__main__":
+    slow = timed(row_by_row, ROW_BY_ROW_ROWS)
+    fast = timed(bulk, BULK_ROWS)
+    print(f"Bulk upsert is {fast / slow:.1f}x faster per row")
@@ -2067,3 +2067,108 @@ MOCK_PLAYLIST_RESPONSE = {
     "uri": "spotify:playlist:3cEYpjA9oz9GiPac4AsH4n",
     "primary_color": None,
 }
+
+MOCK_AUDIO_FEATURES_RESPONSE = {
+    "audio_features": [
+        {
+            "acousticness": 0.011,
+            "analysis_url": "https://api.spotify.com/v1/audio-analysis/4rzfv0JLZfVhOhbSQ8o5jZ",
+            "danceability": 0.696,
+            "duration_ms": 207960,
+            "energy": 0.905,
+            "id": "4rzfv0JLZfVhOhbSQ8o5jZ",
+            "instrumentalness": 0.000905,
+            "key": 2,
+            "liveness": 0.302,
+            "loudness": -2.743,
+            "mode": 1,
+            "speechiness": 0.103,
+            "tempo": 114.944,
+            "time_signature": 4,
+            "track_href": "https://api.spotify.com/v1/tracks/4rzfv0JLZfVhOhbSQ8o5jZ",
+            "type": "audio_features",
+            "uri": "spotify:track:4rzfv0JLZfVhOhbSQ8o5jZ",
+            "valence": 0.625,
+        },
+        {
+            "acousticness": 0.0379,
+            "analysis_url": "https://api.spotify.com/v1/audio-analysis/5o3jMYOSbaVz3tkgwhELSV",
+            "danceability": 0.504,
+            "duration_ms": 182206,
+            "energy": 0.818,
+            "id": "5o3jMYOSbaVz3tkgwhELSV",
+            "instrumentalness": 0.612,
+            "key": 9,
+            "liveness": 0.118,
+            "loudness": -6.202,
+            "mode": 0,
+            "speechiness": 0.0431,
+            "tempo": 136.009,
+            "time_signature": 4,
+            "track_href": "https://api.spotify.com/v1/tracks/5o3jMYOSbaVz3tkgwhELSV",
+            "type": "audio_features",
+            "uri": "spotify:track:5o3jMYOSbaVz3tkgwhELSV",
+            "valence": 0.392,
+        },
+        {
+            "acousticness": 0.821,
+            "analysis_url": "https://api.spotify.com/v1/audio-analysis/4Cy0NHJ8Gh0xMdwyM9RkQm",
+            "danceability": 0.389,
+            "duration_ms": 207026,
+            "energy": 0.232,
+            "id": "4Cy0NHJ8Gh0xMdwyM9RkQm",
+            "instrumentalness": 0.00168,
+            "key": 7,
+            "liveness": 0.0982,
+            "loudness": -12.151,
+            "mode": 1,
+            "speechiness": 0.0334,
+            "tempo": 76.481,
+            "time_signature": 3,
+            "track_href": "https://api.spotify.com/v1/tracks/4Cy0NHJ8Gh0xMdwyM9RkQm",
+            "type": "audio_features",
+            "uri": "spotify:track:4Cy0NHJ8Gh0xMdwyM9RkQm",
+            "valence": 0.165,
+        },
+        {
+            "acousticness": 0.000267,
+            "analysis_url": "https://api.spotify.com/v1/audio-analysis/6hvFrZNocdt2FcKGCSY5NI",
+            "danceability": 0.583,
+            "duration_ms": 259162,
+            "energy": 0.953,
+            "id": "6hvFrZNocdt2FcKGCSY5NI",
+            "instrumentalness": 0.875,
+            "key": 11,
+            "liveness": 0.346,
+            "loudness": -4.587,
+            "mode": 0,
+            "speechiness": 0.0683,
+            "tempo": 174.017,
+            "time_signature": 4,
+            "track_href": "https://api.spotify.com/v1/tracks/6hvFrZNocdt2FcKGCSY5NI",
+            "type": "audio_features",
+            "uri": "spotify:track:6hvFrZNocdt2FcKGCSY5NI",
+            "valence": 0.286,
+        },
+        {
+            "acousticness": 0.727,
+            "analysis_url": "https://api.spotify.com/v1/audio-analysis/2E2znCPaS8anQe21GLxcvJ",
+            "danceability": 0.402,
+            "duration_ms": 163813,
+            "energy": 0.187,
+            "id": "2E2znCPaS8anQe21GLxcvJ",
+            "instrumentalness": 0.0,
+            "key": 0,
+            "liveness": 0.0877,
+            "loudness": -10.322,
+            "mode": 1,
+            "speechiness": 0.782,
+            "tempo": 95.233,
+            "time_signature": 4,
+            "track_href": "https://api.spotify.com/v1/tracks/2E2znCPaS8anQe21GLxcvJ",
+            "type": "audio_features",
+            "uri": "spotify:track:2E2znCPaS8anQe21GLxcvJ",
+            "valence": 0.524,
+        },
+    ]
+}
@@ -0,0 +1,123 @@
+"""Local stub of the Spotify API for tests."""
+
+import json
+import threading
+import unittest
+import unittest.mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analyse_spotify_playlist.file_output import FileOutput
+from analyse_spotify_playlist.http_client import set_client
+from analyse_spotify_playlist.token_provider import TokenProvider, set_token_provider
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serve the canned responses registered on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.requests_seen.append(self.path)
+        self.send_json(*self.server.route(self.path))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.requests_seen.append(self.path)
+        self.send_json(*self.server.route(self.path))
+
+    def send_json(self, status: int, body, headers: dict | None = None) -> None:
+        payload = b"" if status == 304 else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        return
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server, running in the background on a free port."""
+
+    daemon_threads = True
+
+    def __init__(self, routes=None) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.routes = routes if routes is not None else {}
+        self.requests_seen = []
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def route(self, path: str) -> tuple:
+        """Find the response for a path. Routes can be a dict or a callable.
+
+        A callable returns (status, body) or (status, body, headers)."""
+        if callable(self.routes):
+            return self.routes(path)
+        if path in self.routes:
+            return 200, self.routes[path]
+        return 404, {"error": {"status": 404, "message": "Not found"}}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def stub_spotify(test: unittest.TestCase, routes=None) -> StubServer:
+    """Start a stub server in place of Spotify, for the length of the test.
+
+    Requests, sync and async, are sent to it, the caches on disk are
+    disabled, and a new token provider and client are used. Everything is
+    undone once the test ends."""
+    server = StubServer(routes).__enter__()
+    test.addCleanup(server.__exit__)
+    token_url = f"{server.url}token"
+    patches = [
+        unittest.mock.patch(f"analyse_spotify_playlist.{module}.{name}", url)
+        for module in ["outbound_requests", "async_outbound_requests"]
+        for name, url in [
+            ("SPOTIFY_API_URL", server.url),
+            ("SPOTIFY_ACCOUNTS_URL", token_url),
+        ]
+    ]
+    patches += [
+        unittest.mock.patch(
+            "analyse_spotify_playlist.response_archive.SPOTIFY_ACCOUNTS_URL",
+            token_url,
+        ),
+        unittest.mock.patch(
+            "analyse_spotify_playlist.feature_cache.FEATURE_CACHE_PATH", None
+        ),
+        unittest.mock.patch(
+            "analyse_spotify_playlist.playlist_cache.PLAYLIST_CACHE_PATH", None
+        ),
+    ]
+    for patch in patches:
+        patch.start()
+        test.addCleanup(patch.stop)
+    set_token_provider(TokenProvider(cache_path=None))
+    test.addCleanup(set_token_provider, None)
+    set_client(None)
+    test.addCleanup(set_client, None)
+    return server
+
+
+def reset_file_output() -> None:
+    """Restore the output settings shared by every FileOutput."""
+    FileOutput.path = None
+    FileOutput.write_to_file = False
+    FileOutput.output_format = "text"
+    FileOutput.export_format = None
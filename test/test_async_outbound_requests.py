@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+import unittest.mock
+from copy import deepcopy
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE, MOCK_PLAYLIST_RESPONSE
+from test.stub_server import stub_spotify
+from test.test_outbound_requests import mock_playlist, mock_track_page
+from urllib.parse import parse_qs, urlparse
+
+from analyse_spotify_playlist.analyse import analyse_playlists_async
+from analyse_spotify_playlist.async_outbound_requests import (
+    create_session,
+    pull_playlist_data_async,
+    pull_remaining_tracks_async,
+    pull_tracks_audio_features_async,
+    request_access_token_async,
+)
+from analyse_spotify_playlist.feature_cache import FeatureCache, set_feature_cache
+from analyse_spotify_playlist.playlist_cache import PlaylistCache, set_playlist_cache
+
+TOTAL_TRACKS = 420
+MOCK_TOKEN = {"access_token": "test_token", "token_type": "Bearer", "expires_in": 3600}
+
+
+def stub_routes(path: str) -> tuple:
+    url = urlparse(path)
+    query = parse_qs(url.query)
+    if url.path == "/token":
+        return 200, MOCK_TOKEN
+    if url.path == f"/playlists/{MOCK_PLAYLIST_RESPONSE['id']}":
+        return 200, MOCK_PLAYLIST_RESPONSE
+    if url.path.endswith("/tracks"):
+        offset = int(query["offset"][0])
+        limit = int(query["limit"][0])
+        return 200, mock_track_page(offset, limit, TOTAL_TRACKS)
+    if url.path == "/audio-features":
+        features = {x["id"]: x for x in MOCK_AUDIO_FEATURES_RESPONSE["audio_features"]}
+        ids = query["ids"][0].split(",")
+        return 200, {
+            "audio_features": [features.get(x, {"id": x}) for x in ids],
+        }
+    return 404, {"error": {"status": 404, "message": "Not found"}}
+
+
+class TestAsyncOutbound(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = stub_spotify(self, stub_routes)
+        set_feature_cache(FeatureCache(":memory:"))
+        self.addCleanup(set_feature_cache, None)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        set_playlist_cache(PlaylistCache(temp_dir.name))
+        self.addCleanup(set_playlist_cache, None)
+
+    async def test_request_access_token_async(self):
+        async with create_session() as session:
+            res = await request_access_token_async(session)
+        self.assertDictEqual(res, MOCK_TOKEN)
+
+    async def test_pull_playlist_data_async(self):
+        async with create_session() as session:
+            res = await pull_playlist_data_async(
+                session, "token", MOCK_PLAYLIST_RESPONSE["id"]
+            )
+        self.assertEqual(res["id"], MOCK_PLAYLIST_RESPONSE["id"])
+
+    async def test_pull_remaining_tracks_async_keeps_order(self):
+        playlist = mock_playlist(total=TOTAL_TRACKS)
+        async with create_session() as session:
+            await pull_remaining_tracks_async(session, "token", playlist)
+        self.assertListEqual(
+            playlist.get_all_track_ids(), [f"id{i}" for i in range(TOTAL_TRACKS)]
+        )
+        self.assertEqual(len(self.server.requests_seen), 4)
+
+    async def test_pull_tracks_audio_features_async_keeps_order(self):
+        ids = [f"id{i}" for i in range(250)]
+        async with create_session() as session:
+            res = await pull_tracks_audio_features_async(session, "token", ids)
+        self.assertListEqual([x["id"] for x in res], ids)
+        self.assertEqual(len(self.server.requests_seen), 3)
+
+    async def test_analyse_playlists_async(self):
+        playlist_ids = [MOCK_PLAYLIST_RESPONSE["id"]] * 3
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.analyse.output_analysis"
+        ) as mock_output:
+            await analyse_playlists_async(playlist_ids, 2)
+        self.assertEqual(mock_output.call_count, 3)
+        playlist = mock_output.call_args[0][0]
+        self.assertEqual(len(playlist.get_all_track_ids()), 5)
+        self.assertEqual(playlist.get_track("4rzfv0JLZfVhOhbSQ8o5jZ")._key, "D")
+        self.assertEqual(self.server.requests_seen.count("/token"), 1)
+
+    async def test_analyse_playlists_async_uses_feature_cache(self):
+        playlist_ids = [MOCK_PLAYLIST_RESPONSE["id"]]
+        with unittest.mock.patch("analyse_spotify_playlist.analyse.output_analysis"):
+            await analyse_playlists_async(playlist_ids, 0)
+            await analyse_playlists_async(playlist_ids, 0)
+        feature_requests = [
+            x for x in self.server.requests_seen if x.startswith("/audio-features")
+        ]
+        self.assertEqual(len(feature_requests), 1)
+
+    async def test_analyse_playlists_async_uses_playlist_cache(self):
+        playlist_ids = [MOCK_PLAYLIST_RESPONSE["id"]]
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.analyse.output_analysis"
+        ) as mock_output:
+            await analyse_playlists_async(playlist_ids, 0)
+            self.server.requests_seen.clear()
+            await analyse_playlists_async(playlist_ids, 0)
+        playlist_requests = [
+            x for x in self.server.requests_seen if x.startswith("/playlists")
+        ]
+        self.assertEqual(len(playlist_requests), 1)
+        self.assertIn("fields=", playlist_requests[0])
+        playlist = mock_output.call_args[0][0]
+        self.assertEqual(len(playlist.get_all_track_ids()), 5)
@@ -0,0 +1,97 @@
+import io
+import multiprocessing
+import tempfile
+import unittest
+import unittest.mock
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.stub_server import reset_file_output, stub_spotify
+from test.test_async_outbound_requests import stub_routes
+
+from analyse_spotify_playlist.batch import (
+    init_process_worker,
+    read_playlist_ids,
+    run_batch,
+    write_failure_summary,
+)
+from analyse_spotify_playlist.file_output import FileOutput
+from analyse_spotify_playlist.logger import Log
+from analyse_spotify_playlist.request_scheduler import set_scheduler
+from analyse_spotify_playlist.token_provider import get_token_provider
+from analyse_spotify_playlist.track_registry import set_track_registry
+
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+REPORT_FILE = "Spotify_Web_API_Testing_playlist_analysis.txt"
+
+
+class TestReadPlaylistIds(unittest.TestCase):
+
+    def test_read_playlist_ids(self):
+        source = io.StringIO("# playlists\nabc\n\n def ,ghi\nabc\n")
+        self.assertListEqual(read_playlist_ids(source), ["abc", "def", "ghi"])
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def setUp(self):
+        # Worker processes reopen the caches, which the stub disables outright.
+        self.server = stub_spotify(self, stub_routes)
+        self.token_provider = get_token_provider()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        FileOutput().set_output_path(self.temp_dir.name)
+        FileOutput().set_write_to_file_flag(True)
+        self.addCleanup(reset_file_output)
+
+    def report_files(self) -> list[str]:
+        return sorted(path.name for path in Path(self.temp_dir.name).iterdir())
+
+    def test_threads_share_one_token(self):
+        failures = run_batch([PLAYLIST_ID, "missing"], depth=1, workers=2)
+        self.assertListEqual(list(failures), ["missing"])
+        self.assertIn("HTTPError", failures["missing"])
+        self.assertEqual(self.token_provider.tokens_requested, 1)
+        self.assertListEqual(self.report_files(), [REPORT_FILE])
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "fork is not available"
+    )
+    def test_processes(self):
+        # The workers are forked, whatever the default start method, so they
+        # inherit the stub server's URLs and the disabled caches.
+        forked_pool = partial(
+            ProcessPoolExecutor, mp_context=multiprocessing.get_context("fork")
+        )
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.batch.ProcessPoolExecutor", forked_pool
+        ):
+            failures = run_batch(
+                [PLAYLIST_ID, "missing"], depth=0, workers=2, use_processes=True
+            )
+        self.assertListEqual(list(failures), ["missing"])
+        self.assertListEqual(self.report_files(), [REPORT_FILE])
+        tokens = [x for x in self.server.requests_seen if x.endswith("token")]
+        self.assertEqual(len(tokens), 1)
+
+    def test_process_worker_uses_parent_token(self):
+        self.addCleanup(set_track_registry, None)
+        self.addCleanup(set_scheduler, None)
+        self.addCleanup(setattr, Log, "log_messages", Log.log_messages)
+        token = {"access_token": "parent", "token_type": "Bearer", "expires_in": 3600}
+        init_process_worker(
+            2, False, True, FileOutput.path, "text", None, None, token, None
+        )
+        self.assertIsNot(get_token_provider(), self.token_provider)
+        self.assertEqual(get_token_provider().get_token(), "parent")
+        self.assertEqual(get_token_provider().tokens_requested, 0)
+
+    def test_write_failure_summary(self):
+        with unittest.mock.patch("builtins.print") as mock_print:
+            write_failure_summary(3, {"missing": "HTTPError: 404"})
+        mock_print.assert_any_call("Analysed 2 of 3 playlists.")
+        failures = Path(self.temp_dir.name, "batch_failures.txt")
+        self.assertEqual(
+            failures.read_text(encoding="utf-8"), "missing\tHTTPError: 404\n"
+        )
@@ -0,0 +1,51 @@
+import unittest
+import unittest.mock
+from itertools import count
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE
+
+from analyse_spotify_playlist.feature_cache import FeatureCache, merge_audio_features
+
+
+class TestFeatureCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = FeatureCache(":memory:")
+        self.addCleanup(self.cache.close)
+        self.features = MOCK_AUDIO_FEATURES_RESPONSE["audio_features"]
+
+    def test_put_and_get_many(self):
+        self.cache.put_many(self.features + [None])
+        ids = [x["id"] for x in self.features]
+        found = self.cache.get_many(ids + ["missing"])
+        self.assertEqual(len(found), len(ids))
+        self.assertDictEqual(found[ids[0]], self.features[0])
+        self.assertEqual(self.cache.hits, 5)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertAlmostEqual(self.cache.hit_ratio(), 5 / 6)
+
+    def test_get_many_over_variable_limit(self):
+        features = [{"id": f"id{i}"} for i in range(1200)]
+        self.cache.put_many(features)
+        found = self.cache.get_many([x["id"] for x in features])
+        self.assertEqual(len(found), 1200)
+
+    @unittest.mock.patch("analyse_spotify_playlist.feature_cache.time")
+    def test_evicts_least_recently_used(self, mock_time: unittest.mock.MagicMock):
+        mock_time.side_effect = count()
+        cache = FeatureCache(":memory:", max_entries=3)
+        cache.put_many([{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        cache.get_many(["a"])
+        cache.put_many([{"id": "d"}])
+        self.assertEqual(len(cache), 3)
+        self.assertListEqual(
+            sorted(cache.get_many(["a", "b", "c", "d"])), ["a", "c", "d"]
+        )
+        cache.close()
+
+    def test_merge_audio_features(self):
+        merged = merge_audio_features(
+            ["a", "b", "c", "d"],
+            {"b": {"id": "b"}},
+            [{"id": "a"}, None, {"id": "c"}],
+        )
+        self.assertListEqual(merged, [{"id": "a"}, {"id": "b"}, {"id": "c"}, None])
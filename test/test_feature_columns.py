@@ -0,0 +1,65 @@
+import random
+import unittest
+from copy import deepcopy
+from test.mock_data import MOCK_TRACK
+
+from analyse_spotify_playlist.feature_columns import FeatureColumns
+from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.utils import (
+    find_average_audio_features,
+    find_min_max_audio_features,
+)
+
+
+def mock_tracks(total: int, seed: int = 1) -> dict[str, Track]:
+    rng = random.Random(seed)
+    tracks = {}
+    for i in range(total):
+        raw = deepcopy(MOCK_TRACK)
+        raw["id"] = f"id{i}"
+        raw["popularity"] = rng.randint(0, 10)
+        raw["duration_ms"] = rng.randint(60000, 400000)
+        track = Track(**raw)
+        if rng.random() > 0.1:
+            track.populate_audio_features(
+                acousticness=round(rng.random(), 3),
+                danceability=round(rng.random(), 3),
+                energy=round(rng.random(), 3),
+                instrumentalness=round(rng.random(), 3),
+                key=rng.randint(0, 11),
+                liveness=round(rng.random(), 3),
+                loudness=round(-rng.random() * 20, 3),
+                mode=rng.randint(0, 1),
+                speechiness=round(rng.random(), 3),
+                tempo=round(60 + rng.random() * 120, 3),
+                time_signature=rng.randint(3, 5),
+                valence=round(rng.random(), 3),
+            )
+        tracks[track._id] = track
+    return tracks
+
+
+class TestFeatureColumns(unittest.TestCase):
+
+    def test_matches_loop_implementation(self):
+        for seed in range(5):
+            tracks = mock_tracks(500, seed)
+            columns = FeatureColumns(tracks)
+            self.assertDictEqual(columns.min_max(), find_min_max_audio_features(tracks))
+            self.assertDictEqual(columns.average(), find_average_audio_features(tracks))
+
+    def test_original_value_types(self):
+        columns = FeatureColumns(mock_tracks(50))
+        min_max = columns.min_max()
+        self.assertIsInstance(min_max["time_signature"][0][1], int)
+        self.assertIsInstance(min_max["popularity"][1][1], int)
+        self.assertIsInstance(columns.average()["duration_ms"], int)
+        self.assertIsInstance(columns.average()["tempo"], float)
+
+    def test_key_without_values(self):
+        tracks = {"id0": Track(**deepcopy(MOCK_TRACK))}
+        columns = FeatureColumns(tracks)
+        self.assertListEqual(
+            columns.min_max()["tempo"], [[None, float("inf")], [None, float("-inf")]]
+        )
+        self.assertEqual(columns.average()["tempo"], 0.0)
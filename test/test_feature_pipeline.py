@@ -0,0 +1,81 @@
+import threading
+import unittest
+from copy import deepcopy
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE
+from test.stub_server import stub_spotify
+from test.test_outbound_requests import mock_playlist, mock_track_page
+from urllib.parse import parse_qs, urlparse
+
+from analyse_spotify_playlist.feature_cache import FeatureCache, set_feature_cache
+from analyse_spotify_playlist.feature_pipeline import FeaturePipeline
+from analyse_spotify_playlist.outbound_requests import pull_remaining_tracks_parallel
+
+TOTAL_TRACKS = 420
+LAST_PAGE = "/playlists/3cEYpjA9oz9GiPac4AsH4n/tracks?offset=400&limit=100"
+
+
+def mock_features(track_id: str) -> dict:
+    features = deepcopy(MOCK_AUDIO_FEATURES_RESPONSE["audio_features"][0])
+    features["id"] = track_id
+    return features
+
+
+class TestFeaturePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.features_requested = threading.Event()
+        self.overlapped = False
+        self.server = stub_spotify(self, self.routes)
+        self.feature_cache = FeatureCache(":memory:")
+        set_feature_cache(self.feature_cache)
+        self.addCleanup(set_feature_cache, None)
+
+    def routes(self, path: str) -> tuple:
+        url = urlparse(path)
+        query = parse_qs(url.query)
+        if url.path == "/audio-features":
+            self.features_requested.set()
+            ids = query["ids"][0].split(",")
+            return 200, {"audio_features": [mock_features(x) for x in ids]}
+        if path == LAST_PAGE:
+            # Hold the last page until a batch of features has been requested.
+            self.overlapped = self.features_requested.wait(timeout=5)
+        offset = int(query["offset"][0])
+        limit = int(query["limit"][0])
+        return 200, mock_track_page(offset, limit, TOTAL_TRACKS)
+
+    def populate(self, playlist, cleaned_feature_list):
+        playlist.add_audio_features(cleaned_feature_list)
+
+    def run_pipeline(self):
+        playlist = mock_playlist(total=TOTAL_TRACKS)
+        with FeaturePipeline("token", self.populate) as pipeline:
+            pipeline.add_tracks(playlist, playlist.get_all_track_ids())
+            pull_remaining_tracks_parallel(
+                "token", playlist, keep_pages=False, on_tracks=pipeline.add_tracks
+            )
+            pipeline.finish()
+        return playlist, pipeline
+
+    def test_features_requested_while_paging(self):
+        playlist, pipeline = self.run_pipeline()
+        self.assertTrue(self.overlapped)
+        self.assertEqual(pipeline.requested, TOTAL_TRACKS)
+        feature_requests = [
+            x for x in self.server.requests_seen if x.startswith("/audio-features")
+        ]
+        self.assertEqual(len(feature_requests), 5)
+        for track in playlist.tracks.values():
+            self.assertEqual(track._key, "D")
+
+    def test_cached_features_are_not_requested(self):
+        self.feature_cache.put_many([mock_features(f"id{i}") for i in range(150)])
+        playlist, pipeline = self.run_pipeline()
+        self.assertEqual(pipeline.cached, 150)
+        self.assertEqual(pipeline.requested, TOTAL_TRACKS - 150)
+        feature_requests = [
+            x for x in self.server.requests_seen if x.startswith("/audio-features")
+        ]
+        self.assertEqual(len(feature_requests), 3)
+        for track in playlist.tracks.values():
+            self.assertEqual(track._key, "D")
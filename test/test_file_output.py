@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+from test.stub_server import reset_file_output
+
+from analyse_spotify_playlist.file_output import FileOutput, ReportWriter
+from analyse_spotify_playlist.logger import Log
+
+
+class TestReportWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.file_handler = FileOutput()
+        self.file_handler.set_output_path(self.temp_dir.name)
+        self.file_handler.set_write_to_file_flag(True)
+        self.file_handler.set_file_name("Test Playlist")
+        self.addCleanup(reset_file_output)
+        self.addCleanup(Log().set_logger, False)
+
+    def test_sections_written_to_one_open_file(self):
+        with unittest.mock.patch.object(
+            FileOutput, "open_file", wraps=self.file_handler.open_file
+        ) as open_file:
+            with ReportWriter(self.file_handler) as report:
+                report.write("header\n")
+                report.write("body")
+                report.write("footer")
+        self.assertEqual(open_file.call_count, 1)
+        path = Path(self.temp_dir.name, "Test_Playlist_analysis.txt")
+        self.assertEqual(path.read_text(encoding="utf-8"), "header\nbodyfooter")
+        self.assertIsNone(report.file)
+
+    def test_file_replaced_for_each_report(self):
+        for body in ["first report", "second"]:
+            with ReportWriter(self.file_handler) as report:
+                report.write(body)
+        path = Path(self.temp_dir.name, "Test_Playlist_analysis.txt")
+        self.assertEqual(path.read_text(encoding="utf-8"), "second")
+
+    def test_terminal_and_file_get_same_sections(self):
+        Log.log_messages = True
+        with unittest.mock.patch("builtins.print") as mock_print:
+            with ReportWriter(self.file_handler) as report:
+                report.write("section one")
+                report.write("section two")
+        mock_print.assert_has_calls(
+            [unittest.mock.call("section one"), unittest.mock.call("section two")]
+        )
+        path = Path(self.temp_dir.name, "Test_Playlist_analysis.txt")
+        self.assertEqual(path.read_text(encoding="utf-8"), "section onesection two")
+
+    def test_no_file_when_disabled(self):
+        FileOutput.write_to_file = False
+        with ReportWriter(self.file_handler) as report:
+            report.write("section")
+        self.assertIsNone(report.file)
+        self.assertListEqual(list(Path(self.temp_dir.name).iterdir()), [])
@@ -0,0 +1,25 @@
+import unittest
+from test.stub_server import StubServer
+
+from analyse_spotify_playlist.http_client import HttpClient
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def test_connections_are_reused(self):
+        with StubServer({"/ping": {"ok": True}}) as server:
+            client = HttpClient(pool_connections=1, pool_maxsize=1)
+            for _ in range(5):
+                res = client.get(f"{server.url}ping")
+                self.assertEqual(res.json(), {"ok": True})
+            self.assertEqual(client.requests_sent, 5)
+            self.assertEqual(client.connections_opened(), 1)
+            client.close()
+
+    def test_post(self):
+        with StubServer({"/token": {"access_token": "abc"}}) as server:
+            client = HttpClient()
+            res = client.post(f"{server.url}token", {"grant_type": "test"})
+            self.assertEqual(res.json(), {"access_token": "abc"})
+            self.assertEqual(server.requests_seen, ["/token"])
+            client.close()
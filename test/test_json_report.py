@@ -0,0 +1,91 @@
+import json
+import tempfile
+import unittest
+from copy import deepcopy
+from pathlib import Path
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE, MOCK_PLAYLIST_RESPONSE
+from test.stub_server import reset_file_output
+
+from analyse_spotify_playlist.file_output import FileOutput, start_ndjson_output
+from analyse_spotify_playlist.json_report import encode_analysis, output_json
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.utils import (
+    clean_raw_playlist_data,
+    clean_up_track_features,
+)
+
+
+def mock_analysed_playlist() -> Playlist:
+    playlist = Playlist(**clean_raw_playlist_data(deepcopy(MOCK_PLAYLIST_RESPONSE)))
+    playlist.add_audio_features(
+        list(
+            map(clean_up_track_features, MOCK_AUDIO_FEATURES_RESPONSE["audio_features"])
+        )
+    )
+    playlist.analyse_tracks_audio_feature()
+    playlist.oldest_and_newest()
+    return playlist
+
+
+class TestJsonReport(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.file_handler = FileOutput()
+        self.file_handler.set_output_path(self.temp_dir.name)
+        self.file_handler.set_write_to_file_flag(True)
+        self.addCleanup(reset_file_output)
+
+    def test_encode_analysis(self):
+        playlist = mock_analysed_playlist()
+        analysis = json.loads("".join(encode_analysis(playlist)))
+        self.assertEqual(analysis["id"], playlist.id)
+        self.assertEqual(analysis["playable_tracks"], 5)
+        self.assertEqual(analysis["oldest_track"]["id"], playlist.oldest_track._id)
+        self.assertDictEqual(analysis["breakdowns"]["mode"], {"Minor": 2, "Major": 3})
+        self.assertDictEqual(
+            analysis["most_common"]["time_signature"], {"value": 4, "count": 4}
+        )
+        self.assertListEqual(
+            [track["id"] for track in analysis["most_popular"]],
+            [track._id for track in playlist.get_most_popular_list()],
+        )
+        tempo = analysis["audio_features"]["tempo"]
+        min_id, min_value = playlist.min_max_analysis["tempo"][0]
+        self.assertDictEqual(tempo["min"], {"id": min_id, "value": min_value})
+        self.assertEqual(tempo["average"], playlist.average_analysis["tempo"])
+
+    def test_features_without_values_are_null(self):
+        playlist = Playlist(**clean_raw_playlist_data(deepcopy(MOCK_PLAYLIST_RESPONSE)))
+        playlist.analyse_tracks_audio_feature()
+        playlist.oldest_and_newest()
+        analysis = json.loads("".join(encode_analysis(playlist)))
+        self.assertIsNone(analysis["audio_features"]["tempo"]["min"])
+        self.assertIsNone(analysis["audio_features"]["tempo"]["max"])
+
+    def test_output_json_file_per_playlist(self):
+        self.file_handler.set_output_format("json")
+        playlist = mock_analysed_playlist()
+        self.file_handler.set_file_name(playlist.name)
+        output_json(playlist, self.file_handler)
+        path = Path(self.temp_dir.name, f"{self.file_handler.file_name}.json")
+        self.assertEqual(
+            json.loads(path.read_text(encoding="utf-8"))["id"], playlist.id
+        )
+
+    def test_output_ndjson_line_per_playlist(self):
+        self.file_handler.set_output_format("ndjson")
+        path = Path(self.temp_dir.name, "analysis.ndjson")
+        path.write_text("line from the previous run\n", encoding="utf-8")
+        start_ndjson_output()
+        playlist = mock_analysed_playlist()
+        output_json(playlist, self.file_handler)
+        output_json(playlist, self.file_handler)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1])["name"], playlist.name)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.file_handler.set_output_format("xml")
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+import unittest
+
+# Prints the heavy modules loaded once the command line has exited.
+CHECK_IMPORTS = """
+import runpy, sys
+sys.argv = ["analyse_spotify_playlist", *sys.argv[1:]]
+try:
+    runpy.run_module("analyse_spotify_playlist", run_name="__main__")
+except SystemExit:
+    pass
+heavy = ["requests", "aiohttp", "numpy", "pyarrow", "analyse_spotify_playlist.analyse"]
+print(",".join(x for x in heavy if x in sys.modules), file=sys.stderr)
+"""
+
+
+def loaded_modules(*args: str) -> list[str]:
+    result = subprocess.run(
+        [sys.executable, "-c", CHECK_IMPORTS, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [x for x in result.stderr.splitlines()[-1].split(",") if x]
+
+
+class TestMain(unittest.TestCase):
+
+    def test_help_does_not_load_analysis(self):
+        self.assertListEqual(loaded_modules("--help"), [])
+
+    def test_usage_error_does_not_load_analysis(self):
+        self.assertListEqual(loaded_modules("--async", "--incremental", "id"), [])
+        self.assertListEqual(loaded_modules("-e", "csv", "id"), [])
+        self.assertListEqual(loaded_modules("--metrics-output", "x", "id"), [])
+        self.assertListEqual(loaded_modules("--serve", "0", "--replay", "x"), [])
+        self.assertListEqual(loaded_modules("--serve", "0", "-f", "json"), [])
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+import unittest
+import unittest.mock
+from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.stub_server import stub_spotify
+from test.test_async_outbound_requests import stub_routes
+
+from analyse_spotify_playlist.analyse import analyse_playlists
+from analyse_spotify_playlist.metrics import (
+    MetricsRegistry,
+    get_metrics,
+    set_metrics,
+    timer,
+)
+from analyse_spotify_playlist.utils import performance_timer
+
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+
+
+@performance_timer("stage")
+def timed_function(value):
+    """Return the value."""
+    if value is None:
+        raise ValueError("no value")
+    return value
+
+
+@performance_timer("async_stage")
+async def timed_coroutine(value):
+    return value
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = MetricsRegistry(buckets=[0.1, 1], max_samples=100)
+        for seconds in [0.05, 0.1, 0.5, 2]:
+            self.metrics.observe("page", seconds)
+        self.metrics.increment("requests_sent", 3)
+        self.metrics.increment("requests_sent")
+
+    def test_summary(self):
+        summary = self.metrics.summary()
+        page = summary["timers"]["page"]
+        self.assertEqual(page["count"], 4)
+        self.assertAlmostEqual(page["total"], 2.65)
+        self.assertEqual(page["p50"], 0.1)
+        self.assertEqual(page["p95"], 2)
+        self.assertDictEqual(summary["counters"], {"requests_sent": 4})
+        self.assertDictEqual(json.loads(self.metrics.export("json")), summary)
+
+    def test_percentiles_of_latest_samples(self):
+        metrics = MetricsRegistry(max_samples=2)
+        for seconds in [5, 1, 2]:
+            metrics.observe("page", seconds)
+        page = metrics.summary()["timers"]["page"]
+        self.assertEqual(page["count"], 3)
+        self.assertEqual(page["p99"], 2)
+
+    def test_prometheus(self):
+        lines = self.metrics.export("prometheus").splitlines()
+        name = "analyse_spotify_playlist_stage_seconds"
+        self.assertIn(f"# TYPE {name} histogram", lines)
+        self.assertIn(f'{name}_bucket{{stage="page",le="0.1"}} 2', lines)
+        self.assertIn(f'{name}_bucket{{stage="page",le="1"}} 3', lines)
+        self.assertIn(f'{name}_bucket{{stage="page",le="+Inf"}} 4', lines)
+        self.assertIn(f'{name}_count{{stage="page"}} 4', lines)
+        self.assertIn("analyse_spotify_playlist_requests_sent_total 4", lines)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.metrics.export("csv")
+
+
+class TestPerformanceTimer(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(set_metrics, None)
+
+    def test_keeps_function_identity(self):
+        self.assertEqual(timed_function.__name__, "timed_function")
+        self.assertEqual(timed_function.__doc__, "Return the value.")
+
+    def test_disabled(self):
+        self.assertIsNone(get_metrics())
+        self.assertEqual(timed_function(1), 1)
+        with timer("block"):
+            pass
+
+    def test_records_stage(self):
+        set_metrics(MetricsRegistry())
+        timed_function(1)
+        with self.assertRaises(ValueError):
+            timed_function(None)
+        with timer("block"):
+            pass
+        timers = get_metrics().summary()["timers"]
+        self.assertEqual(timers["stage"]["count"], 2)
+        self.assertEqual(timers["block"]["count"], 1)
+
+    def test_records_coroutine(self):
+        set_metrics(MetricsRegistry())
+        self.assertEqual(asyncio.run(timed_coroutine(1)), 1)
+        self.assertEqual(get_metrics().summary()["timers"]["async_stage"]["count"], 1)
+
+
+class TestRunMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.server = stub_spotify(self, stub_routes)
+        patch = unittest.mock.patch("analyse_spotify_playlist.analyse.output_analysis")
+        patch.start()
+        self.addCleanup(patch.stop)
+        set_metrics(MetricsRegistry())
+        self.addCleanup(set_metrics, None)
+
+    def test_every_stage_timed(self):
+        analyse_playlists(PLAYLIST_ID, 0)
+        summary = get_metrics().summary()
+        for stage in ["token", "playlist_fetch", "first_page", "feature_batch"]:
+            self.assertEqual(summary["timers"][stage]["count"], 1, stage)
+        self.assertEqual(summary["timers"]["analysis"]["count"], 1)
+        self.assertEqual(summary["counters"]["requests_sent"], 3)
+        self.assertEqual(summary["counters"]["playlists_analysed"], 1)
+        self.assertEqual(summary["counters"]["tracks_analysed"], 5)
+
+    def test_fetch_does_not_include_features(self):
+        def slow_features(token: str, track_ids: list[str]) -> list:
+            time.sleep(0.2)
+            return []
+
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.analyse.fetch_audio_features", slow_features
+        ):
+            analyse_playlists(PLAYLIST_ID, 0)
+        timers = get_metrics().summary()["timers"]
+        self.assertLess(timers["playlist_fetch"]["total"], 0.2)
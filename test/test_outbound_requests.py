@@ -1,10 +1,18 @@
 import unittest
 import unittest.mock
+from copy import deepcopy
+from test.mock_data import MOCK_PLAYLIST_RESPONSE, MOCK_TRACK
 
 from analyse_spotify_playlist.outbound_requests import (
     audio_feature_request,
+    get_playlist_fields,
+    get_remaining_page_offsets,
+    get_track_page_fields,
+    pull_remaining_tracks_parallel,
+    pull_tracks_audio_features,
     pull_tracks_audio_features_r,
 )
+from analyse_spotify_playlist.playlist import Playlist
 
 
 class MockHTTP:
@@ -21,8 +29,74 @@ class MockHTTP:
         return
 
 
+def mock_track_page(offset: int, limit: int, total: int) -> dict:
+    items = []
+    for i in range(offset, min(offset + limit, total)):
+        track = deepcopy(MOCK_TRACK)
+        track["id"] = f"id{i}"
+        items.append({"track": track})
+    next_url = None
+    if offset + limit < total:
+        next_url = f"https://test/tracks?offset={offset + limit}&limit={limit}"
+    return {"items": items, "next": next_url, "total": total}
+
+
+def mock_playlist(total: int, limit: int = 100) -> Playlist:
+    raw = deepcopy(MOCK_PLAYLIST_RESPONSE)
+    raw["tracks"] = mock_track_page(0, limit, total)
+    keys = [
+        "name",
+        "owner",
+        "collaborative",
+        "description",
+        "followers",
+        "id",
+        "public",
+        "tracks",
+    ]
+    return Playlist(**{key: raw[key] for key in keys})
+
+
 class TestOutbound(unittest.TestCase):
 
+    def test_get_track_page_fields(self):
+        self.assertEqual(
+            get_track_page_fields(0),
+            "next,total,items(track(id,name,artists(name),album(album_type,release_date),duration_ms,explicit,popularity))",
+        )
+
+    def test_get_playlist_fields(self):
+        fields = get_playlist_fields(2)
+        self.assertTrue(fields.startswith("collaborative,description,followers(total)"))
+        self.assertTrue(fields.endswith(f",tracks({get_track_page_fields(2)})"))
+
+    def test_get_remaining_page_offsets(self):
+        playlist = mock_playlist(total=350)
+        offsets, limit = get_remaining_page_offsets(playlist)
+        self.assertListEqual(offsets, [100, 200, 300])
+        self.assertEqual(limit, 100)
+
+    def test_get_remaining_page_offsets_single_page(self):
+        playlist = mock_playlist(total=50)
+        self.assertEqual(get_remaining_page_offsets(playlist)[0], [])
+
+    @unittest.mock.patch("analyse_spotify_playlist.outbound_requests.pull_track_page")
+    def test_pull_remaining_tracks_parallel_keeps_order(
+        self, mock_request: unittest.mock.MagicMock
+    ):
+        total = 1050
+        playlist = mock_playlist(total=total)
+        mock_request.side_effect = lambda token, playlist_id, offset, limit, fields: (
+            mock_track_page(offset, limit, total)
+        )
+
+        pull_remaining_tracks_parallel("token", playlist, max_workers=4)
+        self.assertEqual(mock_request.call_count, 10)
+        self.assertListEqual(
+            playlist.get_all_track_ids(), [f"id{i}" for i in range(total)]
+        )
+        self.assertIsNone(playlist.next_url)
+
     def mock_audio_feature_request(self, token, track_list):
         return [{"id": x} for x in track_list]
 
@@ -58,8 +132,34 @@ class TestOutbound(unittest.TestCase):
         self.assertEqual(mock_request.call_count, 3)
         self.assertEqual(len(res), total)
 
+    @unittest.mock.patch(
+        "analyse_spotify_playlist.outbound_requests.audio_feature_request"
+    )
+    def test_pull_tracks_audio_features_keeps_order(
+        self, mock_request: unittest.mock.MagicMock
+    ):
+        ids = [f"id{i}" for i in range(950)]
+        mock_request.side_effect = self.mock_audio_feature_request
+
+        res = pull_tracks_audio_features("token", ids, max_workers=4)
+        self.assertEqual(mock_request.call_count, 10)
+        self.assertListEqual([feature["id"] for feature in res], ids)
+
+    @unittest.mock.patch(
+        "analyse_spotify_playlist.outbound_requests.audio_feature_request"
+    )
+    def test_pull_tracks_audio_features_1_set(
+        self, mock_request: unittest.mock.MagicMock
+    ):
+        ids = [f"id{i}" for i in range(100)]
+        mock_request.side_effect = self.mock_audio_feature_request
+
+        res = pull_tracks_audio_features("token", ids)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(len(res), 100)
+
     @unittest.mock.patch("analyse_spotify_playlist.outbound_requests.SPOTIFY_API_URL")
-    @unittest.mock.patch("analyse_spotify_playlist.outbound_requests.get")
+    @unittest.mock.patch("analyse_spotify_playlist.http_client.HttpClient.get")
     def test_audio_feature_request(
         self, mock_request: unittest.mock.MagicMock, mock_param
     ):
@@ -75,7 +175,7 @@ class TestOutbound(unittest.TestCase):
             headers={"Authorization": f"Bearer test_token"},
         )
 
-    @unittest.mock.patch("analyse_spotify_playlist.outbound_requests.get")
+    @unittest.mock.patch("analyse_spotify_playlist.http_client.HttpClient.get")
     def test_audio_feature_request_too_many_exception(
         self, mock_request: unittest.mock.MagicMock
     ):
@@ -89,7 +189,7 @@ class TestOutbound(unittest.TestCase):
             audio_feature_request("token", ids)
         mock_request.assert_not_called()
 
-    @unittest.mock.patch("analyse_spotify_playlist.outbound_requests.get")
+    @unittest.mock.patch("analyse_spotify_playlist.http_client.HttpClient.get")
     def test_audio_feature_request_with_empty_list(
         self, mock_request: unittest.mock.MagicMock
     ):
@@ -1,10 +1,15 @@
 import unittest
 import unittest.mock
 from copy import deepcopy
-from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.mock_data import (
+    MOCK_AUDIO_FEATURES_RESPONSE,
+    MOCK_PLAYLIST_RESPONSE,
+    MOCK_TRACK,
+)
 
 from analyse_spotify_playlist.playlist import Playlist
 from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.utils import clean_up_track_features
 
 
 class TestPlaylistClass(unittest.TestCase):
@@ -60,3 +65,90 @@ class TestPlaylistClass(unittest.TestCase):
         playlist = self.setup_mock_playlist()
         self.assertGreater(len(playlist.get_all_track_ids()), 0)
         self.assertEqual(len(playlist.get_all_track_ids()), len(playlist._tracks))
+
+    def test_add_tracks_keeps_existing_track(self):
+        playlist = self.setup_analysed_playlist()
+        track_id = playlist.get_all_track_ids()[0]
+        track = playlist.get_track(track_id)
+        page = {"items": [{"track": {**MOCK_TRACK, "id": track_id}}]}
+        self.assertListEqual(playlist.add_tracks(page), [])
+        self.assertIs(playlist.get_track(track_id), track)
+        self.assertIsNotNone(track._key)
+        new_page = {"items": [{"track": {**MOCK_TRACK, "id": "new"}}]}
+        self.assertListEqual(playlist.add_tracks(new_page), ["new"])
+
+    def setup_analysed_playlist(self):
+        playlist = self.setup_mock_playlist()
+        for feature in MOCK_AUDIO_FEATURES_RESPONSE["audio_features"]:
+            track_id, clean = clean_up_track_features(feature)
+            playlist.get_track(track_id).populate_audio_features(**clean)
+        playlist.analyse_tracks_audio_feature()
+        return playlist
+
+    def test_stats_gathered_once(self):
+        playlist = self.setup_analysed_playlist()
+        stats = playlist.get_stats()
+        self.assertIs(playlist.get_stats(), stats)
+        playlist.add_tracks({"items": []})
+        self.assertIsNot(playlist.get_stats(), stats)
+
+    def test_stats_gathered_again_after_audio_features(self):
+        playlist = self.setup_mock_playlist()
+        self.assertEqual(sum(playlist.get_stats().key_breakdown.values()), 0)
+        playlist.add_audio_features(
+            [
+                clean_up_track_features(x)
+                for x in MOCK_AUDIO_FEATURES_RESPONSE["audio_features"]
+            ]
+        )
+        self.assertEqual(sum(playlist.get_stats().key_breakdown.values()), 5)
+
+    def test_breakdowns(self):
+        playlist = self.setup_analysed_playlist()
+        self.assertEqual(playlist.total_explicit_tracks(), 0)
+        self.assertEqual(sum(playlist.get_album_type_breakdown().values()), 5)
+        self.assertEqual(sum(playlist.get_key_breakdown().values()), 5)
+        self.assertDictEqual(playlist.get_mode_breakdown(), {"Minor": 2, "Major": 3})
+        self.assertDictEqual(playlist.get_time_signature_breakdown(), {4: 4, 3: 1})
+        self.assertTupleEqual(playlist.get_most_common_time_signature(), (4, 4))
+        self.assertEqual(sum(playlist.get_track_decade_release_breakdown().values()), 5)
+        self.assertEqual(playlist.total_instrumental_tracks(), 2)
+        self.assertEqual(playlist.total_spoken_word_tracks(), 1)
+        self.assertEqual(
+            playlist.get_spoken_word_tracks()[0]._id, "2E2znCPaS8anQe21GLxcvJ"
+        )
+
+    def test_oldest_and_newest(self):
+        playlist = self.setup_mock_playlist()
+        playlist.oldest_and_newest()
+        self.assertEqual(playlist.oldest_track._id, "2E2znCPaS8anQe21GLxcvJ")
+        self.assertEqual(playlist.newest_track._id, "5o3jMYOSbaVz3tkgwhELSV")
+
+    def test_oldest_and_newest_ties_match_sorted_order(self):
+        playlist = self.setup_mock_playlist()
+        for track in playlist.tracks.values():
+            track._album = track._album._replace(release_date="2000-01-01")
+        playlist.oldest_and_newest()
+        ordered = sorted(playlist.tracks.values(), key=Track.get_release_date)
+        self.assertIs(playlist.oldest_track, ordered[0])
+        self.assertIs(playlist.newest_track, ordered[-1])
+
+    def test_popular_lists_match_sorted_order(self):
+        playlist = self.setup_mock_playlist()
+        tracks = list(playlist.tracks.values())
+        most = sorted(tracks, key=lambda track: track._popularity, reverse=True)
+        least = sorted(tracks, key=lambda track: track._popularity)
+        self.assertListEqual(playlist.get_most_popular_list(), most)
+        self.assertListEqual(playlist.get_least_popular_list(), least)
+        self.assertListEqual(playlist.get_most_popular_list(2), most[:2])
+
+    def test_popular_lists_share_tracks(self):
+        playlist = self.setup_mock_playlist()
+        for track in playlist.get_most_popular_list():
+            self.assertIs(playlist.get_track(track._id), track)
+
+    def test_tracks_view_is_read_only(self):
+        playlist = self.setup_mock_playlist()
+        self.assertEqual(len(playlist.tracks), 5)
+        with self.assertRaises(TypeError):
+            playlist.tracks["new"] = None
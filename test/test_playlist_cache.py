@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+import unittest.mock
+from copy import deepcopy
+from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.stub_server import StubServer
+
+from analyse_spotify_playlist.outbound_requests import pull_playlist_metadata
+from analyse_spotify_playlist.playlist_cache import (
+    PlaylistCache,
+    is_unchanged,
+    playlist_from_cache,
+)
+
+
+class TestPlaylistCache(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache = PlaylistCache(temp_dir.name)
+        self.playlist_id = MOCK_PLAYLIST_RESPONSE["id"]
+        self.snapshot_id = MOCK_PLAYLIST_RESPONSE["snapshot_id"]
+
+    def test_put_and_get(self):
+        self.assertIsNone(self.cache.get(self.playlist_id))
+        pages = [{"items": [], "next": None}]
+        self.cache.put(
+            self.playlist_id, self.snapshot_id, '"etag"', MOCK_PLAYLIST_RESPONSE, pages
+        )
+        entry = self.cache.get(self.playlist_id)
+        self.assertEqual(entry["snapshot_id"], self.snapshot_id)
+        self.assertEqual(entry["etag"], '"etag"')
+        self.assertDictEqual(entry["playlist"], MOCK_PLAYLIST_RESPONSE)
+        self.assertListEqual(entry["pages"], pages)
+
+    def test_update_etag(self):
+        self.cache.put(self.playlist_id, self.snapshot_id, None, {}, [])
+        entry = self.cache.get(self.playlist_id)
+        self.cache.update_etag(self.playlist_id, entry, '"new"')
+        self.assertEqual(self.cache.get(self.playlist_id)["etag"], '"new"')
+
+    def test_is_unchanged(self):
+        entry = {"snapshot_id": self.snapshot_id}
+        self.assertFalse(is_unchanged(None, None))
+        self.assertTrue(is_unchanged(entry, None))
+        self.assertTrue(is_unchanged(entry, {"snapshot_id": self.snapshot_id}))
+        self.assertFalse(is_unchanged(entry, {"snapshot_id": "changed"}))
+        self.assertFalse(is_unchanged(entry, None, "name,id"))
+
+    def test_playlist_from_cache_uses_latest_metadata(self):
+        entry = {"playlist": deepcopy(MOCK_PLAYLIST_RESPONSE), "pages": []}
+        metadata = {"followers": {"total": 1000}, "tracks": {"total": 5}}
+        raw_playlist, pages = playlist_from_cache(entry, metadata)
+        self.assertEqual(raw_playlist["followers"]["total"], 1000)
+        self.assertListEqual(
+            raw_playlist["tracks"]["items"], MOCK_PLAYLIST_RESPONSE["tracks"]["items"]
+        )
+
+    def test_pull_playlist_metadata_conditional(self):
+        def routes(path: str) -> tuple:
+            if len(server.requests_seen) == 1:
+                return 200, {"snapshot_id": self.snapshot_id}, {"ETag": '"abc"'}
+            return 304, None
+
+        with StubServer(routes) as server, unittest.mock.patch(
+            "analyse_spotify_playlist.outbound_requests.SPOTIFY_API_URL", server.url
+        ):
+            metadata, etag = pull_playlist_metadata("token", self.playlist_id)
+            self.assertEqual(metadata["snapshot_id"], self.snapshot_id)
+            self.assertEqual(etag, '"abc"')
+            metadata, etag = pull_playlist_metadata("token", self.playlist_id, etag)
+            self.assertIsNone(metadata)
+            self.assertEqual(etag, '"abc"')
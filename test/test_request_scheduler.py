@@ -0,0 +1,71 @@
+import unittest
+import unittest.mock
+from test.stub_server import StubServer
+
+from analyse_spotify_playlist.http_client import HttpClient
+from analyse_spotify_playlist.request_scheduler import (
+    RequestScheduler,
+    parse_retry_after,
+)
+
+
+class TestRequestScheduler(unittest.TestCase):
+
+    @unittest.mock.patch("analyse_spotify_playlist.request_scheduler.monotonic")
+    def test_reserve_spaces_requests(self, mock_time: unittest.mock.MagicMock):
+        mock_time.return_value = 100.0
+        scheduler = RequestScheduler(requests_per_second=10, burst=2)
+        waits = [round(scheduler.reserve(), 3) for _ in range(5)]
+        self.assertListEqual(waits, [0.0, 0.0, 0.1, 0.2, 0.3])
+        self.assertEqual(scheduler.stats()["requests"], 5)
+
+    @unittest.mock.patch("analyse_spotify_playlist.request_scheduler.monotonic")
+    def test_reserve_unlimited(self, mock_time: unittest.mock.MagicMock):
+        mock_time.return_value = 100.0
+        scheduler = RequestScheduler(requests_per_second=None)
+        self.assertListEqual([scheduler.reserve() for _ in range(3)], [0.0] * 3)
+
+    @unittest.mock.patch("analyse_spotify_playlist.request_scheduler.monotonic")
+    def test_429_pauses_every_caller(self, mock_time: unittest.mock.MagicMock):
+        mock_time.return_value = 100.0
+        scheduler = RequestScheduler(requests_per_second=None)
+        delay = scheduler.retry_delay(429, {"Retry-After": "3"}, 0)
+        self.assertEqual(delay, 0.0)
+        self.assertEqual(scheduler.reserve(), 3.0)
+        self.assertEqual(scheduler.stats()["throttled"], 1)
+
+    def test_5xx_backoff(self):
+        scheduler = RequestScheduler(backoff_base=1, backoff_max=4)
+        for attempt, expected in enumerate([1, 2, 4, 4]):
+            delay = scheduler.retry_delay(503, {}, attempt)
+            self.assertGreaterEqual(delay, expected / 2)
+            self.assertLessEqual(delay, expected)
+        self.assertEqual(scheduler.stats()["retried"], 4)
+
+    def test_no_retry(self):
+        scheduler = RequestScheduler(max_retries=2)
+        self.assertIsNone(scheduler.retry_delay(200, {}, 0))
+        self.assertIsNone(scheduler.retry_delay(404, {}, 0))
+        self.assertIsNone(scheduler.retry_delay(503, {}, 2))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertEqual(parse_retry_after("-5"), 0.0)
+        self.assertEqual(parse_retry_after(None), 1)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 1)
+
+    def test_client_retries_until_success(self):
+        responses = [
+            (429, {}, {"Retry-After": "0"}),
+            (503, {}),
+            (200, {"ok": True}),
+        ]
+        with StubServer(lambda path: responses.pop(0)) as server:
+            scheduler = RequestScheduler(backoff_base=0.01)
+            client = HttpClient(scheduler=scheduler)
+            res = client.get(f"{server.url}ping")
+            client.close()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(server.requests_seen), 3)
+        self.assertEqual(scheduler.stats()["throttled"], 1)
+        self.assertEqual(scheduler.stats()["retried"], 2)
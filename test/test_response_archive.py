@@ -0,0 +1,161 @@
+import asyncio
+import tempfile
+import unittest
+import unittest.mock
+import zipfile
+from pathlib import Path
+from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.stub_server import StubServer, reset_file_output, stub_spotify
+from test.test_async_outbound_requests import stub_routes
+
+from aiohttp import ClientResponseError
+from requests import HTTPError
+
+from analyse_spotify_playlist.analyse import analyse_playlists, analyse_playlists_async
+from analyse_spotify_playlist.async_outbound_requests import (
+    create_session,
+    send_request_async,
+)
+from analyse_spotify_playlist.file_output import FileOutput
+from analyse_spotify_playlist.http_client import HttpClient, set_client
+from analyse_spotify_playlist.response_archive import (
+    ResponseArchive,
+    request_key,
+    set_archive,
+)
+from analyse_spotify_playlist.token_provider import TokenProvider, set_token_provider
+
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+REPORT_FILE = "Spotify_Web_API_Testing_playlist_analysis.txt"
+
+
+class TestResponseArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.archive_path = Path(self.temp_dir.name, "responses.zip")
+        self.addCleanup(set_archive, None)
+
+    def test_request_key(self):
+        self.assertEqual(
+            request_key("get", "https://x/a", {"limit": 100, "offset": 0}),
+            "GET https://x/a?limit=100&offset=0",
+        )
+        self.assertEqual(
+            request_key("GET", "https://x/a", {"offset": 0, "limit": 100}),
+            request_key("GET", "https://x/a", {"limit": 100, "offset": 0}),
+        )
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            ResponseArchive(str(self.archive_path), "rewind")
+
+    def test_record_then_replay(self):
+        def routes(path: str) -> tuple:
+            if path == "/ping?n=1":
+                return 200, {"n": 1}, {"ETag": '"abc"'}
+            return 200, {"n": 0}
+
+        client = HttpClient()
+        with StubServer(routes) as server:
+            set_archive(ResponseArchive(str(self.archive_path), "record"))
+            client.get(f"{server.url}ping", params={"n": 1})
+            client.get(f"{server.url}ping", params={"n": 1})
+            client.get(f"{server.url}ping")
+            set_archive(None)
+            self.assertEqual(len(server.requests_seen), 3)
+            url = server.url
+        with zipfile.ZipFile(self.archive_path) as f:
+            self.assertEqual(len(f.namelist()), 2)
+
+        archive = ResponseArchive(str(self.archive_path))
+        set_archive(archive)
+        res = client.get(f"{url}ping", params={"n": 1})
+        self.assertEqual(res.json(), {"n": 1})
+        self.assertEqual(res.headers.get("ETag"), '"abc"')
+        self.assertEqual(client.get(f"{url}ping").json(), {"n": 0})
+        with self.assertRaises(KeyError):
+            client.get(f"{url}ping", params={"n": 2})
+        self.assertEqual(archive.hits, 2)
+        self.assertEqual(archive.misses, 1)
+        client.close()
+
+    def test_error_recorded_and_replayed(self):
+        async def send(url: str) -> None:
+            async with create_session() as session:
+                await send_request_async(session, "GET", url)
+
+        with StubServer() as server:
+            url = f"{server.url}missing"
+            set_archive(ResponseArchive(str(self.archive_path), "record"))
+            with self.assertRaises(ClientResponseError):
+                asyncio.run(send(url))
+            set_archive(None)
+        with zipfile.ZipFile(self.archive_path) as f:
+            self.assertEqual(len(f.namelist()), 1)
+
+        set_archive(ResponseArchive(str(self.archive_path)))
+        with self.assertRaises(ClientResponseError) as raised:
+            asyncio.run(send(url))
+        self.assertEqual(raised.exception.status, 404)
+        client = HttpClient()
+        with self.assertRaises(HTTPError):
+            client.get(url).raise_for_status()
+        client.close()
+
+    def test_token_is_not_recorded(self):
+        with StubServer(stub_routes) as server:
+            token_url = f"{server.url}token"
+            with unittest.mock.patch(
+                "analyse_spotify_playlist.response_archive.SPOTIFY_ACCOUNTS_URL",
+                token_url,
+            ):
+                client = HttpClient()
+                set_archive(ResponseArchive(str(self.archive_path), "record"))
+                client.post(token_url, {"client_secret": "secret"})
+                set_archive(None)
+                with zipfile.ZipFile(self.archive_path) as f:
+                    self.assertListEqual(f.namelist(), [])
+
+                set_archive(ResponseArchive(str(self.archive_path)))
+                res = client.post(token_url, {"client_secret": "secret"})
+                self.assertEqual(res.json()["access_token"], "replay")
+                self.assertEqual(len(server.requests_seen), 1)
+                client.close()
+
+
+class TestReplayAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.archive_path = str(Path(self.temp_dir.name, "responses.zip"))
+        self.server = stub_spotify(self, stub_routes)
+        self.addCleanup(set_archive, None)
+        FileOutput.write_to_file = True
+        self.addCleanup(reset_file_output)
+
+    def analyse_to(self, directory: str, use_async: bool = False) -> str:
+        """Analyse the playlist, returning the report."""
+        set_token_provider(TokenProvider(cache_path=None))
+        set_client(None)
+        Path(self.temp_dir.name, directory).mkdir()
+        FileOutput().set_output_path(str(Path(self.temp_dir.name, directory)))
+        if use_async:
+            asyncio.run(analyse_playlists_async([PLAYLIST_ID], 2))
+        else:
+            analyse_playlists(PLAYLIST_ID, 2)
+        return Path(self.temp_dir.name, directory, REPORT_FILE).read_text("utf-8")
+
+    def test_replay_without_network(self):
+        set_archive(ResponseArchive(self.archive_path, "record"))
+        recorded = self.analyse_to("recorded")
+        set_archive(None)
+        self.server.__exit__(None, None, None)
+        sent = len(self.server.requests_seen)
+
+        set_archive(ResponseArchive(self.archive_path))
+        self.assertEqual(self.analyse_to("replayed"), recorded)
+        self.assertEqual(self.analyse_to("replayed_async", use_async=True), recorded)
+        self.assertEqual(len(self.server.requests_seen), sent)
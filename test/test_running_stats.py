@@ -0,0 +1,96 @@
+import random
+import unittest
+from copy import deepcopy
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE, MOCK_PLAYLIST_RESPONSE
+from test.test_feature_columns import mock_tracks
+
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.playlist_stats import PlaylistStats
+from analyse_spotify_playlist.running_stats import RunningStats
+from analyse_spotify_playlist.utils import (
+    clean_raw_playlist_data,
+    clean_up_track_features,
+)
+
+
+class TestRunningStats(unittest.TestCase):
+
+    def assert_matches(self, running: RunningStats, stats: PlaylistStats):
+        for name in [
+            "total_explicit",
+            "album_type_breakdown",
+            "decade_release_breakdown",
+            "key_breakdown",
+            "mode_breakdown",
+            "time_signature_breakdown",
+            "instrumental_tracks",
+            "spoken_word_tracks",
+            "min_max_analysis",
+        ]:
+            self.assertEqual(getattr(running, name), getattr(stats, name), name)
+        self.assertListEqual(
+            list(running.time_signature_breakdown),
+            list(stats.time_signature_breakdown),
+        )
+        average = running.average_analysis
+        for key, value in stats.average_analysis.items():
+            self.assertAlmostEqual(average[key], value, places=4, msg=key)
+        self.assertEqual(average["duration_ms"], stats.average_analysis["duration_ms"])
+
+    def test_matches_playlist_stats(self):
+        for seed in range(5):
+            tracks = mock_tracks(500, seed)
+            running = RunningStats()
+            values = list(tracks.values())
+            for offset in range(0, len(values), 100):
+                running.add_tracks(values[offset : offset + 100])
+            random.Random(seed).shuffle(values)
+            for track in values:
+                running.add_features(track)
+            self.assert_matches(running, PlaylistStats(tracks))
+
+    def test_tracks_and_features_counted_once(self):
+        tracks = mock_tracks(20)
+        running = RunningStats()
+        running.add_tracks(tracks.values())
+        running.add_tracks(tracks.values())
+        for track in list(tracks.values()) * 2:
+            running.add_features(track)
+        self.assertEqual(running.total_tracks, 20)
+        self.assert_matches(running, PlaylistStats(tracks))
+
+    def test_features_of_unknown_track_ignored(self):
+        tracks = mock_tracks(2)
+        running = RunningStats()
+        running.add_features(tracks["id0"])
+        self.assertEqual(sum(running.key_breakdown.values()), 0)
+
+
+class TestIncrementalPlaylist(unittest.TestCase):
+
+    def test_matches_full_analysis(self):
+        raw = clean_raw_playlist_data(deepcopy(MOCK_PLAYLIST_RESPONSE))
+        features = list(
+            map(clean_up_track_features, MOCK_AUDIO_FEATURES_RESPONSE["audio_features"])
+        )
+        playlist = Playlist(**raw)
+        playlist.add_audio_features(features)
+        playlist.analyse_tracks_audio_feature()
+        playlist.oldest_and_newest()
+
+        incremental = Playlist(**raw, incremental=True)
+        incremental.add_audio_features(features[::-1])
+        self.assertIsNotNone(incremental.running_stats)
+        incremental.analyse_tracks_audio_feature()
+        incremental.oldest_and_newest()
+
+        self.assertIs(incremental.get_stats(), incremental.running_stats)
+        self.assertEqual(incremental.min_max_analysis, playlist.min_max_analysis)
+        self.assertEqual(incremental.average_analysis, playlist.average_analysis)
+        self.assertEqual(incremental.get_key_breakdown(), playlist.get_key_breakdown())
+        self.assertEqual(
+            [track._id for track in incremental.get_spoken_word_tracks()],
+            [track._id for track in playlist.get_spoken_word_tracks()],
+        )
+        self.assertEqual(incremental.oldest_track._id, playlist.oldest_track._id)
+        self.assertEqual(incremental.newest_track._id, playlist.newest_track._id)
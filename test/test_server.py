@@ -0,0 +1,148 @@
+import http.client
+import threading
+import unittest
+import unittest.mock
+from test.mock_data import MOCK_PLAYLIST_RESPONSE
+from test.stub_server import stub_spotify
+from test.test_async_outbound_requests import stub_routes
+
+import requests
+
+from analyse_spotify_playlist.feature_cache import FeatureCache, set_feature_cache
+from analyse_spotify_playlist.metrics import MetricsRegistry, set_metrics
+from analyse_spotify_playlist.server import AnalysisServer, ReportCache, read_options
+
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+
+
+class TestReportCache(unittest.TestCase):
+
+    def test_least_recently_used_removed(self):
+        reports = ReportCache(max_entries=2)
+        reports.put("a", "report a")
+        reports.put("b", "report b")
+        self.assertEqual(reports.get("a"), "report a")
+        reports.put("c", "report c")
+        self.assertIsNone(reports.get("b"))
+        self.assertEqual(reports.get("a"), "report a")
+        self.assertEqual(reports.get("c"), "report c")
+        self.assertEqual(reports.hits, 3)
+        self.assertEqual(reports.misses, 1)
+
+    def test_expired_report(self):
+        reports = ReportCache(ttl=10)
+        with unittest.mock.patch("time.monotonic", return_value=100):
+            reports.put("a", "report a")
+        with unittest.mock.patch("time.monotonic", return_value=105):
+            self.assertEqual(reports.get("a"), "report a")
+        with unittest.mock.patch("time.monotonic", return_value=111):
+            self.assertIsNone(reports.get("a"))
+        self.assertEqual(len(reports), 0)
+
+
+class TestReadOptions(unittest.TestCase):
+
+    def test_read_options(self):
+        self.assertTupleEqual(read_options({}), (0, "text"))
+        self.assertTupleEqual(
+            read_options({"depth": "2", "format": "json"}), (2, "json")
+        )
+        for query in [
+            {"depth": "3"},
+            {"depth": "x"},
+            {"depth": None},
+            {"format": "ndjson"},
+        ]:
+            with self.assertRaises(ValueError):
+                read_options(query)
+
+
+class TestAnalysisServer(unittest.TestCase):
+
+    def setUp(self):
+        self.spotify = stub_spotify(self, stub_routes)
+        set_feature_cache(FeatureCache(":memory:"))
+        self.addCleanup(set_feature_cache, None)
+
+        self.server = AnalysisServer("127.0.0.1", 0, workers=2)
+        thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.05}
+        )
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def spotify_requests(self, prefix: str) -> int:
+        return len([x for x in self.spotify.requests_seen if x.startswith(prefix)])
+
+    def test_text_report_is_cached(self):
+        url = f"{self.server.url}playlists/{PLAYLIST_ID}?depth=1"
+        first = requests.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.text.startswith("----- PLAYLIST ANALYSIS -----"))
+        self.assertIn("IN DEPTH BREAKDOWN", first.text.upper())
+        sent = len(self.spotify.requests_seen)
+        second = requests.get(url)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(len(self.spotify.requests_seen), sent)
+        self.assertEqual(self.server.reports.hits, 1)
+
+    def test_json_report(self):
+        res = requests.get(f"{self.server.url}playlists/{PLAYLIST_ID}?format=json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["id"], PLAYLIST_ID)
+        self.assertEqual(res.json()["playable_tracks"], 5)
+
+    def test_submit_several_playlists(self):
+        res = requests.post(
+            f"{self.server.url}playlists",
+            json={"ids": [PLAYLIST_ID, "missing"], "format": "json"},
+        )
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertListEqual(list(body["reports"]), [PLAYLIST_ID])
+        self.assertIn("HTTPError", body["errors"]["missing"])
+        # The token is shared by every request.
+        self.assertEqual(self.spotify_requests("/token"), 1)
+
+    def test_errors(self):
+        res = requests.get(f"{self.server.url}playlists/missing")
+        self.assertEqual(res.status_code, 404)
+        res = requests.get(f"{self.server.url}playlists/{PLAYLIST_ID}?depth=5")
+        self.assertEqual(res.status_code, 400)
+        for body in [
+            {"ids": "x"},
+            {"ids": [["x"]]},
+            {"ids": [""]},
+            {"ids": ["x"], "depth": None},
+        ]:
+            res = requests.post(f"{self.server.url}playlists", json=body)
+            self.assertEqual(res.status_code, 400, body)
+        for length in ["abc", "-1"]:
+            conn = http.client.HTTPConnection(*self.server.server_address)
+            conn.putrequest("POST", "/playlists")
+            conn.putheader("Content-Length", length)
+            conn.endheaders()
+            self.assertEqual(conn.getresponse().status, 400, length)
+            conn.close()
+        res = requests.get(f"{self.server.url}unknown")
+        self.assertEqual(res.status_code, 404)
+
+    def test_health(self):
+        requests.get(f"{self.server.url}playlists/{PLAYLIST_ID}")
+        res = requests.get(f"{self.server.url}health")
+        self.assertEqual(res.json()["reports_cached"], 1)
+        self.assertEqual(res.json()["analyses_in_flight"], 0)
+
+    def test_metrics(self):
+        res = requests.get(f"{self.server.url}metrics")
+        self.assertEqual(res.status_code, 404)
+        set_metrics(MetricsRegistry())
+        self.addCleanup(set_metrics, None)
+        requests.get(f"{self.server.url}playlists/{PLAYLIST_ID}")
+        res = requests.get(f"{self.server.url}metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn(
+            'analyse_spotify_playlist_stage_seconds_count{stage="render"} 1', res.text
+        )
@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+import unittest.mock
+from datetime import datetime
+from pathlib import PosixPath
+
+from analyse_spotify_playlist.token_provider import TokenProvider
+
+
+def mock_token(expires_in: int = 3600) -> dict:
+    return {
+        "access_token": "test_token",
+        "token_type": "Bearer",
+        "expires_in": expires_in,
+    }
+
+
+@unittest.mock.patch("analyse_spotify_playlist.token_provider.request_access_token")
+class TestTokenProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_path = PosixPath(self.temp_dir.name).joinpath("token.json")
+
+    def test_token_reused_within_run(self, mock_request: unittest.mock.MagicMock):
+        mock_request.return_value = mock_token()
+        provider = TokenProvider(cache_path=None)
+        for _ in range(500):
+            self.assertEqual(provider.get_token(), "test_token")
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(provider.tokens_requested, 1)
+
+    def test_token_cached_between_runs(self, mock_request: unittest.mock.MagicMock):
+        mock_request.return_value = mock_token()
+        TokenProvider(cache_path=self.cache_path).get_token()
+        self.assertTrue(self.cache_path.exists())
+
+        provider = TokenProvider(cache_path=self.cache_path)
+        self.assertEqual(provider.get_token(), "test_token")
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(provider.tokens_requested, 0)
+
+    def test_refresh_before_expiry(self, mock_request: unittest.mock.MagicMock):
+        mock_request.return_value = mock_token(expires_in=30)
+        provider = TokenProvider(cache_path=None, refresh_margin=60)
+        provider.get_token()
+        provider.get_token()
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_expired_cache_ignored(self, mock_request: unittest.mock.MagicMock):
+        mock_request.return_value = mock_token()
+        expired = mock_token()
+        expired["access_token"] = "expired_token"
+        expired["expires_time"] = datetime.now().timestamp() - 10
+        expired["client_id"] = ""
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(expired, f)
+
+        provider = TokenProvider(cache_path=self.cache_path)
+        self.assertEqual(provider.get_token(), "test_token")
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_corrupt_cache_ignored(self, mock_request: unittest.mock.MagicMock):
+        mock_request.return_value = mock_token()
+        self.cache_path.write_text("not json")
+        provider = TokenProvider(cache_path=self.cache_path)
+        self.assertEqual(provider.get_token(), "test_token")
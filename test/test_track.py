@@ -3,7 +3,7 @@ import unittest.mock
 from copy import deepcopy
 from test.mock_data import MOCK_TRACK
 
-from analyse_spotify_playlist.track import Track
+from analyse_spotify_playlist.track import RecordTable, Track
 
 
 class TestPlaylistClass(unittest.TestCase):
@@ -17,6 +17,21 @@ class TestPlaylistClass(unittest.TestCase):
         track = Track(**mock_track)
         self.assertIsInstance(track, Track)
 
+    def test_constructor_with_filtered_fields(self):
+        fields = [
+            "album",
+            "artists",
+            "duration_ms",
+            "explicit",
+            "id",
+            "name",
+            "popularity",
+        ]
+        track = Track(**{key: MOCK_TRACK[key] for key in fields})
+        self.assertEqual(track._id, MOCK_TRACK["id"])
+        self.assertIsNone(track._href)
+        self.assertEqual(track.get_release_date(), "2012-04-02")
+
     def test_populate_features(self):
         track = self.setup_mock_track()
         mock_features = {
@@ -67,3 +82,18 @@ class TestPlaylistClass(unittest.TestCase):
     def test_get_album_type(self):
         track = self.setup_mock_track()
         self.assertEqual(track.get_album_type(), "compilation")
+
+    def test_get_artist_name(self):
+        track = self.setup_mock_track()
+        self.assertEqual(track.get_artist_name(), MOCK_TRACK["artists"][0]["name"])
+
+    def test_compact_representation(self):
+        records = RecordTable()
+        track = Track(**deepcopy(MOCK_TRACK), records=records)
+        other = Track(**deepcopy(MOCK_TRACK), records=records)
+        self.assertFalse(hasattr(track, "__dict__"))
+        self.assertFalse(hasattr(track, "_available_markets"))
+        self.assertIs(track._album, other._album)
+        self.assertIs(track._artists[0], other._artists[0])
+        # Records are only shared within a table.
+        self.assertIsNot(self.setup_mock_track()._album, track._album)
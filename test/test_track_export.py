@@ -0,0 +1,73 @@
+import csv
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+from test.test_json_report import mock_analysed_playlist
+
+from analyse_spotify_playlist.track_export import (
+    TRACK_TABLE_COLUMNS,
+    columnar_export_available,
+    export_tracks,
+    iter_chunks,
+)
+
+
+class TestTrackExport(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name, "playlist_tracks")
+        self.playlist = mock_analysed_playlist()
+
+    def test_iter_chunks(self):
+        chunks = list(iter_chunks(range(5), 2))
+        self.assertListEqual(chunks, [[0, 1], [2, 3], [4]])
+
+    def test_export_csv(self):
+        path = export_tracks(self.playlist, self.path, "csv", chunk_size=2)
+        self.assertEqual(path.name, "playlist_tracks.csv")
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertListEqual(list(rows[0]), [name for name, _ in TRACK_TABLE_COLUMNS])
+        self.assertListEqual(
+            [row["id"] for row in rows], self.playlist.get_all_track_ids()
+        )
+        track = self.playlist.get_track(rows[0]["id"])
+        self.assertEqual(rows[0]["artist"], track.get_artist_name())
+        self.assertEqual(float(rows[0]["tempo"]), track._tempo)
+
+    def test_columnar_falls_back_to_csv(self):
+        with unittest.mock.patch("analyse_spotify_playlist.track_export.pyarrow", None):
+            path = export_tracks(self.playlist, self.path, "parquet")
+        self.assertEqual(path.suffix, ".csv")
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_tracks(self.playlist, self.path, "xlsx")
+
+    @unittest.skipUnless(columnar_export_available(), "pyarrow is not installed")
+    def test_export_parquet(self):
+        import pyarrow.parquet
+
+        path = export_tracks(self.playlist, self.path, "parquet", chunk_size=2)
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(pyarrow.parquet.ParquetFile(path).num_row_groups, 3)
+        self.assertListEqual(
+            table.column("id").to_pylist(), self.playlist.get_all_track_ids()
+        )
+
+    @unittest.skipUnless(columnar_export_available(), "pyarrow is not installed")
+    def test_export_arrow(self):
+        import pyarrow.ipc
+
+        path = export_tracks(self.playlist, self.path, "arrow", chunk_size=2)
+        with pyarrow.ipc.open_file(path) as reader:
+            self.assertEqual(reader.num_record_batches, 3)
+            table = reader.read_all()
+        self.assertListEqual(
+            table.column("duration_ms").to_pylist(),
+            [track._duration_ms for track in self.playlist.tracks.values()],
+        )
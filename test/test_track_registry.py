@@ -0,0 +1,137 @@
+import threading
+import unittest
+import unittest.mock
+from test.mock_data import MOCK_PLAYLIST_RESPONSE, MOCK_TRACK
+from test.stub_server import stub_spotify
+from test.test_async_outbound_requests import stub_routes
+
+from analyse_spotify_playlist.analyse import analyse_playlists
+from analyse_spotify_playlist.track_registry import (
+    TrackRegistry,
+    get_track_registry,
+    set_track_registry,
+    shared_tracks,
+)
+
+PLAYLIST_ID = MOCK_PLAYLIST_RESPONSE["id"]
+
+
+class TestTrackRegistry(unittest.TestCase):
+
+    def test_get_or_create(self):
+        registry = TrackRegistry()
+        track = registry.get_or_create(MOCK_TRACK)
+        self.assertIs(registry.get_or_create(dict(MOCK_TRACK)), track)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(registry.tracks_reused, 1)
+
+    def test_claim_features(self):
+        registry = TrackRegistry()
+        self.assertTupleEqual(registry.claim_features(["a", "b"]), (["a", "b"], []))
+        self.assertTupleEqual(registry.claim_features(["b", "c"]), (["c"], ["b"]))
+        registry.release_features(["a", "b"])
+        self.assertTupleEqual(registry.claim_features(["a"]), ([], ["a"]))
+        self.assertEqual(registry.features_reused, 2)
+
+    def test_unpopulated_features_can_be_claimed_again(self):
+        registry = TrackRegistry()
+        registry.claim_features(["a"])
+        registry.release_features(["a"], populated=False)
+        self.assertTupleEqual(registry.claim_features(["a"]), (["a"], []))
+
+    def test_wait_for_features(self):
+        registry = TrackRegistry()
+        registry.claim_features(["a", "b"])
+        waited = threading.Event()
+
+        def wait():
+            registry.wait_for_features(["b"])
+            waited.set()
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        registry.release_features(["a"])
+        self.assertFalse(waited.wait(timeout=0.1))
+        registry.release_features(["b"])
+        thread.join(timeout=5)
+        self.assertTrue(waited.is_set())
+
+    def test_wait_for_features_claimant_failed(self):
+        registry = TrackRegistry()
+        registry.claim_features(["a", "b"])
+        registry.release_features(["a"])
+        registry.release_features(["b"], populated=False)
+        self.assertListEqual(registry.wait_for_features(["a", "b"]), ["b"])
+
+    def test_shared_tracks(self):
+        with shared_tracks() as registry:
+            self.assertIs(get_track_registry(), registry)
+        self.assertIsNone(get_track_registry())
+
+
+class TestSharedTracks(unittest.TestCase):
+
+    def setUp(self):
+        self.server = stub_spotify(self, stub_routes)
+
+    def analyse_twice(self, incremental: bool = False, pipelined: bool = False):
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.analyse.output_analysis"
+        ) as mock_output:
+            with shared_tracks():
+                analyse_playlists(PLAYLIST_ID, 1, incremental, pipelined)
+                analyse_playlists(PLAYLIST_ID, 1, incremental, pipelined)
+        return [call[0][0] for call in mock_output.call_args_list]
+
+    def feature_requests(self) -> int:
+        return len(
+            [x for x in self.server.requests_seen if x.startswith("/audio-features")]
+        )
+
+    def assert_shared(self, first, second):
+        self.assertEqual(self.feature_requests(), 1)
+        for track_id, track in first.tracks.items():
+            self.assertIs(second.get_track(track_id), track)
+        self.assertDictEqual(second.get_key_breakdown(), first.get_key_breakdown())
+        self.assertEqual(sum(second.get_key_breakdown().values()), 5)
+
+    def test_features_requested_once(self):
+        self.assert_shared(*self.analyse_twice())
+
+    def test_features_requested_once_incremental(self):
+        self.assert_shared(*self.analyse_twice(incremental=True))
+
+    def test_features_requested_once_pipelined(self):
+        self.assert_shared(*self.analyse_twice(incremental=True, pipelined=True))
+
+    def analyse_after_failed_claim(self, incremental=False, pipelined=False):
+        """Analyse the playlist while another playlist holds a claim on every
+        track, and then fails to request their features."""
+        registry = TrackRegistry()
+        set_track_registry(registry)
+        self.addCleanup(set_track_registry, None)
+        track_ids = [
+            x["track"]["id"] for x in MOCK_PLAYLIST_RESPONSE["tracks"]["items"]
+        ]
+        registry.claim_features(track_ids)
+        failed = threading.Timer(
+            0.1, registry.release_features, (track_ids,), {"populated": False}
+        )
+        failed.start()
+        self.addCleanup(failed.join)
+        with unittest.mock.patch(
+            "analyse_spotify_playlist.analyse.output_analysis"
+        ) as mock_output:
+            analyse_playlists(PLAYLIST_ID, 1, incremental, pipelined)
+        playlist = mock_output.call_args[0][0]
+        self.assertEqual(self.feature_requests(), 1)
+        self.assertEqual(sum(playlist.get_key_breakdown().values()), 5)
+
+    def test_features_requested_when_claimant_fails(self):
+        self.analyse_after_failed_claim()
+
+    def test_features_requested_when_claimant_fails_incremental(self):
+        self.analyse_after_failed_claim(incremental=True)
+
+    def test_features_requested_when_claimant_fails_pipelined(self):
+        self.analyse_after_failed_claim(incremental=True, pipelined=True)
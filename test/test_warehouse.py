@@ -0,0 +1,69 @@
+import unittest
+from copy import deepcopy
+from test.mock_data import MOCK_AUDIO_FEATURES_RESPONSE, MOCK_PLAYLIST_RESPONSE
+
+from analyse_spotify_playlist.analyse import report_playlist
+from analyse_spotify_playlist.playlist import Playlist
+from analyse_spotify_playlist.utils import clean_raw_playlist_data
+from analyse_spotify_playlist.warehouse import Warehouse, set_warehouse
+
+
+def mock_playlist() -> Playlist:
+    return Playlist(**clean_raw_playlist_data(deepcopy(MOCK_PLAYLIST_RESPONSE)))
+
+
+class TestWarehouse(unittest.TestCase):
+
+    def setUp(self):
+        self.warehouse = Warehouse(":memory:")
+        self.addCleanup(self.warehouse.close)
+
+    def test_put_playlist(self):
+        playlist = mock_playlist()
+        self.warehouse.put_playlist(playlist)
+        self.assertEqual(self.warehouse.count("playlists"), 1)
+        self.assertEqual(self.warehouse.count("tracks"), 5)
+        self.assertEqual(
+            self.warehouse.get_snapshot_id(playlist.id),
+            MOCK_PLAYLIST_RESPONSE["snapshot_id"],
+        )
+        rows = self.warehouse.playlist_tracks(playlist.id)
+        self.assertListEqual([row["id"] for row in rows], playlist.get_all_track_ids())
+        self.assertIsNone(rows[0]["tempo"])
+
+    def test_put_playlist_again_updates_in_place(self):
+        playlist = mock_playlist()
+        self.warehouse.put_playlist(playlist)
+        track_id = playlist.get_all_track_ids()[0]
+        playlist.get_track(track_id)._popularity = 99
+        del playlist._tracks[playlist.get_all_track_ids()[-1]]
+        self.warehouse.put_playlist(playlist)
+        self.assertEqual(self.warehouse.count("playlists"), 1)
+        self.assertEqual(self.warehouse.count("tracks"), 5)
+        rows = self.warehouse.playlist_tracks(playlist.id)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["popularity"], 99)
+
+    def test_put_raw_audio_features(self):
+        playlist = mock_playlist()
+        self.warehouse.put_playlist(playlist)
+        audio_features = MOCK_AUDIO_FEATURES_RESPONSE["audio_features"]
+        self.warehouse.put_raw_audio_features([*audio_features, None])
+        self.warehouse.put_raw_audio_features(audio_features)
+        self.assertEqual(self.warehouse.count("audio_features"), 5)
+        row = self.warehouse.playlist_tracks(playlist.id)[0]
+        features = {x["id"]: x for x in audio_features}[row["id"]]
+        self.assertEqual(row["tempo"], features["tempo"])
+        self.assertEqual(row["key"], features["key"])
+
+    def test_count_unknown_table(self):
+        with self.assertRaises(ValueError):
+            self.warehouse.count("sqlite_master")
+
+    def test_report_playlist_stores_playlist(self):
+        set_warehouse(self.warehouse)
+        self.addCleanup(set_warehouse, None)
+        playlist = mock_playlist()
+        report_playlist(playlist, MOCK_AUDIO_FEATURES_RESPONSE["audio_features"], 0)
+        self.assertEqual(self.warehouse.count("playlists"), 1)
+        self.assertEqual(self.warehouse.count("audio_features"), 5)